@@ -1,45 +1,118 @@
+import sys
+from pathlib import Path
 import os
 import sqlite3
 import streamlit as st
 import uuid
-from typing import TypedDict
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage
-from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.sqlite import SqliteSaver
+
+# Shared helpers live in <repo>/common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 load_dotenv('/Users/shubham_infinity/Desktop/Projects/LangGraph_Projects/.env')
 
+# Streamlit re-runs this whole script on every interaction. The DB connection,
+# checkpointer and compiled graph come from the process-wide resource cache, so a
+# rerun neither reconnects nor recompiles, and LangGraph's graph module and the
+# provider SDK are imported only when the first message is sent.
+
 # --- Backend SQLite Checkpointer Setup (Topic 101/102) ---
 db_path = "chatbot.db"
-# check_same_thread=False allows Streamlit's multiple threads to interact with DB
-conn = sqlite3.connect(db_path, check_same_thread=False)
-checkpointer = SqliteSaver(conn)
 
-class State(TypedDict):
-    messages: list
+@st.cache_resource
+def concurrent_checkpointer(path):
+    # One read pool + group-commit queue per process, shared by every session
+    from common.delta_checkpoint import ConcurrentDeltaSqliteSaver
+    from common.message_serde import CompactSerializer
+    return ConcurrentDeltaSqliteSaver(path, read_pool_size=4, synchronous=os.getenv("CHECKPOINTER_SYNCHRONOUS", "NORMAL"),
+                                      serde=CompactSerializer(compress_threshold=None))
+
+@st.cache_resource
+def sqlite_checkpointer(path):
+    from common.delta_checkpoint import DeltaSqliteSaver
+    from common.message_serde import CompactSerializer
+    # check_same_thread=False allows Streamlit's multiple threads to interact with DB
+    conn = sqlite3.connect(path, check_same_thread=False)
+    # SqliteSaver + a thread_catalog table it updates on every write. Each checkpoint
+    # stores only the new messages since its parent (full snapshot every 20 steps),
+    # zstd/zlib compressed; old full-state rows stay readable. Messages inside are
+    # compact msgpack (the saver compresses rows, so the serializer doesn't);
+    # rows written with the default serializer still load
+    return DeltaSqliteSaver(conn, snapshot_every=20, serde=CompactSerializer(compress_threshold=None))
+
+@st.cache_resource
+def sharded_checkpointer(shards):
+    # Threads spread over chatbot-0.db ... chatbot-{N-1}.db by consistent hashing on
+    # thread_id, so app processes writing different threads don't share one write lock
+    from common.delta_checkpoint import DeltaSqliteSaver
+    from common.message_serde import CompactSerializer
+    from common.sharded_checkpoint import ShardedSqliteSaver, connect
+    return ShardedSqliteSaver(
+        [f"chatbot-{i}.db" for i in range(shards)],
+        factory=lambda path: DeltaSqliteSaver(connect(path), snapshot_every=20,
+                                              serde=CompactSerializer(compress_threshold=None)),
+    )
+
+@st.cache_resource
+def start_compactor(_checkpointer):
+    # Background retention: last 50 checkpoints per thread plus every branch and
+    # interrupt point; threads idle for 30 days are dropped; freed pages are vacuumed
+    from common.checkpoint_retention import CheckpointCompactor, RetentionPolicy
+    policy = RetentionPolicy(keep_last=50, thread_ttl=30 * 24 * 3600)
+    return CheckpointCompactor(_checkpointer, policy).start(interval=600)
+
+mode = os.getenv("CHECKPOINTER_MODE")
+if mode == "concurrent":
+    # Many concurrent writers: pooled WAL read connections + group commit. Pays off under
+    # synchronous=FULL or a slow disk; otherwise about even with the shared saver
+    checkpointer = concurrent_checkpointer(db_path)
+elif mode == "sharded":
+    checkpointer = sharded_checkpointer(int(os.getenv("CHECKPOINTER_SHARDS", "4")))
+else:
+    checkpointer = sqlite_checkpointer(db_path)
+start_compactor(checkpointer)
+
+@st.cache_resource
+def get_app(_checkpointer):
+    from typing import Annotated
+    from langgraph.graph import StateGraph, START, END
+    from langgraph.graph.message import add_messages
+    from common.context_window import ContextWindow, ContextWindowState
+    from common.llm_clients import get_chat_model
+
+    class State(ContextWindowState):
+        # add_messages appends each turn's input and reply to the thread's history
+        messages: Annotated[list, add_messages]
+
+    # Bounds the prompt: rolling summary (refreshed every 5 turns) + last 20 messages verbatim
+    context_window = ContextWindow(
+        "summary", last_n=20, summary_every=5,
+        summarizer=get_chat_model("groq", "llama-3.3-70b-versatile"),
+    )
 
-def call_model(state: State):
-    llm = ChatGroq(model="llama-3.3-70b-versatile")
-    response = llm.invoke(state['messages'])
-    return {"messages": state['messages'] + [response]}
+    def call_model(state: State):
+        llm = get_chat_model("groq", "llama-3.3-70b-versatile")  # pooled, built once per process
+        response = llm.invoke(context_window.select(state))
+        return {"messages": [response]}
 
-workflow = StateGraph(State)
-workflow.add_node("agent", call_model)
-workflow.add_edge(START, "agent")
-workflow.add_edge("agent", END)
+    workflow = StateGraph(State)
+    workflow.add_node("context", context_window)
+    workflow.add_node("agent", call_model)
+    workflow.add_edge(START, "context")
+    workflow.add_edge("context", "agent")
+    workflow.add_edge("agent", END)
 
-# Compile using sqlite checkpointer
-app = workflow.compile(checkpointer=checkpointer)
+    # Compile using sqlite checkpointer
+    return workflow.compile(checkpointer=_checkpointer)
 
 # --- Topic 103: Retrieve All Saved Threads from DB ---
-def retrieve_all_threads():
-    all_threads = set() # Prevent duplicates handling many checkpoints per thread
-    for checkpoint in checkpointer.list(None):
-        thread_id = checkpoint.config['configurable']['thread_id']
-        all_threads.add(thread_id)
-    return list(all_threads)
+def retrieve_all_threads(limit=50):
+    # Reads one indexed page of the thread catalog (most recent first) instead of
+    # deserializing every checkpoint via checkpointer.list(None)
+    page = checkpointer.list_threads(limit=limit)
+    if not page.threads and checkpointer.rebuild_catalog():
+        page = checkpointer.list_threads(limit=limit)  # DB written before the catalog existed
+    return [thread.thread_id for thread in page.threads]
 
 # --- Frontend Integration (Topic 104) ---
 if 'thread_id' not in st.session_state:
@@ -61,6 +134,8 @@ st.write("Current Threads pulled from DB:", st.session_state['chat_threads'])
 config = {'configurable': {'thread_id': st.session_state['thread_id']}}
 
 if st.button("Send Test Message"):
+    from langchain_core.messages import HumanMessage
+    app = get_app(checkpointer)
     resp = app.invoke({"messages": [HumanMessage(content="Hello SQLite!")]}, config=config)
     st.success(f"Agent Replied: {resp['messages'][-1].content}")
     st.info("Check `chatbot.db` file. If you rerun the script, the past thread IDs will remain in UI.")
@@ -1,5 +1,7 @@
 import os
+import sys
 import requests
+from pathlib import Path
 from typing import Annotated, TypedDict
 from dotenv import load_dotenv
 
@@ -9,17 +11,25 @@ from langchain_community.tools import DuckDuckGoSearchRun
 from langchain_core.messages import BaseMessage, HumanMessage
 
 from langgraph.graph import START, END, StateGraph
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import tools_condition
 from langgraph.graph.message import add_messages
 
+# Shared helpers live in <repo>/common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.graph_metrics import GraphMetrics, instrument, serve_prometheus
+from common.tool_cache import ToolResultCache, cache_policy
+from common.tool_executor import ConcurrentToolNode
+
 # Load API keys
 load_dotenv('/Users/shubham_infinity/Desktop/Projects/LangGraph_Projects/.env')
 
 # --- 1. Tool Definitions ---
-# Prebuilt tool
-search_tool = DuckDuckGoSearchRun(region="us-en")
+# Each tool declares how its results may be reused (pure / ttl / never).
+# Prebuilt tool: web results stay fresh enough for an hour and are kept on disk
+search_tool = cache_policy("ttl", ttl=3600, disk=True)(DuckDuckGoSearchRun(region="us-en"))
 
-# Custom tool 1
+# Custom tool 1: same inputs always give the same answer
+@cache_policy("pure")
 @tool
 def calculator(first_num: float, second_num: float, operation: str) -> dict:
     """Perform add, sub, mul, div."""
@@ -29,7 +39,8 @@ def calculator(first_num: float, second_num: float, operation: str) -> dict:
     elif operation == 'div': return {'result': first_num / second_num}
     return {'result': 'invalid operation'}
 
-# Custom tool 2
+# Custom tool 2: quotes go stale quickly
+@cache_policy("ttl", ttl=60)
 @tool
 def get_stock_price(symbol: str) -> dict:
     """Fetch latest price for e.g. AAPL."""
@@ -52,8 +63,12 @@ def chat_node(state: ChatState):
     response = llm_with_tools.invoke(state['messages'])
     return {"messages": [response]}
 
-# ToolNode executes the requested Python functions
-tool_node = ToolNode(tools)
+# Executes every tool call of the AI message concurrently (results stay in call order).
+# A slow web search is capped at 10s and no longer delays the calculator / price lookup.
+# Repeated searches / lookups (across loop iterations and threads) are answered from the cache.
+tool_cache = ToolResultCache(max_entries=1024, db_path="tool_cache.db")
+tool_node = ConcurrentToolNode(tools, max_workers=8, timeout=20, timeouts={search_tool.name: 10},
+                               cache=tool_cache)
 
 # --- 4. Architect the Graph Loop ---
 graph = StateGraph(ChatState)
@@ -64,7 +79,11 @@ graph.add_edge(START, "chat_node")
 # Conditionally route: If LLM asks for tool -> tools, else -> END
 graph.add_conditional_edges("chat_node", tools_condition)
 graph.add_edge("tools", "chat_node") # Loop back so LLM sees the tool output
-chatbot = graph.compile()
+# Per-node, LLM and tool latency histograms; METRICS_PORT=9464 exposes them at /metrics
+metrics = GraphMetrics()
+chatbot = instrument(graph.compile(), metrics, name="tools_agent")
+if os.getenv("METRICS_PORT"):
+    serve_prometheus(metrics, port=int(os.environ["METRICS_PORT"]))
 
 print("\n=== Invoking Agent with Tools Built Into Graph ===\n")
 
@@ -76,3 +95,8 @@ for event in chatbot.stream(inputs, stream_mode="values"):
     msg_type = message.type
     content = message.content or str(getattr(message, 'tool_calls', ''))
     print(f"\n[Node -> {msg_type.upper()}] {content}")
+
+print(f"\n=== Tool Cache ===\n{tool_cache.stats()}")
+print("\n=== Latency (s) ===")
+for series, row in sorted(metrics.summary().items()):
+    print(f"{series:<60} n={row['count']:<4} mean={row['mean']:.3f} p99<={row['p99<=']}")
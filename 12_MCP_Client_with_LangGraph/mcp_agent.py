@@ -1,58 +1,58 @@
 import asyncio
-import threading
+import sys
+from pathlib import Path
 from typing import Annotated, TypedDict
 import os
 
 from langchain_groq import ChatGroq
 from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.tools import BaseTool
 from langgraph.graph.message import add_messages
 from langgraph.graph import StateGraph, START, END
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import tools_condition
 
-# MCP Integrations
-try:
-    from langchain_mcp_adapters.client import MultiServerMCPClient
-    from langchain_core.tools import BaseTool
-except ImportError:
-    print("langchain_mcp_adapters package required. Install it via pip.")
+# Shared helpers live in <repo>/common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.mcp_pool import MCPConnectionManager
+from common.tool_executor import ConcurrentToolNode
 
-# 1. Background Event Loop Setup (for Sync bridging)
-_ASYNC_LOOP = asyncio.new_event_loop()
-_ASYNC_THREAD = threading.Thread(target=_ASYNC_LOOP.run_forever, daemon=True)
-_ASYNC_THREAD.start()
+# 1. MCP connection manager: long-lived pooled sessions on its own event loop.
+# Tools work from sync and async code; no per-call bridge or session setup.
+mcp_manager = MCPConnectionManager(
+    {
+        "arith": {
+            # Connect to our local server process
+            "transport": "stdio",
+            "command": "python3",
+            "args": ["arith_server.py"], # Assuming script runs in the directory
+        }
+        # Example for remote FastMCP Cloud:
+        # "expense": { "transport": "streamable_http", "url": "https://<cloud_url>.fastmcp.app/mcp" }
+    },
+    pool_size=2,                      # a second session opens only under concurrent load
+    schema_cache="mcp_schemas.json",  # tool schemas survive restarts; re-checked on connect
+    health_interval=30,               # ping sessions, respawn a dead stdio child
+)
 
-def run_async(coro):
-    """Bridge async code into sync application scope."""
-    future = asyncio.run_coroutine_threadsafe(coro, _ASYNC_LOOP)
-    return future.result()
-
-# 2. Architect MCP Client connections to servers
-client = MultiServerMCPClient({
-    "arith": { 
-        # Connect to our local server process
-        "transport": "stdio",
-        "command": "python3",
-        "args": ["arith_server.py"], # Assuming script runs in the directory
-    }
-    # Example for remote FastMCP Cloud:
-    # "expense": { "transport": "streamable_http", "url": "https://<cloud_url>.fastmcp.app/mcp" }
-})
-
-# 3. Request Tools from the Server dynamically
+# 2. Request Tools: served from the schema cache when present (no spawn/handshake);
+# the server process is started lazily on the first tool call.
 def load_mcp_tools() -> list[BaseTool]:
     try:
-        return run_async(client.get_tools())
+        tools = mcp_manager.get_tools()
     except Exception as e:
         print(f"Error connecting to MCP servers: {e}")
         return []
+    mcp_manager.warm()  # connect in the background while the graph is built
+    return tools
 
 mcp_tools = load_mcp_tools()
 print(f"Discovered MCP Tools: {[t.name for t in mcp_tools]}")
 
-# 4. Integrate into LangGraph
+# 3. Integrate into LangGraph
 llm = ChatGroq(model="llama-3.3-70b-versatile")
 llm_with_tools = llm.bind_tools(mcp_tools) if mcp_tools else llm
-tool_node = ToolNode(mcp_tools) if mcp_tools else None
+# Independent MCP calls run concurrently over the pooled sessions, each with a timeout
+tool_node = ConcurrentToolNode(mcp_tools, timeout=15) if mcp_tools else None
 
 class ChatState(TypedDict):
     messages: Annotated[list[BaseMessage], add_messages]
@@ -77,7 +77,7 @@ else:
 # Skip sqlite here due to missing dependencies/complexities out of demo scope, just run pure compile
 chatbot = graph.compile()
 
-# Example Invocation via run_async
+# Example Invocation
 async def main():
     print("\n--- Running AI Flow asking Math Query via MCP ---")
     inputs = {"messages": [HumanMessage(content="Can you add 400 and 80. Then divide the result by 2 using your tools?")]}
@@ -88,5 +88,7 @@ if __name__ == "__main__":
     if mcp_tools:
         # Run test explicitly
         asyncio.run(main())
+        print("MCP sessions:", mcp_manager.stats())
+        mcp_manager.close()
     else:
         print("MCP Tools omitted due to missing packages or server connection.")
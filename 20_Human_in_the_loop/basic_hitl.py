@@ -1,11 +1,17 @@
+import sqlite3
+import sys
+from pathlib import Path
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import interrupt, Command
-from langgraph.checkpoint.memory import MemorySaver
 from typing import Annotated, TypedDict
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langgraph.graph.message import add_messages
 from langchain_openai import ChatOpenAI
 
+# Shared helpers live in <repo>/common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.interrupt_store import InterruptSqliteSaver, resume_interrupts
+
 # Initialize LLM
 llm = ChatOpenAI(model="gpt-4o-mini")
 
@@ -32,11 +38,28 @@ builder.add_node("chat", chat_node)
 builder.add_edge(START, "chat")
 builder.add_edge("chat", END)
 
-# Checkpointer is required for interrupts
-checkpointer = MemorySaver()
+# Checkpointer is required for interrupts; this one also indexes pending approvals
+checkpointer = InterruptSqliteSaver(sqlite3.connect("hitl.db", check_same_thread=False))
 app = builder.compile(checkpointer=checkpointer)
 
+def review_pending():
+    """Approve or reject every pending approval at once, across all threads."""
+    page = checkpointer.list_interrupts(type="approval", limit=500)
+    for item in page.interrupts:
+        print(f"[{item.thread_id}] waiting {item.age:.0f}s: {item.value['question']}")
+    if not page.interrupts:
+        print("Nothing waiting for approval.")
+        return
+    answer = input(f"Approve all {len(page.interrupts)}? (yes/no): ").strip().lower()
+    result = resume_interrupts(app, page.interrupts, {"approved": answer},
+                               label="approved" if answer == "yes" else "rejected")
+    print(result)
+
 if __name__ == "__main__":
+    if "--review" in sys.argv:
+        review_pending()
+        sys.exit()
+
     # Running — First invoke (triggers interrupt)
     config = {"configurable": {"thread_id": "thread-1"}}
 
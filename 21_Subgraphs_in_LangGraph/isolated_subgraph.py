@@ -1,7 +1,13 @@
+import sys
+from pathlib import Path
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
 from langchain_openai import ChatOpenAI
 
+# Shared helpers live in <repo>/common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.translation import ChunkedTranslator, TranslationMemory
+
 # 1. Subgraph state & LLM
 # Subgraph has its OWN state (separate from parent)
 class SubState(TypedDict):
@@ -9,16 +15,15 @@ class SubState(TypedDict):
     translated_text: str
 
 subgraph_llm = ChatOpenAI(model='gpt-4o-mini')
+# Long answers are split into paragraph/sentence segments translated concurrently (at most 8 in
+# flight); segments already in the translation memory are reused without a model call. That memory
+# is the only cache: an LLM response cache as well would store every segment a second time
+translator = ChunkedTranslator(subgraph_llm, "Hindi", memory=TranslationMemory("translation_memory.db"),
+                               max_concurrency=8)
 
 # 2. Subgraph node & compilation
 def translate_text(state: SubState):
-    prompt = f"""Translate the following text to Hindi.
-Keep it natural and clear. Do not add extra content.
-
-Text:
-{state["input_text"]}""".strip()
-
-    translated_text = subgraph_llm.invoke(prompt).content
+    translated_text = translator.translate(state["input_text"])
     return {'translated_text': translated_text}
 
 # Build the subgraph: START → translate_text → END
@@ -1,7 +1,13 @@
+import sys
+from pathlib import Path
 from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
 from langchain_openai import ChatOpenAI
 
+# Shared helpers live in <repo>/common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.translation import ChunkedTranslator, TranslationMemory
+
 # Shared state used by both parent and subgraph
 class ParentState(TypedDict):
     question: str
@@ -10,17 +16,16 @@ class ParentState(TypedDict):
 
 parent_llm  = ChatOpenAI(model='gpt-4o-mini')
 subgraph_llm = ChatOpenAI(model='gpt-4o-mini')
+# Long answers are split into paragraph/sentence segments translated concurrently (at most 8 in
+# flight); segments already in the translation memory are reused without a model call. That memory
+# is the only cache: an LLM response cache as well would store every segment a second time
+translator = ChunkedTranslator(subgraph_llm, "Hindi", memory=TranslationMemory("translation_memory.db"),
+                               max_concurrency=8)
 
 # Subgraph node reads from & writes to ParentState directly
 def translate_text(state: ParentState):   # uses ParentState, not SubState
     print("--- Translating inside Shared Subgraph Node ---")
-    prompt = f"""Translate the following text to Hindi.
-Keep it natural and clear. Do not add extra content.
-
-Text:
-{state["answer_eng"]}""".strip()
-
-    translated_text = subgraph_llm.invoke(prompt).content
+    translated_text = translator.translate(state["answer_eng"])
     return {'answer_hin': translated_text}  # directly updates parent state
 
 # Build subgraph on ParentState
@@ -1,11 +1,18 @@
+import sys
+from pathlib import Path
 import os
 import time
 from typing import TypedDict
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
 
+# Shared helpers live in <repo>/common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.llm_cache import SQLiteLLMCache
+from common.llm_clients import get_chat_model
+from common.message_serde import CompactSerializer
+
 # Load API keys
 load_dotenv('/Users/shubham_infinity/Desktop/Projects/LangGraph_Projects/.env')
 
@@ -14,9 +21,12 @@ class State(TypedDict):
     messages: list
     topic: str
 
+# Replays / branches re-run 'generate' with the same prompt -> served from cache
+llm_cache = SQLiteLLMCache("llm_cache.db", ttl_seconds=24 * 3600)
+
 # Define Nodes
 def generate_joke(state: State):
-    llm = ChatGroq(model="llama-3.3-70b-versatile")
+    llm = get_chat_model("groq", "llama-3.3-70b-versatile", cache=llm_cache)  # pooled + cached
     prompt = f"Tell me a short joke about {state.get('topic', 'AI')}."
     response = llm.invoke(prompt)
     return {"messages": state.get('messages', []) + [response]}
@@ -39,7 +49,9 @@ workflow.add_edge("generate", "review")
 workflow.add_edge("review", "publish")
 workflow.add_edge("publish", END)
 
-checkpointer = MemorySaver()
+# Messages are stored as compact msgpack (no default fields, repeated
+# response metadata interned once per checkpoint), compressed when large
+checkpointer = MemorySaver(serde=CompactSerializer())
 
 # Compile with Human-In-The-Loop interrupt before 'publish'
 app = workflow.compile(checkpointer=checkpointer, interrupt_before=["publish"])
@@ -87,3 +99,6 @@ new_config = app.update_state(
 print("Updated state topic to 'samosa'. Re-running from this new branch...")
 branch_response = app.invoke(None, new_config)
 print("Branched Output:", app.get_state(new_config).values['messages'][-1])
+
+print("\n=== 6. LLM Cache ===")
+print("Cache stats:", llm_cache.stats())
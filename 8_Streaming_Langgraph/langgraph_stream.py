@@ -1,10 +1,13 @@
+import sys
+from pathlib import Path
 import streamlit as st
 import time
 from typing import TypedDict
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from langgraph.graph import StateGraph, START, END
-from langchain_core.messages import HumanMessage
+
+# Shared helpers live in <repo>/common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.token_stream import coalesce, message_tokens
 
 load_dotenv('/Users/shubham_infinity/Desktop/Projects/LangGraph_Projects/.env')
 
@@ -25,16 +28,24 @@ if st.button("Run Generator"):
 class State(TypedDict):
     messages: list
 
-def call_model(state: State):
-    llm = ChatGroq(model="llama-3.3-70b-versatile")
-    response = llm.invoke(state['messages'])
-    return {"messages": [response]}
+# Streamlit re-runs this whole script on every interaction. The compiled graph
+# lives in the process-wide resource cache instead, and LangGraph / the provider
+# SDK are imported the first time a response is streamed, not on page load.
+@st.cache_resource
+def get_app():
+    from langgraph.graph import StateGraph, START, END
+    from common.llm_clients import get_chat_model
+
+    def call_model(state: State):
+        llm = get_chat_model("groq", "llama-3.3-70b-versatile")  # pooled, built once per process
+        response = llm.invoke(state['messages'])
+        return {"messages": [response]}
 
-workflow = StateGraph(State)
-workflow.add_node("agent", call_model)
-workflow.add_edge(START, "agent")
-workflow.add_edge("agent", END)
-app = workflow.compile()
+    workflow = StateGraph(State)
+    workflow.add_node("agent", call_model)
+    workflow.add_edge(START, "agent")
+    workflow.add_edge("agent", END)
+    return workflow.compile()
 
 st.subheader("2. LangGraph Token Streaming")
 
@@ -42,6 +53,8 @@ st.subheader("2. LangGraph Token Streaming")
 user_input = st.text_input("Ask the LLM something:")
 
 if st.button("Stream Response") and user_input:
+    from langchain_core.messages import HumanMessage
+    app = get_app()
     # We display the chat message bubble
     with st.chat_message('assistant'):
         # Topic 91: st.write_stream consumes a generator yielding tokens
@@ -50,14 +63,13 @@ if st.button("Stream Response") and user_input:
         # Generator expression that streams tokens
         def langgraph_token_generator():
             # Streams chunks as generated
-            for message_chunk, metadata in app.stream(
+            return message_tokens(app.stream(
                 {'messages': [HumanMessage(content=user_input)]},
                 stream_mode='messages'
-            ):
-                if message_chunk.content:
-                    yield message_chunk.content
+            ))
 
-        # Renders the tokens live on UI
-        full_response = st.write_stream(langgraph_token_generator())
+        # Renders the tokens live on UI, grouped into ~50ms pieces: one UI update
+        # per piece instead of per token keeps the front end ahead of the model
+        full_response = st.write_stream(coalesce(langgraph_token_generator(), max_delay=0.05))
         
         # In a real app, you would append full_response to session_state message history here. 
@@ -1,34 +1,61 @@
+import sqlite3
+import sys
+from pathlib import Path
 import streamlit as st
 import uuid
-from typing import TypedDict
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage, AIMessage
-from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
+
+# Shared helpers live in <repo>/common
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.token_stream import coalesce, message_tokens
 
 # --- SETUP LANGGRAPH BACKEND ---
 load_dotenv('/Users/shubham_infinity/Desktop/Projects/LangGraph_Projects/.env')
 
-class State(TypedDict):
-    messages: list
-
-def call_model(state: State):
-    llm = ChatGroq(model="llama-3.3-70b-versatile")
-    response = llm.invoke(state['messages'])
-    return {"messages": state['messages'] + [response]}
-
-workflow = StateGraph(State)
-workflow.add_node("agent", call_model)
-workflow.add_edge(START, "agent")
-workflow.add_edge("agent", END)
-
-# Checkpointer must be persistent across script reruns
-if "checkpointer" not in st.session_state:
-    st.session_state.checkpointer = MemorySaver()
-    
-# In a real app we compile using st.session_state.checkpointer OR use a database
-app = workflow.compile(checkpointer=st.session_state.checkpointer)
+HISTORY_PAGE_SIZE = 20
+
+# Streamlit re-runs this whole script on every interaction, so the checkpointer
+# and the compiled graph come from the process-wide resource cache. LangGraph
+# and the provider SDK are imported on first use, not on every page load.
+
+@st.cache_resource
+def get_checkpointer():
+    # In-memory SQLite (like MemorySaver) but with a per-thread message index,
+    # so resuming a chat loads only its last page of messages. One per process:
+    # every session shares it, each keeping to its own thread ids.
+    from common.delta_checkpoint import DeltaSqliteSaver
+    return DeltaSqliteSaver(sqlite3.connect(":memory:", check_same_thread=False))
+
+@st.cache_resource
+def get_app():
+    from typing import Annotated
+    from langgraph.graph import StateGraph, START, END
+    from langgraph.graph.message import add_messages
+    from common.context_window import ContextWindow, ContextWindowState
+    from common.llm_clients import get_chat_model
+
+    class State(ContextWindowState):
+        # add_messages appends each turn's input and reply to the thread's history
+        messages: Annotated[list, add_messages]
+
+    # Bounds the prompt: rolling summary (refreshed every 5 turns) + last 20 messages verbatim
+    context_window = ContextWindow(
+        "summary", last_n=20, summary_every=5,
+        summarizer=get_chat_model("groq", "llama-3.3-70b-versatile"),
+    )
+
+    def call_model(state: State):
+        llm = get_chat_model("groq", "llama-3.3-70b-versatile")  # pooled, built once per process
+        response = llm.invoke(context_window.select(state))
+        return {"messages": [response]}
+
+    workflow = StateGraph(State)
+    workflow.add_node("context", context_window)
+    workflow.add_node("agent", call_model)
+    workflow.add_edge(START, "context")
+    workflow.add_edge("context", "agent")
+    workflow.add_edge("agent", END)
+    return workflow.compile(checkpointer=get_checkpointer())
 
 # --- UTILITY FUNCTIONS (Topic 95) ---
 def generate_thread_id():
@@ -43,18 +70,19 @@ def reset_chat():
     st.session_state['thread_id'] = thread_id
     add_thread(thread_id)
     st.session_state['message_history'] = []
-
-def load_conversation(thread_id):
-    # Topic 97: Load from LangGraph Memory
-    config = {'configurable': {'thread_id': thread_id}}
-    state = app.get_state(config)
-    messages = state.values.get('messages', [])
-    
+    st.session_state['history_cursor'] = None
+
+def load_conversation(thread_id, before=None):
+    # Topic 97: Load from LangGraph Memory, one page at a time (newest first).
+    # Only the page's messages are deserialized, not the whole thread state.
+    page = get_checkpointer().get_messages_page(
+        thread_id, limit=HISTORY_PAGE_SIZE, before=before
+    )
     temp_messages = []
-    for msg in messages:
-        role = 'user' if isinstance(msg, HumanMessage) else 'assistant'
+    for msg in page.messages:
+        role = 'user' if msg.type == 'human' else 'assistant'
         temp_messages.append({'role': role, 'content': msg.content})
-    return temp_messages
+    return temp_messages, page.next_cursor
 
 # --- SESSION SETUP (Topic 94) ---
 if 'message_history' not in st.session_state:
@@ -66,6 +94,9 @@ if 'thread_id' not in st.session_state:
 if 'chat_threads' not in st.session_state:
     st.session_state['chat_threads'] = []
 
+if 'history_cursor' not in st.session_state:
+    st.session_state['history_cursor'] = None
+
 add_thread(st.session_state['thread_id'])
 
 # --- SIDEBAR UI (Topic 96) ---
@@ -79,12 +110,23 @@ for thread_id in st.session_state['chat_threads']:
     # Display each thread as a clickable button
     if st.sidebar.button(f"Chat: {str(thread_id)[:8]}"):
         st.session_state['thread_id'] = thread_id
-        st.session_state['message_history'] = load_conversation(thread_id)
+        messages, cursor = load_conversation(thread_id)
+        st.session_state['message_history'] = messages
+        st.session_state['history_cursor'] = cursor
 
 # --- MAIN UI & DYNAMIC CONFIG (Topic 98) ---
 st.title("Topic 93-99: Resume Chat UI")
 st.write(f"Active Thread ID: `{st.session_state['thread_id']}`")
 
+# Older messages are fetched on demand and prepended to the view
+if st.session_state['history_cursor'] is not None and st.button('Load older messages'):
+    older, cursor = load_conversation(
+        st.session_state['thread_id'], before=st.session_state['history_cursor']
+    )
+    st.session_state['message_history'] = older + st.session_state['message_history']
+    st.session_state['history_cursor'] = cursor
+    st.rerun()
+
 for msg in st.session_state['message_history']:
     with st.chat_message(msg['role']):
         st.write(msg['content'])
@@ -101,17 +143,19 @@ if user_input:
     CONFIG = {'configurable': {'thread_id': st.session_state['thread_id']}}
     
     # 3. Stream from Agent
+    from langchain_core.messages import HumanMessage
+    app = get_app()
     with st.chat_message('assistant'):
         def token_stream():
-            for chunk, _ in app.stream(
+            # Skip tokens from the summarizer running in the 'context' node
+            return message_tokens(app.stream(
                 {'messages': [HumanMessage(content=user_input)]},
                 config=CONFIG,
                 stream_mode='messages'
-            ):
-                if chunk.content:
-                    yield chunk.content
-                    
-        ai_message = st.write_stream(token_stream())
+            ), node='agent')
+
+        # One UI update per ~50ms of tokens rather than per token
+        ai_message = st.write_stream(coalesce(token_stream(), max_delay=0.05))
         
     # 4. Save Final AI message to UI history
     st.session_state['message_history'].append({'role': 'assistant', 'content': ai_message})
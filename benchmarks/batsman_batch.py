@@ -0,0 +1,130 @@
+"""Rows/sec for the Batsman workflow: one ``invoke`` per innings vs one vectorized batch ``invoke``.
+
+The graph is ``Batsman_parallel_workflow.ipynb``'s: ``calculate_sr``,
+``calculate_bpb`` and ``calculate_boundary_percent`` in parallel, then a
+summary. The per-innings loop is timed on ``--loop-rows`` innings and
+extrapolated, since a million graph runs take minutes. The batch graph
+runs the same metric nodes once on ``--rows`` innings held as NumPy
+columns. Zero balls, zero boundaries and zero runs are injected on purpose:
+both modes must give NaN there and the same values everywhere else.
+
+    python benchmarks/batsman_batch.py --rows 1000000 --loop-rows 5000
+"""
+import argparse
+import time
+from typing import TypedDict
+
+import numpy as np
+from langgraph.graph import END, START, StateGraph
+
+
+class BatsmanState(TypedDict):
+    runs: int
+    balls: int
+    fours: int
+    sixes: int
+    sr: float
+    bpb: float
+    boundary_percent: float
+    summary: str
+
+
+class BatsmanBatchState(TypedDict):
+    runs: np.ndarray
+    balls: np.ndarray
+    fours: np.ndarray
+    sixes: np.ndarray
+    sr: np.ndarray
+    bpb: np.ndarray
+    boundary_percent: np.ndarray
+    summary: dict
+
+
+def safe_ratio(num, den, scale=1.0):
+    num, den = np.asarray(num, dtype=float), np.asarray(den, dtype=float)
+    out = np.full(np.broadcast(num, den).shape, np.nan)
+    np.divide(num * scale, den, out=out, where=den != 0)
+    return out if out.ndim else float(out)
+
+
+def calculate_sr(state):
+    return {"sr": safe_ratio(state["runs"], state["balls"], 100)}
+
+
+def calculate_bpb(state):
+    return {"bpb": safe_ratio(state["balls"], state["fours"] + state["sixes"])}
+
+
+def calculate_boundary_percent(state):
+    return {"boundary_percent": safe_ratio((state["fours"] * 4) + (state["sixes"] * 6), state["runs"], 100)}
+
+
+def summary(state):
+    return {"summary": f"Strike Rate - {state['sr']}\nBalls per boundary - {state['bpb']}\n"
+                       f"Boundary percent - {state['boundary_percent']}"}
+
+
+def season_summary(state):
+    return {"summary": {"innings": int(state["runs"].size), "mean_sr": float(np.nanmean(state["sr"]))}}
+
+
+def build_graph(state_schema, summary_node):
+    graph = StateGraph(state_schema)
+    graph.add_node("calculate_sr", calculate_sr)
+    graph.add_node("calculate_bpb", calculate_bpb)
+    graph.add_node("calculate_boundary_percent", calculate_boundary_percent)
+    graph.add_node("summary", summary_node)
+    for node in ("calculate_sr", "calculate_bpb", "calculate_boundary_percent"):
+        graph.add_edge(START, node)
+        graph.add_edge(node, "summary")
+    graph.add_edge("summary", END)
+    return graph.compile()
+
+
+def make_season(rows: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    balls = rng.integers(0, 120, rows)
+    season = {"runs": rng.binomial(balls * 2, 0.6), "balls": balls,
+              "fours": rng.binomial(balls, 0.08), "sixes": rng.binomial(balls, 0.03)}
+    # Edge cases every few rows: no balls at all, no boundaries, boundaries but zero runs recorded
+    season["balls"][::97] = 0
+    season["fours"][::89] = season["sixes"][::89] = 0
+    season["runs"][::83] = 0
+    return season
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--loop-rows", type=int, default=5_000)
+    args = parser.parse_args()
+
+    season = make_season(args.rows)
+    loop_app = build_graph(BatsmanState, summary)
+    batch_app = build_graph(BatsmanBatchState, season_summary)
+
+    rows = min(args.loop_rows, args.rows)
+    start = time.perf_counter()
+    looped = [loop_app.invoke({k: int(season[k][i]) for k in ("runs", "balls", "fours", "sixes")})
+              for i in range(rows)]
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = batch_app.invoke(season)
+    batch_s = time.perf_counter() - start
+
+    print(f"{'mode':<26}{'rows':>10}{'seconds':>10}{'rows/s':>14}")
+    print(f"{'invoke per innings':<26}{rows:>10}{loop_s:>10.2f}{rows / loop_s:>14,.0f}"
+          f"   (~{args.rows / (rows / loop_s) / 60:.1f} min for {args.rows:,})")
+    print(f"{'batch invoke (NumPy)':<26}{args.rows:>10}{batch_s:>10.2f}{args.rows / batch_s:>14,.0f}")
+    print(f"speedup: {(args.rows / batch_s) / (rows / loop_s):,.0f}x")
+
+    for metric in ("sr", "bpb", "boundary_percent"):
+        expected = np.array([r[metric] for r in looped])
+        assert np.allclose(expected, batch[metric][:rows], equal_nan=True), metric
+    print(f"per-innings and batch results match on {rows:,} rows "
+          f"(NaN rows: {int(np.isnan(batch['bpb']).sum()):,} undefined balls-per-boundary)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Concurrent chat sessions per core with ``ChatServer`` and an async SQLite checkpointer.
+
+Each simulated user sends ``--turns`` messages to its own thread, one after
+another; ``--sessions`` users run at once. The model is the in-process
+``FakeChatModel`` with ``--latency`` seconds per reply, so throughput is
+bounded by how many turns the loop can keep waiting at once, not by a
+provider. Compared with the blocking loop of the examples (one conversation
+at a time, sync ``invoke``) on the same graph.
+
+A few extra turns are fired at one thread all at once to check that turns on
+the same thread are serialized: the thread must end with every message.
+
+    python benchmarks/chat_server_load.py --sessions 200 --turns 5 --latency 0.2
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated, TypedDict
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.messages import BaseMessage, HumanMessage
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.graph import START, StateGraph
+from langgraph.graph.message import add_messages
+
+from benchmarks.chat_fixtures import FakeChatModel
+from common.chat_server import ChatServer
+
+
+class ChatState(TypedDict):
+    messages: Annotated[list[BaseMessage], add_messages]
+
+
+def build_graph(llm):
+    async def chat_node(state: ChatState):
+        return {"messages": [await llm.ainvoke(state["messages"])]}
+
+    def sync_chat_node(state: ChatState):
+        return {"messages": [llm.invoke(state["messages"])]}
+
+    graph = StateGraph(ChatState)
+    graph.add_node("chat_node", chat_node)
+    graph.add_edge(START, "chat_node")
+    sync_graph = StateGraph(ChatState)
+    sync_graph.add_node("chat_node", sync_chat_node)
+    sync_graph.add_edge(START, "chat_node")
+    return graph, sync_graph
+
+
+def report(label, elapsed, turns, p50_ms, p99_ms, sessions):
+    print(f"{label:<30}{turns:>7}{turns / elapsed:>10.1f}{p50_ms:>9.1f}{p99_ms:>9.1f}"
+          f"{sessions / (os.cpu_count() or 1):>15.0f}")
+
+
+def blocking_loop(sync_graph, sessions: int, turns: int):
+    """The examples' model: one conversation at a time, each turn blocking."""
+    from langgraph.checkpoint.memory import MemorySaver
+
+    chatbot = sync_graph.compile(checkpointer=MemorySaver())
+    latencies = []
+    start = time.perf_counter()
+    for session in range(sessions):
+        for turn in range(turns):
+            t0 = time.perf_counter()
+            chatbot.invoke({"messages": [HumanMessage(content=f"message {turn}")]},
+                           {"configurable": {"thread_id": f"user-{session}"}})
+            latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+    report("blocking loop (sync invoke)", time.perf_counter() - start, len(latencies),
+           latencies[len(latencies) // 2] * 1000, latencies[int(len(latencies) * 0.99)] * 1000, 1)
+
+
+async def served(graph, db_path: str, sessions: int, turns: int, burst: int):
+    async with AsyncSqliteSaver.from_conn_string(db_path) as checkpointer:
+        server = ChatServer(graph.compile(checkpointer=checkpointer), reply_node="chat_node")
+
+        async def user(session: int):
+            for turn in range(turns):
+                await server.turn(f"user-{session}", f"message {turn}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user(s) for s in range(sessions)))
+        elapsed = time.perf_counter() - start
+        stats = server.stats()
+        report(f"ChatServer ({sessions} sessions)", elapsed, stats["turns"], stats["p50_ms"],
+               stats["p99_ms"], stats["peak_active"])
+
+        # Same-thread turns fired together must run one after another
+        await asyncio.gather(*(server.turn("burst", f"burst {i}") for i in range(burst)))
+        state = await server.graph.aget_state({"configurable": {"thread_id": "burst"}})
+        print(f"\nburst of {burst} turns on one thread: {len(state.values['messages'])} messages "
+              f"(expected {2 * burst}), {server.stats()['queued_turns']} turns queued behind another")
+        await server.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model seconds per reply")
+    parser.add_argument("--blocking-sessions", type=int, default=5,
+                        help="sessions for the blocking baseline (it runs them one by one)")
+    parser.add_argument("--burst", type=int, default=10)
+    args = parser.parse_args()
+
+    graph, sync_graph = build_graph(FakeChatModel(latency=args.latency))
+    print(f"fake model latency {args.latency}s, {os.cpu_count()} core(s)\n")
+    print(f"{'mode':<30}{'turns':>7}{'turns/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'sessions/core':>15}")
+    blocking_loop(sync_graph, args.blocking_sessions, args.turns)
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(served(graph, os.path.join(tmp, "chat.db"), args.sessions, args.turns, args.burst))
+
+
+if __name__ == "__main__":
+    main()
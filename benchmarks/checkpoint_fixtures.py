@@ -0,0 +1,105 @@
+"""Synthetic chat checkpoints for the checkpointer benchmarks.
+
+``put_turn`` writes what one chat turn of ``sqlite_persistence.py`` writes:
+a checkpoint whose ``messages`` channel holds the whole conversation so far.
+
+``graph_scenarios(saver)`` runs small real graphs through a checkpointer:
+continuing after ``interrupt_before``, resuming ``interrupt()``, and
+resuming two parallel interrupts. Each is followed by another turn. It
+returns the persisted state of each, to compare against a plain
+``SqliteSaver``.
+"""
+import operator
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+
+REPLY = ("Sure! Here is a detailed answer that is roughly as long as a typical "
+         "assistant reply in these demos, with a bit of explanation. ") * 3
+
+
+def make_messages(turns: int) -> list:
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"Question number {i}: tell me something new?"))
+        messages.append(AIMessage(
+            content=REPLY,
+            response_metadata={"model_name": "llama-3.3-70b-versatile", "finish_reason": "stop",
+                               "token_usage": {"prompt_tokens": 40 + i, "completion_tokens": 60}},
+            id=f"run-{i:08d}",
+        ))
+    return messages
+
+
+def put_turn(saver, thread_id: str, parent_config: dict | None, messages: list, step: int) -> dict:
+    """Write one checkpoint carrying ``messages``; returns the config to chain the next one."""
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": messages}
+    checkpoint["channel_versions"] = {"messages": step + 1}
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    if parent_config is not None:
+        config["configurable"]["checkpoint_id"] = parent_config["configurable"]["checkpoint_id"]
+    metadata = {"source": "loop", "step": step, "parents": {}}
+    return saver.put(config, checkpoint, metadata, {"messages": step + 1})
+
+
+class ScenarioState(TypedDict, total=False):
+    messages: Annotated[list, operator.add]
+    out: Annotated[list, operator.add]
+
+
+def graph_scenarios(saver) -> dict:
+    """Persisted state after each scenario, keyed by scenario name."""
+    from langgraph.graph import END, START, StateGraph
+    from langgraph.types import Command, interrupt
+
+    def chat(state):
+        return {"messages": [f"reply to {state['messages'][-1]}"]}
+
+    def ask(state):
+        answer = interrupt(f"approve {state['messages'][-1]}?")
+        return {"messages": [f"answer {answer}"]}
+
+    def branch(name):
+        def node(state):
+            return {"out": [f"{name}={interrupt(name)}"]}
+        return node
+
+    results = {}
+
+    graph = StateGraph(ScenarioState)
+    graph.add_node("chat", chat)
+    graph.add_edge(START, "chat")
+    graph.add_edge("chat", END)
+    app = graph.compile(checkpointer=saver, interrupt_before=["chat"])
+    config = {"configurable": {"thread_id": "interrupt-before"}}
+    app.invoke({"messages": ["q1"]}, config)
+    app.invoke(None, config)
+    app.invoke({"messages": ["q2"]}, config)
+    app.invoke(None, config)
+    results["interrupt_before + invoke(None)"] = app.get_state(config).values
+
+    graph = StateGraph(ScenarioState)
+    graph.add_node("ask", ask)
+    graph.add_edge(START, "ask")
+    graph.add_edge("ask", END)
+    app = graph.compile(checkpointer=saver)
+    config = {"configurable": {"thread_id": "resume"}}
+    app.invoke({"messages": ["q1"]}, config)
+    app.invoke(Command(resume="yes"), config)
+    app.invoke({"messages": ["q2"]}, config)
+    app.invoke(Command(resume="no"), config)
+    results["interrupt() + Command(resume)"] = app.get_state(config).values
+
+    graph = StateGraph(ScenarioState)
+    graph.add_node("a", branch("a"))
+    graph.add_node("b", branch("b"))
+    graph.add_edge(START, "a")
+    graph.add_edge(START, "b")
+    app = graph.compile(checkpointer=saver)
+    config = {"configurable": {"thread_id": "parallel"}}
+    state = app.invoke({"out": []}, config)
+    app.invoke(Command(resume={i.id: i.value.upper() for i in state["__interrupt__"]}), config)
+    results["parallel interrupts"] = {"out": sorted(app.get_state(config).values["out"])}
+    return results
@@ -0,0 +1,94 @@
+"""Translation latency vs answer length: one call, chunked and concurrent, and with a translation memory.
+
+A fake translator model takes ``--base-latency`` seconds plus
+``--per-char`` seconds per input character, like a model whose output time
+grows with length. Answers of several sizes are built from a pool of
+sentences, so later answers repeat sentences seen in earlier ones.
+
+Reported per answer size: seconds for the single-call subgraph, for
+``ChunkedTranslator`` without memory, and for the same answers again with a
+warm ``TranslationMemory``, plus model calls and memory hit rate. The
+reassembled text must keep every paragraph break.
+
+    python benchmarks/chunked_translation.py --sizes 1 4 16 --base-latency 0.3
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from common.translation import PROMPT, ChunkedTranslator, TranslationMemory
+
+
+class FakeTranslator(BaseChatModel):
+    base_latency: float = 0.3
+    per_char: float = 0.0005
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-translator"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        text = messages[-1].content.split("Text:\n", 1)[-1]
+        time.sleep(self.base_latency + self.per_char * len(text))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text.upper()))])
+
+
+def make_answer(rng, paragraphs: int, pool: list[str]) -> str:
+    return "\n\n".join(" ".join(rng.choice(pool) for _ in range(rng.randint(3, 8))) for _ in range(paragraphs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 4, 16], help="paragraphs per answer")
+    parser.add_argument("--answers", type=int, default=3, help="answers per size")
+    parser.add_argument("--base-latency", type=float, default=0.3)
+    parser.add_argument("--per-char", type=float, default=0.0005)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = [f"Quantum fact number {i} says particles behave in surprising ways." for i in range(60)]
+    llm = FakeTranslator(base_latency=args.base_latency, per_char=args.per_char)
+    print(f"{'paragraphs':>10}{'chars':>8}{'one call s':>12}{'chunked s':>11}{'memory s':>10}"
+          f"{'calls':>7}{'hit rate':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = TranslationMemory(os.path.join(tmp, "tm.db"))
+        for size in args.sizes:
+            answers = [make_answer(rng, size, pool) for _ in range(args.answers)]
+            start = time.perf_counter()
+            for answer in answers:
+                llm.invoke(PROMPT.format(language="Hindi", text=answer).strip())
+            single = (time.perf_counter() - start) / len(answers)
+
+            plain = ChunkedTranslator(llm, max_concurrency=args.max_concurrency, max_chars=300)
+            start = time.perf_counter()
+            for answer in answers:
+                translated = plain.translate(answer)
+                assert translated.count("\n\n") == answer.count("\n\n")
+            chunked = (time.perf_counter() - start) / len(answers)
+
+            cached = ChunkedTranslator(llm, memory=memory, max_concurrency=args.max_concurrency, max_chars=300)
+            for answer in answers:
+                cached.translate(answer)   # warm the memory
+            start = time.perf_counter()
+            for answer in answers:
+                cached.translate(answer)
+            warm = (time.perf_counter() - start) / len(answers)
+            stats = cached.stats()
+            print(f"{size:>10}{sum(map(len, answers)) // len(answers):>8}{single:>12.2f}{chunked:>11.2f}"
+                  f"{warm:>10.3f}{stats['model_calls']:>7}{stats['hit_rate']:>10.0%}")
+        memory.close()
+
+
+if __name__ == "__main__":
+    main()
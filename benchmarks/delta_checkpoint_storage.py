@@ -0,0 +1,92 @@
+"""DB size and read/write latency: full-state checkpoints vs delta-encoded ones.
+
+Replays long chat threads the way ``resume_chat.py`` writes them (every
+checkpoint carries the whole message list) into a plain ``SqliteSaver`` and a
+``DeltaSqliteSaver``, then reads them back with a cold cache.
+
+First it checks that real graphs end in the same persisted state on both
+savers: continuing after ``interrupt_before``, resuming ``interrupt()``,
+and resuming two parallel interrupts.
+
+    python benchmarks/delta_checkpoint_storage.py --turns 500 --threads 2
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from benchmarks.checkpoint_fixtures import graph_scenarios, make_messages, put_turn
+from common.delta_checkpoint import ConcurrentDeltaSqliteSaver, DeltaSqliteSaver
+
+
+def db_size(path):
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+def check_graphs(tmp):
+    """Delta savers must persist exactly what a plain SqliteSaver persists."""
+    expected = graph_scenarios(SqliteSaver(sqlite3.connect(":memory:", check_same_thread=False)))
+    savers = {
+        "delta": DeltaSqliteSaver(sqlite3.connect(":memory:", check_same_thread=False), snapshot_every=3),
+        "concurrent-delta": ConcurrentDeltaSqliteSaver(f"{tmp}/graphs.db", snapshot_every=3),
+    }
+    for label, saver in savers.items():
+        got = graph_scenarios(saver)
+        for scenario, values in expected.items():
+            assert got[scenario] == values, f"{label}, {scenario}: {got[scenario]} != {values}"
+    print(f"graph check: {len(expected)} scenarios match SqliteSaver ({', '.join(savers)})")
+
+
+def run(label, make_saver, path, turns, threads):
+    messages = make_messages(turns)
+    saver = make_saver(sqlite3.connect(path, check_same_thread=False))
+    write_times = []
+    for t in range(threads):
+        config = None
+        for step in range(turns):
+            t0 = time.perf_counter()
+            config = put_turn(saver, f"thread-{t}", config, messages[:2 * (step + 1)], step)
+            write_times.append(time.perf_counter() - t0)
+    saver.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    saver.conn.close()
+
+    # Cold read: fresh connection and saver, nothing cached
+    saver = make_saver(sqlite3.connect(path, check_same_thread=False))
+    config = {"configurable": {"thread_id": "thread-0"}}
+    t0 = time.perf_counter()
+    saver.get_tuple(config)
+    latest = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    history = sum(1 for _ in saver.list(config))
+    full_history = time.perf_counter() - t0
+    saver.conn.close()
+
+    tail = write_times[-50:]
+    print(f"{label:<10} db={db_size(path) / 1e6:8.2f}MB  write total={sum(write_times):7.2f}s "
+          f"last-50 avg={sum(tail) / len(tail) * 1000:7.2f}ms  "
+          f"get_tuple={latest * 1000:7.2f}ms  list({history})={full_history * 1000:8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=2)
+    parser.add_argument("--snapshot-every", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_graphs(tmp)
+        run("full", SqliteSaver, f"{tmp}/full.db", args.turns, args.threads)
+        run("delta", lambda conn: DeltaSqliteSaver(conn, snapshot_every=args.snapshot_every),
+            f"{tmp}/delta.db", args.turns, args.threads)
+
+
+if __name__ == "__main__":
+    main()
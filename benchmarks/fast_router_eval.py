@@ -0,0 +1,153 @@
+"""Offline evaluation of the local fast-path router against logged LLM decisions.
+
+Without ``--log``, a synthetic review stream stands in for production
+traffic. Most reviews are obvious one- or two-sentence ones ("The app
+crashed three times today."). Some are mixed or sarcastic, and the fake
+model labels those inconsistently. It labels every review after
+``--latency`` seconds. The first ``--train`` decisions are logged and used
+to train ``NaiveBayesClassifier``. The rest are replayed through
+``evaluate_router`` for the lexicon and for the trained classifier:
+coverage, agreement with the model and model seconds saved per threshold.
+Each table ends with the threshold to use: the widest coverage at
+``--min-agreement`` or better. The notebook's demo reviews must clear the
+lexicon's.
+
+Then the held-out reviews run live through ``FastPathRouter`` (threshold
+``--threshold``) against the model-only baseline, reporting wall-clock time
+and the share of calls answered locally.
+
+    python benchmarks/fast_router_eval.py --reviews 2000 --train 1000 --latency 0.05
+    python benchmarks/fast_router_eval.py --log sentiment_decisions.jsonl
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Literal
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from pydantic import BaseModel
+
+from common.fast_router import (SENTIMENT_LEXICON, DecisionLog, FastPathRouter, LexiconClassifier,
+                                NaiveBayesClassifier, evaluate_router)
+
+NEGATIVE = ["The app crashed three times today.", "Useless after the update, it freezes constantly.",
+            "Worst experience, I want a refund.", "Login is broken and support never replies.",
+            "So slow it is unusable.", "Error on every checkout, very frustrating.",
+            "Not great, not smooth, and definitely not fast.",
+            "I don't love it, it's not perfect, nowhere near amazing."]
+POSITIVE = ["Love the new dark mode!", "Great app, works great on my phone.", "Support was really helpful, thank you.",
+            "Smooth and fast, perfect for daily use.", "Amazing update, excellent design."]
+DEMO = ["The app crashed three times today. Very frustrating experience.",
+        "Love the new dark mode, the app feels so much faster now!"]   # LLM_Review_Workflow.ipynb
+HARD = [("Great, another update that crashed my phone.", "negative"),
+        ("I used to hate it but now it is fine.", "positive"),
+        ("Not bad, not great either, does the job.", "positive"),
+        ("It would be perfect if it did not freeze.", "negative")]
+
+
+class SentimentSchema(BaseModel):
+    sentiment: Literal["positive", "negative"]
+
+
+class FakeSentimentModel:
+    """Knows the true label of every generated review; costs ``latency`` seconds per call."""
+
+    def __init__(self, truth: dict[str, str], latency: float):
+        self.truth = truth
+        self.latency = latency
+
+    def invoke(self, prompt, config=None, **kwargs):
+        time.sleep(self.latency)
+        return SentimentSchema(sentiment=self.truth[prompt])
+
+
+def make_reviews(count: int, hard_share: float, rng) -> dict[str, str]:
+    reviews = {}
+    while len(reviews) < count:
+        if rng.random() < hard_share:
+            text, label = rng.choice(HARD)
+            if rng.random() < 0.3:   # the model itself is inconsistent on these
+                label = "positive" if label == "negative" else "negative"
+        else:
+            label = rng.choice(["negative", "positive"])
+            text = " ".join(rng.sample(NEGATIVE if label == "negative" else POSITIVE, rng.choice([1, 2])))
+        reviews[f"#{len(reviews)} {text}"] = label
+    return reviews
+
+
+def report(label, rows, min_agreement):
+    print(f"\n{label}\n{'threshold':>10}{'coverage':>10}{'agreement':>11}{'saved s':>9}{'local ms':>10}")
+    for row in rows:
+        print(f"{row['threshold']:>10.2f}{row['coverage']:>10.1%}{row['agreement']:>11.1%}"
+              f"{row['saved_s']:>9.2f}{row['local_ms_per_call']:>10.3f}")
+    good = [row for row in rows if row["agreement"] >= min_agreement and row["coverage"] > 0]
+    if not good:
+        print(f"no threshold reaches {min_agreement:.0%} agreement")
+        return None
+    best = max(good, key=lambda row: (row["coverage"], row["threshold"]))
+    print(f"use threshold {best['threshold']:.2f}: {best['coverage']:.1%} answered locally, "
+          f"{best['agreement']:.1%} agreement")
+    return best["threshold"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--log", help="evaluate a real DecisionLog JSONL instead of synthetic reviews")
+    parser.add_argument("--reviews", type=int, default=2000)
+    parser.add_argument("--train", type=int, default=1000)
+    parser.add_argument("--hard-share", type=float, default=0.15, help="share of mixed/sarcastic reviews")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per model call")
+    parser.add_argument("--threshold", type=float, default=0.95)
+    parser.add_argument("--min-agreement", type=float, default=0.99)
+    args = parser.parse_args()
+
+    if args.log:
+        records = DecisionLog(args.log).read()
+        split = len(records) // 2
+        report("lexicon", evaluate_router(LexiconClassifier(SENTIMENT_LEXICON), records[split:]),
+               args.min_agreement)
+        trained = NaiveBayesClassifier.fit([r["text"] for r in records[:split]], [r["label"] for r in records[:split]])
+        report(f"naive Bayes on {split} logged decisions", evaluate_router(trained, records[split:]),
+               args.min_agreement)
+        return
+
+    rng = random.Random(0)
+    truth = make_reviews(args.reviews, args.hard_share, rng)
+    texts = list(truth)
+    model = FakeSentimentModel(truth, args.latency)
+    with tempfile.TemporaryDirectory() as tmp:
+        log = DecisionLog(os.path.join(tmp, "decisions.jsonl"))
+        for text in texts[:args.train]:   # production traffic answered by the model, logged
+            log.append(text, truth[text], args.latency)
+        held_out = [{"text": t, "label": truth[t], "seconds": args.latency} for t in texts[args.train:]]
+        lexicon = LexiconClassifier(SENTIMENT_LEXICON)
+        threshold = report("lexicon", evaluate_router(lexicon, held_out), args.min_agreement)
+        for review in DEMO:
+            label, confidence = lexicon.predict(review)
+            assert threshold is not None and confidence >= threshold, f"{review!r}: {label} at {confidence:.2f}"
+        trained = NaiveBayesClassifier.fit(*log.examples())
+        report(f"naive Bayes on {args.train} logged decisions", evaluate_router(trained, held_out),
+               args.min_agreement)
+
+        router = FastPathRouter(model, trained, schema=SentimentSchema, field="sentiment",
+                                threshold=args.threshold, log=log)
+        live = texts[args.train:]
+        start = time.perf_counter()
+        baseline = [model.invoke(t).sentiment for t in live]
+        model_only = time.perf_counter() - start
+        start = time.perf_counter()
+        routed = [router.invoke(t).sentiment for t in live]
+        fast_path = time.perf_counter() - start
+        stats = router.stats()
+        agreement = sum(a == b for a, b in zip(baseline, routed)) / len(live)
+        print(f"\nlive, threshold {args.threshold}: model only {model_only:.2f}s, fast path {fast_path:.2f}s "
+              f"({stats['fast_share']:.0%} answered locally, {agreement:.1%} same labels)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""Framework overhead of LangGraph itself, apart from model time, as diffable JSON.
+
+Every graph uses pure-Python nodes, or a zero-latency fake chat model for
+the chat and tool graphs, so the numbers measure only compile, scheduling,
+state merging and checkpointing:
+
+* ``compile/*``: ``compile()`` of the Batsman, chat, tool-agent and a 50-node chain graph;
+* ``step/chain_N``: one ``invoke`` of an N-node chain, and ``per_step`` = the slope over N;
+* ``fanout/edges_K``, ``fanout/send_K``: START -> K parallel nodes -> join, by static
+  edges and by ``Send``;
+* ``checkpoint/<saver>_chain_10``: a 10-step chain with no checkpointer, ``MemorySaver``
+  and ``SqliteSaver``; ``per_step`` is the added cost per step;
+* ``history/<saver>_N``: ``list(get_state_history())`` of a chat thread with N turns.
+
+Each entry stores the median, p90 and min milliseconds over ``--repeat`` runs.
+``--baseline old.json`` compares the medians with a previous run. Entries
+slower by more than ``--tolerance`` are flagged, and ``--fail-on-regression``
+turns that into exit status 1.
+
+    python benchmarks/graph_runtime.py --output runtime.json
+    python benchmarks/graph_runtime.py --baseline runtime.json --output runtime-new.json
+"""
+import argparse
+import json
+import operator
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated, TypedDict
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import langgraph
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import tool
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.types import Send
+
+from benchmarks.chat_fixtures import FakeChatModel
+
+
+def timed(fn, repeat: int, warmup: int = 2) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {"median_ms": statistics.median(samples), "p90_ms": samples[min(len(samples) - 1, int(len(samples) * 0.9))],
+            "min_ms": samples[0], "n": repeat}
+
+
+# --- graphs ---
+class BatsmanState(TypedDict):
+    runs: int
+    balls: int
+    fours: int
+    sixes: int
+    sr: float
+    bpb: float
+    boundary_percent: float
+    summary: str
+
+
+def batsman_graph():
+    graph = StateGraph(BatsmanState)
+    graph.add_node("calculate_sr", lambda s: {"sr": s["runs"] / s["balls"] * 100})
+    graph.add_node("calculate_bpb", lambda s: {"bpb": s["balls"] / (s["fours"] + s["sixes"])})
+    graph.add_node("calculate_boundary_percent",
+                   lambda s: {"boundary_percent": (s["fours"] * 4 + s["sixes"] * 6) / s["runs"] * 100})
+    graph.add_node("summary", lambda s: {"summary": f"{s['sr']} {s['bpb']} {s['boundary_percent']}"})
+    for node in ("calculate_sr", "calculate_bpb", "calculate_boundary_percent"):
+        graph.add_edge(START, node)
+        graph.add_edge(node, "summary")
+    graph.add_edge("summary", END)
+    return graph
+
+
+class ChatState(TypedDict):
+    messages: Annotated[list[BaseMessage], add_messages]
+
+
+def chat_graph(llm):
+    graph = StateGraph(ChatState)
+    graph.add_node("chat_node", lambda s: {"messages": [llm.invoke(s["messages"])]})
+    graph.add_edge(START, "chat_node")
+    graph.add_edge("chat_node", END)
+    return graph
+
+
+@tool
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+class ToolCallingFake(BaseChatModel):
+    """Asks for ``add`` once per human message, then answers."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-tool-calling"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if isinstance(messages[-1], HumanMessage):
+            message = AIMessage(content="", tool_calls=[{"name": "add", "args": {"a": 1, "b": 2},
+                                                         "id": f"call-{len(messages)}"}])
+        else:
+            message = AIMessage(content="The answer is 3.")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def tool_graph():
+    llm = ToolCallingFake().bind_tools([add])
+    graph = StateGraph(ChatState)
+    graph.add_node("chat_node", lambda s: {"messages": [llm.invoke(s["messages"])]})
+    graph.add_node("tools", ToolNode([add]))
+    graph.add_edge(START, "chat_node")
+    graph.add_conditional_edges("chat_node", tools_condition)
+    graph.add_edge("tools", "chat_node")
+    return graph
+
+
+class CounterState(TypedDict):
+    count: int
+    hits: Annotated[list[int], operator.add]
+
+
+def chain_graph(length: int):
+    graph = StateGraph(CounterState)
+    for i in range(length):
+        graph.add_node(f"n{i}", lambda s: {"count": s["count"] + 1})
+        graph.add_edge(START if i == 0 else f"n{i - 1}", f"n{i}")
+    graph.add_edge(f"n{length - 1}", END)
+    return graph
+
+
+def fanout_graph(width: int):
+    graph = StateGraph(CounterState)
+    for i in range(width):
+        graph.add_node(f"w{i}", lambda s, i=i: {"hits": [i]})
+        graph.add_edge(START, f"w{i}")
+        graph.add_edge(f"w{i}", "join")
+    graph.add_node("join", lambda s: {"count": len(s["hits"])})
+    graph.add_edge("join", END)
+    return graph
+
+
+def send_graph(width: int):
+    graph = StateGraph(CounterState)
+    graph.add_node("worker", lambda s: {"hits": [s["count"]]})
+    graph.add_node("join", lambda s: {"count": len(s["hits"])})
+    graph.add_conditional_edges(START, lambda s: [Send("worker", {"count": i, "hits": []}) for i in range(width)],
+                                ["worker"])
+    graph.add_edge("worker", "join")
+    graph.add_edge("join", END)
+    return graph
+
+
+# --- suites ---
+def bench_compile(results, repeat):
+    builders = {"batsman": batsman_graph, "chat": lambda: chat_graph(FakeChatModel(latency=0)),
+                "tool_agent": tool_graph, "chain_50": lambda: chain_graph(50)}
+    for name, build in builders.items():
+        graph = build()
+        results[f"compile/{name}"] = timed(graph.compile, repeat)
+
+
+def bench_steps(results, repeat):
+    lengths = (1, 10, 50)
+    for length in lengths:
+        app = chain_graph(length).compile()
+        results[f"step/chain_{length}"] = timed(lambda: app.invoke({"count": 0, "hits": []}), repeat)
+    slope = ((results["step/chain_50"]["median_ms"] - results["step/chain_1"]["median_ms"])
+             / (lengths[-1] - lengths[0]))
+    results["step/per_step"] = {"median_ms": slope, "n": repeat}
+    batsman = batsman_graph().compile()
+    results["step/batsman"] = timed(lambda: batsman.invoke({"runs": 120, "balls": 60, "fours": 12, "sixes": 6}),
+                                    repeat)
+    chat = chat_graph(FakeChatModel(latency=0)).compile()
+    results["step/chat_turn"] = timed(lambda: chat.invoke({"messages": [HumanMessage(content="hi")]}), repeat)
+    agent = tool_graph().compile()
+    results["step/tool_agent_turn"] = timed(lambda: agent.invoke({"messages": [HumanMessage(content="1+2?")]}),
+                                            repeat)
+
+
+def bench_fanout(results, repeat):
+    for width in (1, 4, 16, 64):
+        edges = fanout_graph(width).compile()
+        results[f"fanout/edges_{width}"] = timed(lambda: edges.invoke({"count": 0, "hits": []}), repeat)
+        send = send_graph(width).compile()
+        results[f"fanout/send_{width}"] = timed(lambda: send.invoke({"count": 0, "hits": []}), repeat)
+
+
+def bench_checkpoint(results, repeat, tmp):
+    steps = 10
+    savers = {"none": None, "memory": MemorySaver(),
+              "sqlite": SqliteSaver(sqlite3.connect(os.path.join(tmp, "steps.db"), check_same_thread=False))}
+    for name, saver in savers.items():
+        app = chain_graph(steps).compile(checkpointer=saver)
+        counter = iter(range(10 ** 9))
+
+        def run():
+            config = {"configurable": {"thread_id": f"t{next(counter)}"}} if saver is not None else None
+            app.invoke({"count": 0, "hits": []}, config)
+
+        results[f"checkpoint/{name}_chain_{steps}"] = timed(run, repeat)
+    base = results[f"checkpoint/none_chain_{steps}"]["median_ms"]
+    for name in ("memory", "sqlite"):
+        added = results[f"checkpoint/{name}_chain_{steps}"]["median_ms"] - base
+        # steps + 1 checkpoints per run: the input checkpoint plus one per super-step
+        results[f"checkpoint/{name}_per_step"] = {"median_ms": added / (steps + 1), "n": repeat}
+
+
+def bench_history(results, repeat, tmp, sizes):
+    llm = FakeChatModel(latency=0)
+    savers = {"memory": MemorySaver(),
+              "sqlite": SqliteSaver(sqlite3.connect(os.path.join(tmp, "history.db"), check_same_thread=False))}
+    for name, saver in savers.items():
+        app = chat_graph(llm).compile(checkpointer=saver)
+        config = {"configurable": {"thread_id": "history"}}
+        turns = 0
+        for size in sizes:
+            while turns < size:
+                app.invoke({"messages": [HumanMessage(content=f"turn {turns}")]}, config)
+                turns += 1
+            results[f"history/{name}_{size}"] = timed(lambda: list(app.get_state_history(config)),
+                                                      max(3, repeat // 10), warmup=1)
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"python": platform.python_version(), "langgraph": getattr(langgraph, "__version__", None)
+            or _version("langgraph"), "platform": platform.platform(), "cpus": os.cpu_count(),
+            "commit": commit, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def _version(package: str):
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return None
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Print old vs new medians; returns the names that got slower than ``tolerance`` allows."""
+    regressions = []
+    width = max([34] + [len(name) + 2 for name in results])
+    print(f"\n{'benchmark':<{width}}{'baseline ms':>13}{'now ms':>10}{'change':>9}")
+    for name, entry in results.items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        before, now = old["median_ms"], entry["median_ms"]
+        change = (now - before) / before if before > 0 else 0.0
+        # Ignore sub-50us deltas: below timer noise for derived per-step numbers
+        flag = change > tolerance and now - before > 0.05
+        if flag:
+            regressions.append(name)
+        print(f"{name:<{width}}{before:>13.3f}{now:>10.3f}{change:>+9.0%}{'  REGRESSION' if flag else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--history", type=int, nargs="+", default=[10, 100, 500], help="turns per history size")
+    parser.add_argument("--suites", nargs="+", default=["compile", "step", "fanout", "checkpoint", "history"])
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before flagging")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        suites = {"compile": lambda: bench_compile(results, args.repeat),
+                  "step": lambda: bench_steps(results, args.repeat),
+                  "fanout": lambda: bench_fanout(results, args.repeat),
+                  "checkpoint": lambda: bench_checkpoint(results, args.repeat, tmp),
+                  "history": lambda: bench_history(results, args.repeat, tmp, sorted(args.history))}
+        for name in args.suites:
+            suites[name]()
+
+    print(f"{'benchmark':<34}{'median ms':>11}{'p90 ms':>10}")
+    for name, entry in results.items():
+        p90 = f"{entry['p90_ms']:>10.3f}" if "p90_ms" in entry else ""
+        print(f"{name:<34}{entry['median_ms']:>11.3f}{p90}")
+
+    report = {"environment": environment(), "repeat": args.repeat, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Listing pending approvals from the interrupt index vs scanning every thread, and bulk resume.
+
+Pauses ``--threads`` threads of a one-node approval graph (the shape of
+``basic_hitl.py``) on an ``InterruptSqliteSaver``. Then it times:
+
+* listing what waits for approval with ``list_interrupts`` vs calling
+  ``get_state`` on every thread;
+* answering them all with ``resume_interrupts``.
+
+Before the bulk resume, one thread is resumed with a plain ``invoke``.
+Every resumed thread is then read back through a fresh saver: the
+approved node's output must be persisted and no interrupt left pending.
+
+    python benchmarks/interrupt_queue.py --threads 500
+"""
+import argparse
+import operator
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Annotated, TypedDict
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command, interrupt
+
+from common.interrupt_store import InterruptSqliteSaver, resume_interrupts
+
+
+class State(TypedDict):
+    messages: Annotated[list, operator.add]
+
+
+def chat(state):
+    decision = interrupt({"type": "approval", "question": state["messages"][-1]})
+    return {"messages": [f"{decision['approved']}: answer to {state['messages'][-1]}"]}
+
+
+def build(saver):
+    graph = StateGraph(State)
+    graph.add_node("chat", chat)
+    graph.add_edge(START, "chat")
+    graph.add_edge("chat", END)
+    return graph.compile(checkpointer=saver)
+
+
+def config(i):
+    return {"configurable": {"thread_id": f"thread-{i}"}}
+
+
+def check_persisted(path, threads):
+    app = build(InterruptSqliteSaver(sqlite3.connect(path, check_same_thread=False)))
+    for i in range(threads):
+        state = app.get_state(config(i))
+        expected = [f"question {i}", f"yes: answer to question {i}"]
+        assert state.values["messages"] == expected, f"thread-{i}: {state.values['messages']}"
+        assert not state.interrupts, f"thread-{i} still interrupted"
+    assert app.checkpointer.count_interrupts(type="approval") == 0
+    assert app.checkpointer.count_interrupts(status="resumed") == threads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/hitl.db"
+        app = build(InterruptSqliteSaver(sqlite3.connect(path, check_same_thread=False)))
+        t0 = time.perf_counter()
+        for i in range(args.threads):
+            app.invoke({"messages": [f"question {i}"]}, config(i))
+        print(f"paused {args.threads} threads in {time.perf_counter() - t0:.2f}s")
+
+        t0 = time.perf_counter()
+        page = app.checkpointer.list_interrupts(type="approval", limit=args.threads)
+        indexed = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        scanned = sum(len(app.get_state(config(i)).interrupts) for i in range(args.threads))
+        scan = time.perf_counter() - t0
+        assert len(page.interrupts) == scanned == args.threads
+        print(f"list pending: index {indexed * 1000:8.1f}ms   get_state scan {scan * 1000:8.1f}ms")
+
+        # One thread answered directly, the rest in bulk
+        app.invoke(Command(resume={"approved": "yes"}), config(0))
+        page = app.checkpointer.list_interrupts(type="approval", limit=args.threads)
+        assert len(page.interrupts) == args.threads - 1
+        result = resume_interrupts(app, page.interrupts, {"approved": "yes"}, label="approved",
+                                   max_workers=args.workers)
+        assert not result.failed and not result.skipped, result
+        print(f"bulk resume: {result}  ({len(result.resumed) / result.seconds:.0f} threads/s)")
+
+        check_persisted(path, args.threads)
+        print("resumed output persisted on every thread")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Per-turn overhead of building ChatGroq per call vs the pooled registry.
+
+Runs against a local fake endpoint, so the numbers are pure client cost:
+model construction, HTTP client setup and connection establishment.
+
+    python benchmarks/llm_client_overhead.py --turns 200
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.messages import HumanMessage
+from langchain_groq import ChatGroq
+
+from benchmarks.fake_llm_server import FakeLLMServer
+from common.llm_clients import close_clients, get_chat_model
+
+MODEL = "llama-3.3-70b-versatile"
+
+
+def run(label, make_llm, server, turns):
+    messages = [HumanMessage(content="Hello!")]
+    start_conns = server.connections
+    timings = []
+    for _ in range(turns):
+        t0 = time.perf_counter()
+        make_llm().invoke(messages)
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    print(f"{label:<28} mean={statistics.mean(timings):7.2f}ms "
+          f"p50={timings[len(timings) // 2]:7.2f}ms "
+          f"p99={timings[int(len(timings) * 0.99) - 1]:7.2f}ms "
+          f"connections={server.connections - start_conns}")
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="fake server latency (s)")
+    args = parser.parse_args()
+
+    with FakeLLMServer(latency=args.latency) as server:
+        opts = {"base_url": server.url, "api_key": "fake-key", "max_retries": 0}
+
+        before = run("before: ChatGroq per turn", lambda: ChatGroq(model=MODEL, **opts),
+                     server, args.turns)
+        after = run("after: pooled registry", lambda: get_chat_model("groq", MODEL, **opts),
+                    server, args.turns)
+        close_clients()
+
+    print(f"\nper-turn overhead saved: {before - after:.2f}ms ({before / after:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
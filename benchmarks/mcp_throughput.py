@@ -0,0 +1,147 @@
+"""Tool calls per second against the stdio ``arith_server.py``.
+
+Drives ``add``/``subtract``/``divide`` round robin from ``--concurrency``
+concurrent callers and reports calls/sec and p50/p99 latency for:
+
+* ``client``: ``MultiServerMCPClient`` tools as used before, one new session
+  (child process + handshake) per call;
+* ``serial``: one pooled session, one call at a time;
+* ``pipelined``: one pooled session with every call multiplexed on it;
+* ``pool``: ``--pool-size`` sessions sharing the callers;
+* ``call_many``: the whole fan-out sent in one ``call_many()`` batch.
+
+    python benchmarks/mcp_throughput.py --calls 2000 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from common.mcp_pool import MCPConnectionManager
+
+SERVER = Path(__file__).resolve().parent.parent / "12_MCP_Client_with_LangGraph" / "arith_server.py"
+CONNECTION = {
+    "transport": "stdio",
+    "command": sys.executable,
+    "args": [str(SERVER)],
+    "env": {"FASTMCP_SHOW_SERVER_BANNER": "false", "FASTMCP_LOG_LEVEL": "WARNING"},
+}
+TOOLS = ["add", "subtract", "divide"]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def workload(calls: int):
+    return [(TOOLS[i % 3], {"a": float(i), "b": float(i % 9 + 1)}) for i in range(calls)]
+
+
+async def drive(call, calls: int, concurrency: int):
+    """Run ``calls`` calls from ``concurrency`` workers; per-call latencies in seconds."""
+    jobs = iter(workload(calls))
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        for name, arguments in jobs:
+            start = time.perf_counter()
+            try:
+                await call(name, arguments)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def report(label, elapsed, latencies, errors, results):
+    row = {
+        "mode": label,
+        "calls": len(latencies),
+        "calls_per_s": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+    }
+    results.append(row)
+    print(f"{row['mode']:<24}{row['calls']:>7}{row['calls_per_s']:>10.1f}{row['p50_ms']:>9.2f}"
+          f"{row['p99_ms']:>9.2f}{row['errors']:>7}")
+
+
+def bench_client(calls: int, concurrency: int, results):
+    from langchain_mcp_adapters.client import MultiServerMCPClient
+
+    async def run():
+        tools = {t.name: t for t in await MultiServerMCPClient({"arith": CONNECTION}).get_tools()}
+        start = time.perf_counter()
+        latencies, errors = await drive(lambda name, args: tools[name].ainvoke(args), calls, concurrency)
+        return time.perf_counter() - start, latencies, errors
+
+    report(f"client c={concurrency}", *asyncio.run(run()), results)
+
+
+def bench_manager(label, calls: int, concurrency: int, results, **manager_args):
+    with MCPConnectionManager({"arith": CONNECTION}, schema_cache=None, **manager_args) as manager:
+        manager.warm(wait=True, sessions=manager.pool_size)
+
+        async def run():
+            start = time.perf_counter()
+            latencies, errors = await drive(lambda name, args: manager.acall_tool("arith", name, args),
+                                            calls, concurrency)
+            return time.perf_counter() - start, latencies, errors
+
+        report(label, *asyncio.run(run()), results)
+        return manager.stats()
+
+
+def bench_call_many(calls: int, batch: int, results):
+    with MCPConnectionManager({"arith": CONNECTION}, schema_cache=None, max_in_flight=batch) as manager:
+        manager.warm(wait=True)
+        jobs = [("arith", name, arguments) for name, arguments in workload(calls)]
+        latencies, errors = [], 0
+        start = time.perf_counter()
+        for i in range(0, len(jobs), batch):
+            sent = time.perf_counter()
+            outcomes = manager.call_many(jobs[i:i + batch])
+            # Every call in a batch completes when the batch does
+            latencies.extend([time.perf_counter() - sent] * len(outcomes))
+            errors += sum(isinstance(o, Exception) for o in outcomes)
+        report(f"call_many batch={batch}", time.perf_counter() - start, latencies, errors, results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--client-calls", type=int, default=10,
+                        help="calls for the session-per-call client (each spawns the server)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'mode':<24}{'calls':>7}{'calls/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'errors':>7}")
+    if args.client_calls:
+        bench_client(args.client_calls, 1, results)
+    bench_manager("serial", args.calls, 1, results, pool_size=1)
+    stats = bench_manager(f"pipelined c={args.concurrency}", args.calls, args.concurrency, results,
+                          pool_size=1, max_in_flight=args.concurrency)
+    print(f"{'':<24}peak in flight on one session: {stats.get('peak_in_flight', 0)}")
+    bench_manager(f"pool={args.pool_size} c={args.concurrency}", args.calls, args.concurrency, results,
+                  pool_size=args.pool_size, max_in_flight=math.ceil(args.concurrency / args.pool_size))
+    bench_call_many(args.calls, args.concurrency, results)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
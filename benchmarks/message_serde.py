@@ -0,0 +1,111 @@
+"""Encode/decode throughput and size of chat checkpoints: ``JsonPlusSerializer`` vs ``CompactSerializer``.
+
+Threads of ``--turns`` turns are built with Groq-shaped AI messages:
+``response_metadata`` with ``token_usage`` timings, model name, fingerprint,
+finish reason and service tier, plus ``usage_metadata``, which is what
+``ChatGroq`` returns. For each serializer and thread length the table shows
+bytes per checkpoint, encode/decode milliseconds and decoded messages/sec.
+
+The second table is the per-turn checkpoint cost in ``SqliteSaver`` (write
+the turn's checkpoint, read it back), which is where serialization shows up
+in turn latency. Every variant must load what ``JsonPlusSerializer`` wrote
+and round-trip to equal messages.
+
+    python benchmarks/message_serde.py --turns 10 100 500
+"""
+import argparse
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from benchmarks.checkpoint_fixtures import REPLY, put_turn
+from common.message_serde import CompactSerializer, zstandard
+
+
+def groq_messages(turns: int) -> list:
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"Question number {i}: tell me something new?"))
+        messages.append(AIMessage(
+            content=REPLY,
+            response_metadata={
+                "token_usage": {"completion_tokens": 60, "prompt_tokens": 40 + i, "total_tokens": 100 + i,
+                                "completion_time": 0.12, "prompt_time": 0.004, "queue_time": 0.05,
+                                "total_time": 0.124},
+                "model_name": "llama-3.3-70b-versatile", "system_fingerprint": "fp_4cfc2deea6",
+                "service_tier": "on_demand", "finish_reason": "stop", "logprobs": None,
+                "model_provider": "groq",
+            },
+            id=f"run-{i:08d}-0000-4000-8000-000000000000",
+            usage_metadata={"input_tokens": 40 + i, "output_tokens": 60, "total_tokens": 100 + i},
+        ))
+    return messages
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sqlite-turns", type=int, default=100, help="turns for the SqliteSaver table")
+    args = parser.parse_args()
+
+    serdes = {"jsonplus (current)": JsonPlusSerializer(),
+              "compact": CompactSerializer(compress_threshold=None),
+              "compact + zlib": CompactSerializer(compression="zlib")}
+    if zstandard is not None:
+        serdes["compact + zstd"] = CompactSerializer(compression="zstd")
+    serdes["compact, drop logprobs"] = CompactSerializer(compress_threshold=None, drop_metadata={"logprobs"})
+    old = JsonPlusSerializer()
+
+    print(f"{'serializer':<24}{'turns':>6}{'bytes':>10}{'ratio':>7}{'encode ms':>11}{'decode ms':>11}"
+          f"{'msgs/s decoded':>16}")
+    for turns in args.turns:
+        value = {"messages": groq_messages(turns)}
+        baseline = None
+        for name, serde in serdes.items():
+            encode_ms, typed = timed(lambda: serde.dumps_typed(value), args.repeat)
+            decode_ms, decoded = timed(lambda: serde.loads_typed(typed), args.repeat)
+            if "drop" not in name:
+                assert decoded == value, name
+                assert serde.loads_typed(old.dumps_typed(value)) == value, name   # current rows still load
+            baseline = baseline or len(typed[1])
+            print(f"{name:<24}{turns:>6}{len(typed[1]):>10,}{baseline / len(typed[1]):>6.1f}x{encode_ms:>11.2f}"
+                  f"{decode_ms:>11.2f}{2 * turns / decode_ms * 1000:>16,.0f}")
+
+    print(f"\nSqliteSaver, {args.sqlite_turns}-turn thread: per-turn write + read of the checkpoint")
+    print(f"{'serializer':<24}{'put ms':>9}{'get ms':>9}{'DB bytes':>12}")
+    messages = groq_messages(args.sqlite_turns)
+    for name, serde in serdes.items():
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        saver = SqliteSaver(conn, serde=serde)
+        config, puts, gets = None, [], []
+        for turn in range(args.sqlite_turns):
+            start = time.perf_counter()
+            config = put_turn(saver, "thread", config, messages[:2 * turn + 2], turn)
+            puts.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            saver.get_tuple(config)
+            gets.append(time.perf_counter() - start)
+        size = conn.execute("SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()").fetchone()[0]
+        print(f"{name:<24}{statistics.mean(puts) * 1000:>9.2f}{statistics.mean(gets) * 1000:>9.2f}{size:>12,}")
+
+
+if __name__ == "__main__":
+    main()
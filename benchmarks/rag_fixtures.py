@@ -0,0 +1,55 @@
+"""Synthetic corpus and a deterministic local embedder for the RAG benchmarks.
+
+``HashingEmbedding`` maps tokens to buckets with a stable hash, so texts that
+share words get similar vectors: close enough to a real model for ranking and
+index benchmarks, with no model download and fully reproducible results.
+"""
+import hashlib
+import random
+import re
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+WORDS = ("attention transformer encoder decoder layer head query key value softmax "
+         "embedding position residual normalization dropout training batch sequence "
+         "token vocabulary beam search translation bleu parallel recurrent convolution "
+         "gradient optimizer warmup label smoothing model dimension parameter").split()
+TOKEN = re.compile(r"\w+")
+
+
+class HashingEmbedding(Embeddings):
+    """Signed feature-hashing bag of words, L2-normalised."""
+
+    def __init__(self, size: int = 384):
+        self.size = size
+        self.model_name = f"hashing-{size}"
+
+    def _embed(self, text: str) -> list[float]:
+        vector = np.zeros(self.size, dtype=np.float32)
+        for token in TOKEN.findall(text.lower()):
+            h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+            vector[h % self.size] += 1.0 if (h >> 63) else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+def synthetic_text(rng: random.Random, words: int, common: float = 0.7) -> str:
+    """``words`` tokens; a ``common`` share from the shared vocabulary, the rest rare terms."""
+    return " ".join(rng.choice(WORDS) if rng.random() < common else f"term{rng.randrange(50_000)}"
+                    for _ in range(words))
+
+
+def synthetic_pages(path, pages: int = 10, words_per_page: int = 450):
+    """Loader stand-in for ``iter_pdf_pages``: deterministic pages derived from ``path``."""
+    rng = random.Random(str(path))
+    for page in range(pages):
+        yield Document(page_content=synthetic_text(rng, words_per_page),
+                       metadata={"source": str(path), "page": page})
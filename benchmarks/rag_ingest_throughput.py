@@ -0,0 +1,81 @@
+"""Ingestion throughput and peak memory: eager load-split-embed vs the streaming pipeline.
+
+Each configuration runs in its own subprocess (peak RSS never goes down) on a
+synthetic corpus of ``--files`` documents x ``--pages`` pages, embedded with
+the deterministic ``HashingEmbedding``. Throughput is reported as documents,
+pages and chunks per second. Memory is the main process's peak RSS plus the
+sum of the chunking workers' peaks, so the total is an upper bound on the
+whole pipeline's footprint. Run two corpus sizes to see the eager path's
+memory grow with the corpus while the pipeline's stays flat.
+
+    python benchmarks/rag_ingest_throughput.py --files 200 2000 --workers 4
+"""
+import argparse
+import functools
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.rag_fixtures import HashingEmbedding, synthetic_pages
+from common.rag_ingest import IngestPipeline, peak_rss_mb
+
+
+def eager(files, pages, workers):
+    from langchain_community.vectorstores import FAISS
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    start = time.perf_counter()
+    docs = [page for f in range(files) for page in synthetic_pages(f"doc-{f}.pdf", pages)]
+    splits = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200).split_documents(docs)
+    FAISS.from_documents(splits, HashingEmbedding())
+    elapsed = time.perf_counter() - start
+    return row(files / elapsed, files * pages / elapsed, len(splits) / elapsed, len(splits), peak_rss_mb(), None)
+
+
+def streaming(files, pages, workers):
+    pipeline = IngestPipeline(HashingEmbedding(), workers=workers,
+                              loader=functools.partial(synthetic_pages, pages=pages))
+    pipeline.run([f"doc-{f}.pdf" for f in range(files)])
+    s = pipeline.stats
+    return row(s.docs_per_sec, s.pages_per_sec, s.chunks_per_sec, s.chunks, s.peak_rss_mb, s.workers_peak_rss_mb)
+
+
+def row(docs_per_sec, pages_per_sec, chunks_per_sec, chunks, main_mb, workers_mb):
+    total = main_mb + (workers_mb or 0.0)
+    workers = f"{workers_mb:.0f}" if workers_mb is not None else "-"
+    return (f"{docs_per_sec:9.1f}{pages_per_sec:9.1f}{chunks_per_sec:10.1f}{chunks:>9}"
+            f"{main_mb:>9.0f}{workers:>9}{total:>8.0f}")
+
+
+MODES = {"eager": eager, "streaming": streaming}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, nargs="+", default=[200, 2000])
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "FILES"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, files = args.child
+        print(MODES[mode](int(files), args.pages, args.workers))
+        return
+    print(f"{'files':>6}  {'mode':<10}{'docs/s':>9}{'pages/s':>9}{'chunks/s':>10}{'chunks':>9}"
+          f"{'main MB':>9}{'workers':>9}{'total':>8}")
+    for files in args.files:
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, str(files),
+                 "--pages", str(args.pages), "--workers", str(args.workers)],
+                capture_output=True, text=True, check=True,
+            ).stdout.rstrip("\n")
+            print(f"{files:>6}  {mode:<10}{out}")
+
+
+if __name__ == "__main__":
+    main()
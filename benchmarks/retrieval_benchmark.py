@@ -0,0 +1,179 @@
+"""Offline retrieval benchmark: flat vs IVF vs HNSW FAISS indexes.
+
+Builds a synthetic corpus, embeds it with the deterministic
+``HashingEmbedding`` and asks queries made of words sampled from one known
+chunk. For each index configuration it reports:
+
+* recall@k: share of queries whose source chunk is in the top k;
+* overlap@k: share of the exact (flat) top k the index also returns;
+* p50/p99 search latency per query (embedding excluded);
+* build time (training + adding vectors) and index memory.
+
+It then checks every index type through ``IndexStore`` after incremental
+updates (one source changed, then another removed): the vector count must
+match the docstore, every chunk must find itself, and ``HybridRetriever``
+must answer.
+
+    python benchmarks/retrieval_benchmark.py --chunks 20000 --queries 500 -k 4
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from langchain_core.documents import Document
+
+from benchmarks.rag_fixtures import HashingEmbedding, synthetic_text
+from common.ann_index import IndexConfig, index_memory_bytes
+from common.hybrid_retrieval import BM25Index, HybridRetriever
+from common.rag_index import IndexStore
+
+CONFIGS = [
+    IndexConfig("flat"),
+    IndexConfig("ivf", nlist=256, nprobe=1),
+    IndexConfig("ivf", nlist=256, nprobe=8),
+    IndexConfig("ivf", nlist=256, nprobe=32),
+    IndexConfig("hnsw", m=32, ef_search=16),
+    IndexConfig("hnsw", m=32, ef_search=64),
+    IndexConfig("hnsw", m=32, ef_search=128),
+]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def make_dataset(chunks: int, queries: int, query_words: int, seed: int = 0):
+    rng = random.Random(seed)
+    # Mostly rare terms, so every chunk is distinguishable and recall is meaningful
+    texts = [synthetic_text(rng, 150, common=0.3) for _ in range(chunks)]
+    answers = [rng.randrange(chunks) for _ in range(queries)]
+    questions = [" ".join(rng.sample(texts[a].split(), query_words)) for a in answers]
+    embedding = HashingEmbedding()
+    vectors = np.array(embedding.embed_documents(texts), dtype=np.float32)
+    query_vectors = np.array(embedding.embed_documents(questions), dtype=np.float32)
+    return vectors, query_vectors, np.array(answers)
+
+
+def label(config: IndexConfig) -> str:
+    if config.type == "ivf":
+        return f"ivf nlist={config.nlist} nprobe={config.nprobe}"
+    if config.type == "hnsw":
+        return f"hnsw m={config.m} ef={config.ef_search}"
+    return "flat"
+
+
+def text_pages(path):
+    """Loader stand-in: the whole file as one page, so edits to the file change its chunks."""
+    yield Document(page_content=Path(path).read_text(), metadata={"source": str(path), "page": 0})
+
+
+def check_updates(config: IndexConfig, directory: Path, words: int = 6000) -> str:
+    """Build from three sources, change one, remove another, then check the index still agrees with its docstore."""
+    rng = random.Random(config.type)
+    sources = [directory / f"source-{i}.txt" for i in range(3)]
+    for path in sources:
+        path.write_text(synthetic_text(rng, words, common=0.3))
+    embedding = HashingEmbedding()
+    store = IndexStore(directory / "index", embedding, loader=text_pages, index=config)
+    store.load_or_build(sources)
+    sources[1].write_text(synthetic_text(rng, words, common=0.3))
+    store.load_or_build(sources)
+    vectorstore = store.load_or_build([sources[0], sources[1]])
+    config.apply_search_params(vectorstore.index)
+
+    docs = vectorstore.docstore._dict
+    ids = list(vectorstore.index_to_docstore_id.values())
+    assert vectorstore.index.ntotal == len(ids) == len(set(ids)) == len(docs), (
+        f"ntotal={vectorstore.index.ntotal}, {len(set(ids))} distinct ids, {len(docs)} docs")
+    assert all(docs[i].metadata["source"] != str(sources[2]) for i in ids), "removed source still indexed"
+    wrong = 0
+    for chunk_id, doc in docs.items():
+        (hit, _), = vectorstore.similarity_search_with_score_by_vector(embedding.embed_query(doc.page_content), k=1)
+        wrong += hit.page_content != doc.page_content
+    assert not wrong, f"{wrong}/{len(docs)} chunks did not find themselves"
+    retriever = HybridRetriever(vectorstore=vectorstore, bm25=store.bm25_index(vectorstore), k=4)
+    query = next(iter(docs.values())).page_content[:200]
+    retriever.invoke(query)
+
+    # Reopen unchanged in a fresh store: JSON docstore and npz BM25 from disk, nothing pickled
+    reopened = IndexStore(directory / "index", embedding, loader=text_pages, index=config)
+    again = reopened.load_or_build([sources[0], sources[1]])
+    assert not reopened.last_update["embedded"], "unchanged sources were re-embedded"
+    assert again.index_to_docstore_id == vectorstore.index_to_docstore_id
+    assert {i: (d.page_content, d.metadata) for i, d in again.docstore._dict.items()} == \
+        {i: (d.page_content, d.metadata) for i, d in docs.items()}, "docstore changed on reload"
+    assert reopened.bm25_index(again).search(query, 4) == BM25Index.from_vectorstore(vectorstore).search(query, 4)
+    assert not list(reopened.path.glob("*.pkl")), "store still writes pickles"
+    return f"{len(docs)} chunks consistent after change + removal and reload"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chunks", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--query-words", type=int, default=12)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    vectors, query_vectors, answers = make_dataset(args.chunks, args.queries, args.query_words)
+    print(f"{args.chunks} chunks, {args.queries} queries, dim={vectors.shape[1]} "
+          f"(embedded in {time.perf_counter() - t0:.1f}s)\n")
+
+    built = {}   # one build per distinct set of build parameters
+    exact = None
+    results = []
+    print(f"{'index':<28}{'recall@k':>9}{'overlap@k':>10}{'p50 ms':>9}{'p99 ms':>9}{'build s':>9}{'mem MB':>8}")
+    for config in CONFIGS:
+        key = json.dumps(config.build_params(), sort_keys=True)
+        if key not in built:
+            start = time.perf_counter()
+            index = config.build(vectors)
+            index.add(vectors)
+            built[key] = (index, time.perf_counter() - start)
+        index, build_seconds = built[key]
+        config.apply_search_params(index)
+
+        latencies, hits = [], []
+        for q in query_vectors:
+            start = time.perf_counter()
+            _, ids = index.search(q[None, :], args.k)
+            latencies.append(time.perf_counter() - start)
+            hits.append(ids[0])
+        hits = np.array(hits)
+        if exact is None:   # CONFIGS starts with flat: the ground truth for overlap
+            exact = hits
+        row = {
+            "index": label(config),
+            "recall_at_k": float(np.mean([a in h for a, h in zip(answers, hits)])),
+            "overlap_at_k": float(np.mean([len(set(h) & set(e)) / args.k for h, e in zip(hits, exact)])),
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "build_s": build_seconds,
+            "memory_mb": index_memory_bytes(index) / (1 << 20),
+        }
+        results.append(row)
+        print(f"{row['index']:<28}{row['recall_at_k']:>9.3f}{row['overlap_at_k']:>10.3f}{row['p50_ms']:>9.3f}"
+              f"{row['p99_ms']:>9.3f}{row['build_s']:>9.2f}{row['memory_mb']:>8.1f}")
+
+    print("\nincremental updates through IndexStore")
+    for config in (IndexConfig("flat"), IndexConfig("ivf", nlist=4, nprobe=4), IndexConfig("hnsw")):
+        with tempfile.TemporaryDirectory() as tmp:
+            print(f"{config.type:<28}{check_updates(config, Path(tmp))}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
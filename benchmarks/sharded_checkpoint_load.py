@@ -0,0 +1,108 @@
+"""Multi-process checkpoint write throughput vs shard count for ``ShardedSqliteSaver``.
+
+``--processes`` worker processes (separate interpreters, like several app
+servers sharing the files) each play ``--sessions`` chat sessions and write
+``--turns`` checkpoints per session, reading the latest state back after
+each write. This is the same per-turn work as ``sqlite_checkpoint_load.py``.
+The run is repeated for every shard count in ``--shards``. One shard is
+today's single ``chatbot.db``. ``--synchronous FULL`` fsyncs every commit,
+which is when the single-writer lock costs most.
+
+Afterwards one more shard is added with ``rebalance`` and the share of
+threads that moved is reported (ideally 1/(N+1)), after checking that every
+thread still reads back.
+
+    python benchmarks/sharded_checkpoint_load.py --processes 8 --shards 1 2 4 8
+"""
+import argparse
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.checkpoint_fixtures import make_messages, put_turn
+from common.sharded_checkpoint import ShardedSqliteSaver, connect
+from common.thread_catalog import CatalogSqliteSaver
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def open_saver(paths, synchronous):
+    return ShardedSqliteSaver(paths, factory=lambda path: CatalogSqliteSaver(connect(path, synchronous)))
+
+
+def worker(n, paths, synchronous, sessions, turns, start, results):
+    saver = open_saver(paths, synchronous)
+    messages = make_messages(5)
+    configs = {f"proc{n}-session{s}": None for s in range(sessions)}
+    latencies = []
+    start.wait()
+    began = time.perf_counter()
+    for step in range(turns):
+        for thread_id, config in configs.items():   # interleaved, like concurrent users
+            t0 = time.perf_counter()
+            configs[thread_id] = put_turn(saver, thread_id, config, messages, step)
+            latencies.append(time.perf_counter() - t0)
+            saver.get_tuple({"configurable": {"thread_id": thread_id}})
+    results.put((began, time.perf_counter(), latencies))
+    saver.close()
+
+
+def run(tmp, shards, args):
+    paths = [f"{tmp}/chatbot-{i}.db" for i in range(shards)]
+    open_saver(paths, args.synchronous).close()   # create the schema once, before the race
+    ctx = mp.get_context("spawn")
+    start, results = ctx.Event(), ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(n, paths, args.synchronous, args.sessions, args.turns, start, results))
+             for n in range(args.processes)]
+    for p in procs:
+        p.start()
+    time.sleep(0.5)   # let every interpreter finish importing
+    start.set()
+    outcomes = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    elapsed = max(end for _, end, _ in outcomes) - min(began for began, _, _ in outcomes)
+    latencies = [x for *_, lat in outcomes for x in lat]
+    return paths, len(latencies) / elapsed, percentile(latencies, 50), percentile(latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=4, help="chat sessions per process")
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--synchronous", choices=["NORMAL", "FULL"], default="NORMAL")
+    args = parser.parse_args()
+
+    print(f"{args.processes} processes x {args.sessions} sessions x {args.turns} turns, synchronous={args.synchronous}")
+    print(f"{'shards':>6}{'writes/s':>11}{'speedup':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        base = None
+        for shards in args.shards:
+            directory = Path(tmp, f"n{shards}")
+            directory.mkdir()
+            paths, rate, p50, p99 = run(directory, shards, args)
+            base = base or rate
+            print(f"{shards:>6}{rate:>11,.0f}{rate / base:>8.1f}x{p50 * 1000:>9.2f}{p99 * 1000:>9.2f}")
+
+        saver = open_saver(paths, args.synchronous)
+        before = {t.thread_id: t.checkpoint_count for t in saver.list_threads(limit=10 ** 6).threads}
+        report = saver.rebalance(paths + [f"{Path(paths[0]).parent}/chatbot-{len(paths)}.db"])
+        after = {t.thread_id: t.checkpoint_count for t in saver.list_threads(limit=10 ** 6).threads}
+        assert after == before and all(saver.get_tuple({"configurable": {"thread_id": t}}) for t in before)
+        print(f"\nrebalance {len(paths)} -> {len(paths) + 1} shards: moved {report.threads_moved}/{report.threads_total} "
+              f"threads ({report.threads_moved / report.threads_total:.0%}, ideal {1 / (len(paths) + 1):.0%}), "
+              f"{report.rows_moved:,} rows in {report.seconds:.2f}s; every thread still reads back")
+        saver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""End-to-end latency of the review workflow with and without speculative branches.
+
+The graph is ``LLM_Review_Workflow.ipynb``'s: ``find_sentiment`` routes to
+``positive_response`` or ``run_diagnosis`` -> ``negative_response``. Every
+node sleeps ``--latency`` seconds like a model call. ``--positive`` sets
+the share of positive reviews.
+
+Reported for the plain graph and for ``add_speculative_conditional_edges``:
+mean/p99 seconds per review, and per edge how often the speculative result
+was used, the seconds saved and the seconds of work thrown away. The final
+states of both graphs must be identical.
+
+    python benchmarks/speculative_branches.py --reviews 40 --latency 0.2 --positive 0.5
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Literal, TypedDict
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from langgraph.graph import END, START, StateGraph
+
+from common.speculative_edges import add_speculative_conditional_edges
+
+
+class ReviewState(TypedDict):
+    review: str
+    sentiment: str
+    diagnosis: dict
+    response: str
+
+
+def build_graph(latency: float, speculative: bool):
+    def find_sentiment(state: ReviewState):
+        time.sleep(latency)
+        return {"sentiment": "negative" if "crash" in state["review"] else "positive"}
+
+    def positive_response(state: ReviewState):
+        time.sleep(latency)
+        return {"response": f"Thanks for: {state['review']}"}
+
+    def run_diagnosis(state: ReviewState):
+        time.sleep(latency)
+        return {"diagnosis": {"issue_type": "Bug", "tone": "frustrated", "urgency": "high"}}
+
+    def negative_response(state: ReviewState):
+        time.sleep(latency)
+        return {"response": f"Sorry about the {state['diagnosis']['issue_type']}: {state['review']}"}
+
+    def check_sentiment(state: ReviewState) -> Literal["positive_response", "run_diagnosis"]:
+        return "positive_response" if state["sentiment"] == "positive" else "run_diagnosis"
+
+    graph = StateGraph(ReviewState)
+    graph.add_node("find_sentiment", find_sentiment)
+    graph.add_node("positive_response", positive_response)
+    graph.add_node("run_diagnosis", run_diagnosis)
+    graph.add_node("negative_response", negative_response)
+    graph.add_edge(START, "find_sentiment")
+    edge = None
+    if speculative:
+        edge = add_speculative_conditional_edges(graph, "find_sentiment", check_sentiment)
+    else:
+        graph.add_conditional_edges("find_sentiment", check_sentiment)
+    graph.add_edge("positive_response", END)
+    graph.add_edge("run_diagnosis", "negative_response")
+    graph.add_edge("negative_response", END)
+    return graph.compile(), edge
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reviews", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per node (model call)")
+    parser.add_argument("--positive", type=float, default=0.5, help="share of positive reviews")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    reviews = [f"Review {i}: " + ("love it" if rng.random() < args.positive else "the app crashed again")
+               for i in range(args.reviews)]
+    results = {}
+    print(f"{'graph':<14}{'mean s':>9}{'p99 s':>9}")
+    for label, speculative in (("plain", False), ("speculative", True)):
+        workflow, edge = build_graph(args.latency, speculative)
+        seconds, states = [], []
+        for review in reviews:
+            start = time.perf_counter()
+            states.append(workflow.invoke({"review": review}))
+            seconds.append(time.perf_counter() - start)
+        results[label] = states
+        seconds.sort()
+        print(f"{label:<14}{statistics.mean(seconds):>9.3f}{seconds[int(len(seconds) * 0.99) - 1]:>9.3f}")
+    time.sleep(args.latency * 2)   # let discarded branches finish so their waste is counted
+    print(f"\n{'edge':<36}{'used':>6}{'discarded':>11}{'invalid':>9}{'saved s':>9}{'wasted s':>10}")
+    for name, stats in edge.stats().items():
+        print(f"{name:<36}{stats['used']:>6}{stats['discarded'] + stats['cancelled']:>11}"
+              f"{stats['invalidated']:>9}{stats['saved_s']:>9.2f}{stats['wasted_s']:>10.2f}")
+    edge.shutdown()
+    print(f"\nfinal states identical: {results['plain'] == results['speculative']}")
+
+
+if __name__ == "__main__":
+    main()
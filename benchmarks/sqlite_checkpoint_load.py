@@ -0,0 +1,119 @@
+"""Multi-threaded checkpoint write load: shared-connection savers vs ConcurrentSqliteSaver.
+
+Each worker thread plays one chat session: it writes a checkpoint per turn
+and reads the latest state back (what ``app.invoke`` + ``get_state`` do).
+``ConcurrentSqliteSaver`` also maintains the thread catalog, so the shared
+``CatalogSqliteSaver`` row is its like-for-like baseline. Every saver runs in
+WAL mode with the same ``--synchronous`` setting. Group commit can only win
+when commits are expensive (``FULL`` on a disk with slow fsync) and writers
+overlap. ``--threads 1`` shows its cost when there is nothing to group.
+
+For both catalog savers it also checks that a checkpoint, its catalog row
+and its message index are one transaction. A write whose message index
+insert fails must leave no checkpoint behind. After the load, every
+session's catalog and index must match its latest checkpoint.
+
+    python benchmarks/sqlite_checkpoint_load.py --threads 16 --turns 50 --synchronous FULL
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from benchmarks.checkpoint_fixtures import make_messages, put_turn
+from common.concurrent_sqlite import ConcurrentSqliteSaver
+from common.thread_catalog import CatalogSqliteSaver
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(label, saver, threads, turns):
+    latencies = []
+    lock = threading.Lock()
+    messages = make_messages(5)
+
+    def session(n):
+        thread_id = f"session-{n}"
+        config = None
+        local = []
+        for step in range(turns):
+            t0 = time.perf_counter()
+            config = put_turn(saver, thread_id, config, messages, step)
+            local.append(time.perf_counter() - t0)
+            saver.get_tuple({"configurable": {"thread_id": thread_id}})
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=session, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} writes/sec={len(latencies) / elapsed:9.1f} "
+          f"p50={percentile(latencies, 50) * 1000:7.2f}ms p99={percentile(latencies, 99) * 1000:7.2f}ms")
+
+
+def check_catalog(label, saver, path, threads, turns):
+    for n in range(threads):
+        thread_id = f"session-{n}"
+        latest = saver.get_tuple({"configurable": {"thread_id": thread_id}}).checkpoint
+        page = saver.get_messages_page(thread_id, limit=1000)
+        assert page.messages == latest["channel_values"]["messages"], f"{label}: {thread_id} index is stale"
+        assert saver.get_thread(thread_id).checkpoint_count == turns, f"{label}: {thread_id} count"
+
+    # Make the message index insert fail for one thread: nothing of that put may persist
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TRIGGER fail_index BEFORE INSERT ON thread_messages WHEN NEW.thread_id = 'poison' "
+                     "BEGIN SELECT RAISE(ABORT, 'index write failed'); END")
+    try:
+        put_turn(saver, "poison", None, make_messages(1), 0)
+        raise AssertionError(f"{label}: the failing index write was not reported")
+    except sqlite3.IntegrityError:
+        pass
+    assert saver.get_tuple({"configurable": {"thread_id": "poison"}}) is None, f"{label}: checkpoint kept"
+    assert saver.get_thread("poison") is None, f"{label}: catalog row kept"
+    print(f"{label:<34} catalog and message index consistent; failed write left nothing behind")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--synchronous", choices=["NORMAL", "FULL"], default="NORMAL")
+    parser.add_argument("--dir", help="directory for the databases (default: a temp dir; fsync cost depends on the disk)")
+    args = parser.parse_args()
+
+    print(f"{args.threads} threads x {args.turns} turns, synchronous={args.synchronous}")
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        for label, saver_cls in [("shared connection (SqliteSaver)", SqliteSaver),
+                                 ("shared connection (catalog)", CatalogSqliteSaver)]:
+            conn = sqlite3.connect(f"{tmp}/{saver_cls.__name__}.db", check_same_thread=False)
+            conn.execute(f"PRAGMA synchronous={args.synchronous}")   # per connection; setup() switches to WAL
+            saver = saver_cls(conn)
+            run(label, saver, args.threads, args.turns)
+            if saver_cls is CatalogSqliteSaver:
+                check_catalog(label, saver, f"{tmp}/{saver_cls.__name__}.db", args.threads, args.turns)
+            conn.close()
+
+        with ConcurrentSqliteSaver(f"{tmp}/concurrent.db", synchronous=args.synchronous) as saver:
+            run("WAL pool + group commit", saver, args.threads, args.turns)
+            check_catalog("WAL pool + group commit", saver, f"{tmp}/concurrent.db", args.threads, args.turns)
+            stats = saver.stats()
+        print(f"\ngroup commit: {stats['committed_units']} write units in {stats['commits']} "
+              f"transactions (avg batch {stats['avg_batch']:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Cold-start and per-rerun latency of the Streamlit chat apps, via Streamlit's ``AppTest``.
+
+Streamlit executes the whole app script on every widget interaction, so
+whatever the script does at module level (imports, graph compilation, DB
+connections) is paid on every rerun. Each app runs in a fresh interpreter
+(``--runs`` times) so the cold start includes the imports the script itself
+triggers; Streamlit's own import is timed separately since a server pays it
+once. The same ``AppTest`` is then re-run ``--reruns`` times, which is what
+a click or keystroke costs.
+
+No model is called: a rerun without a submitted message never reaches one.
+A dummy ``GROQ_API_KEY`` is set when none is configured, so building the
+client (where an app still does it on page load) does not fail. Each app runs
+in a temporary directory, so ``chatbot.db`` is not written into the repo.
+
+    python benchmarks/streamlit_startup.py --output startup.json
+    git stash && python benchmarks/streamlit_startup.py --output before.json && git stash pop
+    python benchmarks/streamlit_startup.py --baseline before.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+APPS = ["8_Streaming_Langgraph/langgraph_stream.py", "9_Resume_Chat/resume_chat.py",
+        "10_Sqlite_database/sqlite_persistence.py"]
+
+
+def child(app: str, reruns: int) -> None:
+    """Runs in the fresh interpreter: time the first run and the reruns, print JSON."""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    streamlit_import = time.perf_counter() - start
+
+    at = AppTest.from_file(str(ROOT / app), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - start
+    if at.exception:
+        raise SystemExit(f"{app} raised: {at.exception[0].message}")
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - start)
+    heavy = [m for m in ("langgraph.graph", "langchain_groq", "httpx") if m in sys.modules]
+    print(json.dumps({"streamlit_import_s": streamlit_import, "cold_s": cold, "reruns_s": samples,
+                      "loaded": heavy}))
+
+
+def measure(app: str, runs: int, reruns: int) -> dict:
+    env = dict(os.environ)
+    env.setdefault("GROQ_API_KEY", "benchmark-placeholder")
+    colds, reruns_s, loaded = [], [], []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = subprocess.run([sys.executable, __file__, "--child", app, "--reruns", str(reruns)],
+                                 cwd=tmp, env=env, capture_output=True, text=True)
+        if out.returncode:
+            raise SystemExit(out.stderr or out.stdout)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        colds.append(result["cold_s"] * 1000)
+        reruns_s += [s * 1000 for s in result["reruns_s"]]
+        loaded = result["loaded"]
+    reruns_s.sort()
+    return {"cold": {"median_ms": statistics.median(colds), "min_ms": min(colds), "n": runs},
+            "rerun": {"median_ms": statistics.median(reruns_s),
+                      "p90_ms": reruns_s[min(len(reruns_s) - 1, int(len(reruns_s) * 0.9))],
+                      "min_ms": reruns_s[0], "n": len(reruns_s)},
+            "loaded": loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--apps", nargs="+", default=APPS, help="app scripts, relative to the repo root")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per app")
+    parser.add_argument("--reruns", type=int, default=20, help="reruns per interpreter")
+    parser.add_argument("--output", help="write the results JSON here")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before flagging")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child, args.reruns)
+
+    results, loaded = {}, {}
+    print(f"{'app':<44}{'cold ms':>9}{'rerun ms':>10}{'p90 ms':>9}  loaded after page load")
+    for app in args.apps:
+        entry = measure(app, args.runs, args.reruns)
+        results[f"{app}:cold"], results[f"{app}:rerun"] = entry["cold"], entry["rerun"]
+        loaded[app] = entry["loaded"]
+        print(f"{app:<44}{entry['cold']['median_ms']:>9.0f}{entry['rerun']['median_ms']:>10.1f}"
+              f"{entry['rerun']['p90_ms']:>9.1f}  {', '.join(entry['loaded']) or '-'}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"results": results, "loaded": loaded}, f, indent=2)
+        print(f"\nwrote {args.output}")
+    if args.baseline:
+        from benchmarks.graph_runtime import compare
+        with open(args.baseline) as f:
+            compare(results, json.load(f), args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""UI updates per reply with and without token coalescing, and SSE fan-out to many clients.
+
+A one-node graph streams a ``--tokens`` token reply from ``FakeChatModel``
+at ``--token-delay`` seconds per token. For each flush window it reports how
+many pieces reach the consumer (one ``st.write_stream`` update each) and the
+added delay before the last token is shown.
+
+Then the graph is served with ``create_sse_app`` on a local uvicorn server
+and ``--clients`` clients stream a reply at once, half of them reading
+slowly: events per client, time to first event and total time.
+
+    python benchmarks/token_coalescing.py --tokens 400 --token-delay 0.002 --clients 50
+"""
+import argparse
+import asyncio
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Annotated, TypedDict
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from langchain_core.messages import BaseMessage, HumanMessage
+from langgraph.graph import START, StateGraph
+from langgraph.graph.message import add_messages
+
+from benchmarks.chat_fixtures import FakeChatModel
+from common.token_stream import coalesce, create_sse_app, message_tokens
+
+
+class State(TypedDict):
+    messages: Annotated[list[BaseMessage], add_messages]
+
+
+def build_graph(llm):
+    async def agent(state: State):
+        return {"messages": [await llm.ainvoke(state["messages"])]}
+
+    def sync_agent(state: State):
+        return {"messages": [llm.invoke(state["messages"])]}
+
+    graphs = []
+    for node in (sync_agent, agent):
+        graph = StateGraph(State)
+        graph.add_node("agent", node)
+        graph.add_edge(START, "agent")
+        graphs.append(graph.compile())
+    return graphs
+
+
+def measure_pieces(app, label, wrap):
+    start = time.perf_counter()
+    pieces = list(wrap(message_tokens(app.stream({"messages": [HumanMessage(content="hi")]},
+                                                 stream_mode="messages"))))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28}{len(pieces):>8}{sum(map(len, pieces)) / len(pieces):>12.1f}{elapsed:>10.3f}")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def sse_fanout(app, clients: int, slow_delay: float):
+    import uvicorn
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(create_sse_app(app, node="agent"), port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    async def client(http, slow: bool):
+        start = time.perf_counter()
+        first, events = None, 0
+        body = {"input": {"messages": [{"role": "user", "content": "hi"}]}}
+        async with http.stream("POST", f"http://127.0.0.1:{port}/stream", json=body) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("event: token"):
+                    events += 1
+                    first = first or time.perf_counter() - start
+                    if slow:
+                        await asyncio.sleep(slow_delay)   # a client on a slow link
+        return first, events, time.perf_counter() - start
+
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as http:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(client(http, i % 2 == 1) for i in range(clients)))
+        elapsed = time.perf_counter() - start
+    server.should_exit = True
+    await task
+
+    for label, subset in (("fast clients", results[0::2]), ("slow clients", results[1::2])):
+        if subset:
+            print(f"{label:<14} events/client={sum(r[1] for r in subset) / len(subset):6.1f}  "
+                  f"first event={max(r[0] for r in subset) * 1000:7.1f}ms (max)  "
+                  f"done={max(r[2] for r in subset):6.2f}s (max)")
+    print(f"{clients} clients streamed in {elapsed:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=400)
+    parser.add_argument("--token-delay", type=float, default=0.002)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--slow-delay", type=float, default=0.02, help="seconds a slow client spends per event")
+    args = parser.parse_args()
+
+    llm = FakeChatModel(reply=" ".join(f"tok{i}" for i in range(args.tokens)), latency=0.05,
+                        token_delay=args.token_delay)
+    sync_app, async_app = build_graph(llm)
+    print(f"{'consumer':<28}{'pieces':>8}{'chars/piece':>12}{'seconds':>10}")
+    measure_pieces(sync_app, "per token", lambda tokens: tokens)
+    for window in (0.02, 0.05, 0.1):
+        measure_pieces(sync_app, f"coalesce {window * 1000:.0f}ms", lambda t, w=window: coalesce(t, max_delay=w))
+    measure_pieces(sync_app, "coalesce 256 chars", lambda t: coalesce(t, max_delay=3600, max_chars=256))
+    print()
+    asyncio.run(sse_fanout(async_app, args.clients, args.slow_delay))
+
+
+if __name__ == "__main__":
+    main()
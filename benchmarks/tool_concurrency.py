@@ -0,0 +1,110 @@
+"""Turn latency of one AI message with several tool calls, one of them a slow web search.
+
+Compares running the calls one after another, the prebuilt ``ToolNode`` and
+``ConcurrentToolNode`` (with a timeout on the search), with fake tools that
+sleep instead of calling the network.
+
+    python benchmarks/tool_concurrency.py --search-latency 3 --search-timeout 1
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import tool
+from langgraph.graph import START, MessagesState, StateGraph
+from langgraph.prebuilt import ToolNode
+
+from common.tool_executor import ConcurrentToolNode
+
+
+def make_tools(search_latency: float):
+    @tool
+    def calculator(first_num: float, second_num: float, operation: str) -> dict:
+        """Perform add, sub, mul, div."""
+        time.sleep(0.01)
+        return {"result": first_num * second_num}
+
+    @tool
+    def get_stock_price(symbol: str) -> dict:
+        """Fetch latest price for e.g. AAPL."""
+        time.sleep(0.3)   # quote API round trip
+        return {"symbol": symbol, "price": 150.0}
+
+    @tool
+    def duckduckgo_search(query: str) -> str:
+        """Search the web."""
+        time.sleep(search_latency)
+        return f"results for {query}"
+
+    @tool
+    async def mcp_add(a: int, b: int) -> int:
+        """Add two numbers on a remote MCP server."""
+        await asyncio.sleep(0.2)
+        return a + b
+
+    return [calculator, get_stock_price, duckduckgo_search, mcp_add]
+
+
+STATE = {"messages": [
+    HumanMessage(content="Calculate 45 mul 2, check GOOGL, search the news and add 400 and 80."),
+    AIMessage(content="", tool_calls=[
+        {"name": "calculator", "args": {"first_num": 45, "second_num": 2, "operation": "mul"}, "id": "c1"},
+        {"name": "get_stock_price", "args": {"symbol": "GOOGL"}, "id": "c2"},
+        {"name": "duckduckgo_search", "args": {"query": "GOOGL news"}, "id": "c3"},
+        {"name": "mcp_add", "args": {"a": 400, "b": 80}, "id": "c4"},
+    ]),
+]}
+
+
+def sequential(tools):
+    by_name = {t.name: t for t in tools}
+    messages = []
+    for call in STATE["messages"][-1].tool_calls:
+        tool_ = by_name[call["name"]]
+        call = dict(call, type="tool_call")
+        messages.append(asyncio.run(tool_.ainvoke(call)) if tool_.func is None else tool_.invoke(call))
+    return {"messages": messages}
+
+
+def as_graph(node):
+    graph = StateGraph(MessagesState)
+    graph.add_node("tools", node)
+    graph.add_edge(START, "tools")
+    return graph.compile()
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    try:
+        out = fn()
+    except NotImplementedError as exc:   # ToolNode.invoke cannot run async-only tools
+        print(f"{label:<36}   fails: {exc}")
+        return
+    elapsed = time.perf_counter() - start
+    statuses = " ".join(f"{m.name}={m.status}" for m in out["messages"] if m.type == "tool")
+    print(f"{label:<36} {elapsed:6.2f}s  {statuses}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--search-latency", type=float, default=3.0)
+    parser.add_argument("--search-timeout", type=float, default=1.0)
+    args = parser.parse_args()
+
+    tools = make_tools(args.search_latency)
+    node = ConcurrentToolNode(tools, timeout=10, timeouts={"duckduckgo_search": args.search_timeout})
+    timed("sequential", lambda: sequential(tools))
+    timed("ToolNode (invoke)", lambda: as_graph(ToolNode(tools)).invoke(STATE))
+    timed("ToolNode (ainvoke)", lambda: asyncio.run(as_graph(ToolNode(tools)).ainvoke(STATE)))
+    timed("ConcurrentToolNode (invoke)", lambda: as_graph(node).invoke(STATE))
+    timed("ConcurrentToolNode (ainvoke)", lambda: asyncio.run(as_graph(node).ainvoke(STATE)))
+    node.close()
+
+
+if __name__ == "__main__":
+    main()
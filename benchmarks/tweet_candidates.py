@@ -0,0 +1,200 @@
+"""Wall-clock time to an approved tweet: the sequential loop vs best-of-N candidate search.
+
+Both workflows run against local fakes with fixed latencies. Every fake
+tweet carries a hidden quality in [0, 1]; a fresh draft's quality is drawn
+at random and a rewrite of a draft adds a small random gain. The fake
+critic approves (or scores ``10 * quality``) accordingly, and a batched
+judgement costs a little more per extra candidate.
+
+* sequential: the notebook's ``generate`` -> ``evaluate`` -> ``optimize`` loop;
+* candidates: ``build_candidate_search`` with ``--candidates`` drafts per round.
+
+Reported per workflow over ``--trials`` seeds: share of runs that ended
+approved, mean/p90 seconds to finish, rounds, model calls, final quality and
+total seconds per approved tweet (runs that give up still cost their time).
+
+    python benchmarks/tweet_candidates.py --trials 40 --latency 0.2 --candidates 4
+"""
+import argparse
+import operator
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Annotated, Literal, TypedDict
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langgraph.graph import END, START, StateGraph
+from pydantic import BaseModel, PrivateAttr
+
+from common.candidate_search import (CandidateEvaluation, CandidateScore, build_candidate_search,
+                                     number_candidates)
+
+QUALITY = re.compile(r"\(q=([0-9.]+)\)")
+
+
+class TweetEvaluation(BaseModel):
+    evaluation: Literal["approved", "needs_improvement"]
+    feedback: str
+
+
+class FakeTweetWriter(BaseChatModel):
+    """Drafts a tweet of random quality; rewriting a tweet (its ``(q=...)`` is in the prompt) improves it."""
+    latency: float = 0.2
+    seed: int = 0
+    _rng: random.Random = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _calls: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context):
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-tweet-writer"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        previous = QUALITY.search(messages[-1].content)
+        with self._lock:
+            self._calls += 1
+            if previous:
+                quality = min(1.0, float(previous.group(1)) + self._rng.uniform(-0.05, 0.15))
+            else:
+                quality = self._rng.uniform(0.3, 0.95)
+        text = f"tweet #{self._calls} (q={quality:.3f})"
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+
+class FakeCritic:
+    """Structured-output stand-in: judges the qualities embedded in the prompt."""
+
+    def __init__(self, latency: float, per_candidate: float, threshold: float):
+        self.latency = latency
+        self.per_candidate = per_candidate
+        self.threshold = threshold
+        self.calls = 0
+
+    def judge_one(self, messages) -> TweetEvaluation:
+        self.calls += 1
+        time.sleep(self.latency)
+        quality = float(QUALITY.search(messages[-1].content).group(1))
+        verdict = "approved" if quality * 10 >= self.threshold else "needs_improvement"
+        return TweetEvaluation(evaluation=verdict, feedback="make it punchier")
+
+    def judge_many(self, messages) -> CandidateEvaluation:
+        self.calls += 1
+        qualities = [float(q) for q in QUALITY.findall(messages[-1].content)]
+        time.sleep(self.latency + self.per_candidate * (len(qualities) - 1))
+        return CandidateEvaluation(scores=[CandidateScore(index=i, score=round(q * 10, 2), feedback="punchier")
+                                           for i, q in enumerate(qualities)])
+
+
+# --- the notebook's sequential loop, on the fakes ---
+class TweetState(TypedDict):
+    topic: str
+    tweet: str
+    evaluation: Literal["approved", "needs_improvement"]
+    feedback: str
+    iteration: int
+    max_iteration: int
+    tweet_history: Annotated[list[str], operator.add]
+    feedback_history: Annotated[list[str], operator.add]
+
+
+def build_sequential(writer, critic):
+    evaluator = RunnableLambda(critic.judge_one)
+
+    def generate_tweet(state: TweetState):
+        response = writer.invoke([HumanMessage(content=f"Write a tweet on {state['topic']}")]).content
+        return {"tweet": response, "tweet_history": [response]}
+
+    def evaluate_tweet(state: TweetState):
+        response = evaluator.invoke([HumanMessage(content=f"Evaluate the following tweet: {state['tweet']}")])
+        return {"evaluation": response.evaluation, "feedback": response.feedback,
+                "feedback_history": [response.feedback]}
+
+    def optimize_tweet(state: TweetState):
+        response = writer.invoke([HumanMessage(content=f"Improve: {state['feedback']}\n{state['tweet']}")]).content
+        return {"tweet": response, "iteration": state["iteration"] + 1, "tweet_history": [response]}
+
+    def route_evaluation(state: TweetState):
+        if state["evaluation"] == "approved" or state["iteration"] >= state["max_iteration"]:
+            return "approved"
+        return "needs_improvement"
+
+    graph = StateGraph(TweetState)
+    graph.add_node("generate", generate_tweet)
+    graph.add_node("evaluate", evaluate_tweet)
+    graph.add_node("optimize", optimize_tweet)
+    graph.add_edge(START, "generate")
+    graph.add_edge("generate", "evaluate")
+    graph.add_conditional_edges("evaluate", route_evaluation, {"approved": END, "needs_improvement": "optimize"})
+    graph.add_edge("optimize", "evaluate")
+    return graph.compile()
+
+
+def build_candidates(writer, critic, n_candidates, threshold):
+    def draft_messages(state, i):
+        if state.get("best"):
+            return [HumanMessage(content=f"Improve: {state['feedback']}\n{state['best']}")]
+        return [HumanMessage(content=f"Write a tweet on {state['topic']}, angle {i}")]
+
+    def judge_messages(state, candidates):
+        return [HumanMessage(content=f"Score each tweet:\n{number_candidates(candidates)}")]
+
+    return build_candidate_search(writer, RunnableLambda(critic.judge_many), draft_messages, judge_messages,
+                                  n_candidates=n_candidates, threshold=threshold).compile()
+
+
+def run(label, build, trials, max_iteration, threshold, latency, per_candidate):
+    seconds, rounds, calls, qualities, approved = [], [], [], [], 0
+    for seed in range(trials):
+        writer = FakeTweetWriter(latency=latency, seed=seed)
+        critic = FakeCritic(latency, per_candidate, threshold)
+        workflow = build(writer, critic)
+        start = time.perf_counter()
+        result = workflow.invoke({"topic": "AI replace human", "iteration": 0, "max_iteration": max_iteration,
+                                  "tweet_history": [], "feedback_history": []})
+        seconds.append(time.perf_counter() - start)
+        final = result.get("tweet") or result.get("best")
+        quality = float(QUALITY.search(final).group(1))
+        qualities.append(quality)
+        approved += quality * 10 >= threshold
+        rounds.append(result["iteration"] + ("tweet" in result))   # the sequential loop counts optimize steps
+        calls.append(writer._calls + critic.calls)
+    seconds.sort()
+    print(f"{label:<16}{approved / trials:>9.0%}{statistics.mean(seconds):>9.2f}"
+          f"{seconds[int(len(seconds) * 0.9) - 1]:>9.2f}{statistics.mean(rounds):>8.2f}"
+          f"{statistics.mean(calls):>8.1f}{statistics.mean(qualities):>9.3f}"
+          f"{sum(seconds) / approved if approved else float('inf'):>14.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trials", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per model call")
+    parser.add_argument("--per-candidate", type=float, default=0.02,
+                        help="extra judge seconds per additional candidate in a batch")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--threshold", type=float, default=8.0, help="approval score out of 10")
+    parser.add_argument("--max-iteration", type=int, default=3)
+    args = parser.parse_args()
+
+    common = (args.trials, args.max_iteration, args.threshold, args.latency, args.per_candidate)
+    print(f"{'workflow':<16}{'approved':>9}{'mean s':>9}{'p90 s':>9}{'rounds':>8}{'calls':>8}{'quality':>9}{'s/approved':>14}")
+    run("sequential", build_sequential, *common)
+    for n in args.candidates:
+        run(f"candidates x{n}", lambda w, c, n=n: build_candidates(w, c, n, args.threshold), *common)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared helpers reused by the topic scripts and notebooks in this playground."""
@@ -0,0 +1,95 @@
+"""Pluggable FAISS index types for the RAG vector store.
+
+``FAISS.from_documents`` always builds an exact ``IndexFlatL2``: search cost
+grows linearly with the corpus. ``IndexConfig`` names the index to build and
+how to search it:
+
+* ``"flat"``: exact search (the default; best recall, O(n) per query);
+* ``"ivf"``: inverted file with ``nlist`` k-means cells, ``nprobe`` of them
+  scanned per query; needs training data before vectors can be added;
+* ``"hnsw"``: graph index with ``m`` links per node, ``ef_search`` candidates
+  per query; fast and accurate but cannot delete vectors.
+
+Only flat indexes are updated in place when a source changes. IVF's
+``remove_ids`` keeps the ids of the remaining vectors while LangChain's
+``FAISS.delete`` renumbers them as positions, so after a delete the ids and
+the docstore disagree; IVF and HNSW are rebuilt instead.
+
+Build parameters are part of the ``IndexStore`` key; search parameters are
+applied every time the index is opened and can change freely.
+
+    config = IndexConfig("hnsw", m=32, ef_search=64)
+    store = IndexStore("rag_index", embedding_model, index=config)
+
+``benchmarks/retrieval_benchmark.py`` compares the three on recall and latency.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+INDEX_TYPES = {"flat", "ivf", "hnsw"}
+
+
+class IndexConfig(NamedTuple):
+    type: str = "flat"
+    nlist: int = 256             # ivf: number of cells
+    nprobe: int = 8              # ivf: cells scanned per query
+    m: int = 32                  # hnsw: links per node
+    ef_construction: int = 40    # hnsw: candidate list size while building
+    ef_search: int = 64          # hnsw: candidate list size per query
+
+    @property
+    def needs_training(self) -> bool:
+        return self.type == "ivf"
+
+    @property
+    def supports_removal(self) -> bool:
+        """Whether ``FAISS.delete`` leaves this index consistent with its docstore."""
+        return self.type == "flat"
+
+    @property
+    def train_size(self) -> int:
+        """Vectors to buffer before training (FAISS wants ~39 per cell)."""
+        return self.nlist * 39 if self.needs_training else 0
+
+    def build_params(self) -> dict:
+        """The parameters that change what is written to disk."""
+        if self.type == "ivf":
+            return {"type": "ivf", "nlist": self.nlist}
+        if self.type == "hnsw":
+            return {"type": "hnsw", "m": self.m, "ef_construction": self.ef_construction}
+        return {"type": "flat"}
+
+    def build(self, training_vectors: np.ndarray):
+        """An empty index of this type, trained on ``training_vectors`` if it needs it."""
+        import faiss
+
+        if self.type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type '{self.type}'. Known: {sorted(INDEX_TYPES)}")
+        dim = training_vectors.shape[1]
+        if self.type == "flat":
+            return faiss.IndexFlatL2(dim)
+        if self.type == "hnsw":
+            index = faiss.IndexHNSWFlat(dim, self.m)
+            index.hnsw.efConstruction = self.ef_construction
+            return self.apply_search_params(index)
+        # Fewer points than cells makes k-means fail; shrink the cell count to the data
+        nlist = max(1, min(self.nlist, len(training_vectors) // 39))
+        index = faiss.IndexIVFFlat(faiss.IndexFlatL2(dim), dim, nlist)
+        index.train(np.ascontiguousarray(training_vectors, dtype=np.float32))
+        return self.apply_search_params(index)
+
+    def apply_search_params(self, index):
+        import faiss
+
+        if self.type == "ivf":
+            faiss.extract_index_ivf(index).nprobe = self.nprobe
+        elif self.type == "hnsw":
+            index.hnsw.efSearch = self.ef_search
+        return index
+
+
+def index_memory_bytes(index) -> int:
+    """Serialized size of ``index``, a close proxy for its resident memory."""
+    import faiss
+    return int(faiss.serialize_index(index).nbytes)
@@ -0,0 +1,238 @@
+"""Bulk evaluation of a compiled workflow over a JSONL/CSV file.
+
+``workflow.invoke`` grades one essay. Looping over thousands either runs them
+one by one or, run naively in parallel, trips the provider's rate limits.
+``BatchRunner`` wraps any ``invoke`` callable:
+
+* records are streamed from the input file, never loaded all at once;
+* at most ``max_in_flight`` records are evaluated at a time, in a thread pool;
+* a ``TokenBucket`` paces the provider calls. Pass it to the runner with
+  ``calls_per_item`` (one record = N model calls) or directly to the chat
+  model as ``rate_limiter=`` to pace every single call;
+* failures that look transient (HTTP 429/5xx, timeouts, connection errors)
+  are retried with exponential backoff and jitter, honouring ``Retry-After``;
+* every result is appended to the output JSONL as soon as it completes, and
+  that file is the progress checkpoint: re-running the same command skips
+  the ids already graded, so a crashed run resumes where it stopped.
+
+    bucket = TokenBucket(rate=30 / 60, capacity=5)     # Groq free tier: 30 requests/min
+    runner = BatchRunner(workflow.invoke, max_in_flight=8, rate_limiter=bucket, calls_per_item=4)
+    print(runner.run("essays.jsonl", "essay_results.jsonl"))
+"""
+import asyncio
+import csv
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import NamedTuple
+
+from langchain_core.rate_limiters import BaseRateLimiter
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class BatchStats(NamedTuple):
+    done: int
+    skipped: int
+    failed: int
+    retries: int
+    seconds: float
+    items_per_sec: float
+
+    def __str__(self):
+        return (f"{self.done} done, {self.skipped} already done, {self.failed} failed, {self.retries} retries "
+                f"in {self.seconds:.1f}s ({self.items_per_sec:.2f} items/s)")
+
+
+class TokenBucket(BaseRateLimiter):
+    """Thread-safe token bucket: ``rate`` tokens per second, bursts of up to ``capacity``.
+
+    A ``cost`` above ``capacity`` waits for a full bucket, then takes its whole
+    cost: the balance goes negative and later callers wait until it is repaid,
+    so the long-run rate holds whatever the cost.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, cost: float) -> float:
+        """Take ``cost`` tokens if available (possibly into debt); else seconds until they will be."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            needed = min(cost, self.capacity)   # the most the bucket can ever hold
+            if self._tokens >= needed:
+                self._tokens -= cost
+                return 0.0
+            return (needed - self._tokens) / self.rate
+
+    def acquire(self, *, blocking: bool = True, cost: float = 1.0) -> bool:
+        while True:
+            delay = self._take(cost)
+            if delay == 0.0:
+                return True
+            if not blocking:
+                return False
+            time.sleep(delay)
+
+    async def aacquire(self, *, blocking: bool = True, cost: float = 1.0) -> bool:
+        while True:
+            delay = self._take(cost)
+            if delay == 0.0:
+                return True
+            if not blocking:
+                return False
+            await asyncio.sleep(delay)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Rate limits, server errors, timeouts and dropped connections; not bad requests."""
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    name = type(exc).__name__
+    return any(word in name for word in ("RateLimit", "Timeout", "Connection"))
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_records(path, id_field: str = "id"):
+    """Yield records from a ``.jsonl`` or ``.csv`` file, one line at a time.
+
+    Records without ``id_field`` get their 1-based line number (data row for
+    CSV) as id, so resuming works as long as the file is only appended to.
+    """
+    path = Path(path)
+    with path.open(newline="", encoding="utf-8") as f:
+        if path.suffix.lower() == ".csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for number, record in enumerate(rows, start=1):
+            record.setdefault(id_field, number)
+            yield record
+
+
+def _ends_with_newline(path) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def completed_ids(output, id_field: str = "id") -> set:
+    """Ids with a successful result in an output file written by ``BatchRunner``."""
+    done = set()
+    path = Path(output)
+    if not path.exists():
+        return done
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:   # torn last line of a crashed run
+                continue
+            if "error" not in row:
+                done.add(str(row[id_field]))
+    return done
+
+
+class BatchRunner:
+    """Evaluates records with bounded concurrency, pacing, retries and a resumable JSONL output."""
+
+    def __init__(self, invoke, *, max_in_flight: int = 8, rate_limiter: TokenBucket | None = None,
+                 calls_per_item: float = 1, max_retries: int = 5, backoff: float = 1.0,
+                 max_backoff: float = 60.0, retryable=is_retryable, id_field: str = "id",
+                 to_input=None, to_output=None):
+        self.invoke = invoke
+        self.max_in_flight = max_in_flight
+        self.rate_limiter = rate_limiter
+        self.calls_per_item = calls_per_item
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retryable = retryable
+        self.id_field = id_field
+        self.to_input = to_input or (lambda record: {k: v for k, v in record.items() if k != id_field})
+        self.to_output = to_output or (lambda state: state)
+        self._retries = 0
+        self._lock = threading.Lock()
+
+    def _evaluate(self, record: dict):
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(cost=self.calls_per_item)
+            try:
+                return self.to_output(self.invoke(self.to_input(record)))
+            except Exception as exc:
+                if attempt == self.max_retries or not self.retryable(exc):
+                    raise
+                delay = _retry_after(exc)
+                if delay is None:   # full jitter keeps retrying workers from moving in lockstep
+                    delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+                with self._lock:
+                    self._retries += 1
+                time.sleep(delay)
+
+    def _write(self, out, row: dict):
+        out.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        out.flush()
+        os.fsync(out.fileno())
+
+    def run(self, source, output, *, limit: int | None = None) -> BatchStats:
+        """Evaluate every record of ``source`` not already in ``output``; rows are appended as they finish."""
+        done_ids = completed_ids(output, self.id_field)
+        started = time.perf_counter()
+        done = skipped = failed = 0
+        self._retries = 0
+        with open(output, "a", encoding="utf-8") as out, \
+                ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="batch") as pool:
+            if out.tell() and not _ends_with_newline(output):
+                out.write("\n")   # don't glue the first new row onto a torn one
+            pending = {}
+            submitted = 0
+
+            def drain():
+                nonlocal done, failed
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record_id = pending.pop(future)
+                    try:
+                        self._write(out, {self.id_field: record_id, "result": future.result()})
+                        done += 1
+                    except Exception as exc:
+                        self._write(out, {self.id_field: record_id, "error": repr(exc)})
+                        failed += 1
+
+            for record in iter_records(source, self.id_field):
+                if str(record[self.id_field]) in done_ids:
+                    skipped += 1
+                    continue
+                if limit is not None and submitted >= limit:
+                    break
+                while len(pending) >= self.max_in_flight:   # read ahead no further than the pool can run
+                    drain()
+                pending[pool.submit(self._evaluate, record)] = record[self.id_field]
+                submitted += 1
+            while pending:
+                drain()
+        seconds = time.perf_counter() - started
+        return BatchStats(done, skipped, failed, self._retries, seconds, done / seconds if seconds else 0.0)
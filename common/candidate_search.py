@@ -0,0 +1,108 @@
+"""Best-of-N generate/evaluate loop: N drafts per round, one batched judgement, early stop.
+
+The iterative tweet workflow runs ``generate`` -> ``evaluate`` -> ``optimize``
+one draft at a time, so every rejected round costs two more serial model
+round trips and the history channels grow by a draft and a critique each
+time. ``build_candidate_search`` builds the parallel variant:
+
+* ``generate`` drafts ``n_candidates`` candidates at once (``llm.batch``, one
+  request each, concurrently); from round two candidate ``i`` reworks parent
+  ``i % n_parents``, one of the ``n_parents`` best drafts so far, using
+  that draft's feedback, so the N requests don't all start from the same text;
+* ``evaluate`` scores all of them in a single structured call
+  (``CandidateEvaluation``) and keeps the best ones seen across rounds;
+* the loop ends as soon as the best score reaches ``threshold``, or after
+  ``max_iteration`` rounds. State keeps only the winner of each round.
+
+    evaluator = model.with_structured_output(CandidateEvaluation)
+    workflow = build_candidate_search(model, evaluator, draft_messages, judge_messages,
+                                      n_candidates=4, threshold=8).compile()
+    result = workflow.invoke({"topic": "AI replace human", "max_iteration": 3})
+
+``draft_messages(state, i)`` returns the prompt for candidate ``i``. Before
+the first round ``best`` and ``feedback`` are empty. After it, they hold the
+draft candidate ``i`` should rework and that draft's feedback. Use ``i``
+for a per-candidate angle as well, so two candidates reworking the same
+parent still diverge. ``judge_messages(state, candidates)`` returns the one
+prompt that scores the whole list.
+"""
+import operator
+from typing import Annotated, Callable, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+from pydantic import BaseModel, Field
+
+
+class CandidateScore(BaseModel):
+    index: int = Field(..., description="Position of the candidate in the list, starting at 0")
+    score: float = Field(..., ge=0, le=10, description="Overall quality from 0 (reject) to 10 (perfect)")
+    feedback: str = Field(..., description="Constructive feedback for this candidate")
+
+
+class CandidateEvaluation(BaseModel):
+    scores: list[CandidateScore] = Field(..., description="One entry per candidate")
+
+
+class CandidateSearchState(TypedDict, total=False):
+    topic: str
+    candidates: list[str]
+    best: str
+    best_score: float
+    feedback: str
+    parents: list[dict]   # the n_parents best drafts so far: {"text", "score", "feedback"}, best first
+    iteration: int
+    max_iteration: int
+    best_history: Annotated[list[str], operator.add]   # the winner of each round
+
+
+def number_candidates(candidates: list[str]) -> str:
+    """``[0] ...`` lines to embed in a judge prompt; the indexes are what scores refer to."""
+    return "\n".join(f"[{i}] {text}" for i, text in enumerate(candidates))
+
+
+def build_candidate_search(llm, evaluator, draft_messages: Callable, judge_messages: Callable, *,
+                           n_candidates: int = 4, threshold: float = 8.0, n_parents: int = 2,
+                           max_concurrency: int | None = None) -> StateGraph:
+    """Uncompiled ``generate`` <-> ``evaluate`` graph over ``CandidateSearchState``."""
+
+    def draft_state(state: CandidateSearchState, i: int):
+        parents = state.get("parents")
+        if not parents:
+            return state
+        parent = parents[i % len(parents)]
+        return {**state, "best": parent["text"], "best_score": parent["score"], "feedback": parent["feedback"]}
+
+    def generate(state: CandidateSearchState):
+        prompts = [draft_messages(draft_state(state, i), i) for i in range(n_candidates)]
+        responses = llm.batch(prompts, config={"max_concurrency": max_concurrency or n_candidates})
+        return {"candidates": [r.content for r in responses]}
+
+    def evaluate(state: CandidateSearchState):
+        candidates = state["candidates"]
+        verdict = evaluator.invoke(judge_messages(state, candidates))
+        # Models sometimes skip or repeat an index: unscored candidates rank last
+        scored = {s.index: s for s in verdict.scores if 0 <= s.index < len(candidates)}
+        winner = max(scored.values(), key=lambda s: s.score, default=None)
+        update = {"iteration": state.get("iteration", 0) + 1}
+        if winner is not None and winner.score > state.get("best_score", -1):
+            update.update(best=candidates[winner.index], best_score=winner.score, feedback=winner.feedback,
+                          best_history=[candidates[winner.index]])
+        pool = {p["text"]: p for p in state.get("parents", [])}
+        for s in scored.values():
+            if s.score > pool.get(candidates[s.index], {}).get("score", -1):
+                pool[candidates[s.index]] = {"text": candidates[s.index], "score": s.score, "feedback": s.feedback}
+        update["parents"] = sorted(pool.values(), key=lambda p: p["score"], reverse=True)[:max(1, n_parents)]
+        return update
+
+    def route(state: CandidateSearchState):
+        if state.get("best_score", -1) >= threshold or state["iteration"] >= state["max_iteration"]:
+            return "done"
+        return "retry"
+
+    graph = StateGraph(CandidateSearchState)
+    graph.add_node("generate", generate)
+    graph.add_node("evaluate", evaluate)
+    graph.add_edge(START, "generate")
+    graph.add_edge("generate", "evaluate")
+    graph.add_conditional_edges("evaluate", route, {"done": END, "retry": "generate"})
+    return graph
@@ -0,0 +1,189 @@
+"""Asyncio serving layer for compiled chat graphs: many conversations, one event loop.
+
+The chat examples run one conversation per process, either through Streamlit
+reruns or a blocking ``input()`` loop. ``ChatServer`` drives a compiled graph
+with ``ainvoke``/``astream`` instead, so a single event loop interleaves the
+turns of many threads while each waits on its model call:
+
+* turns of the *same* ``thread_id`` are serialized (a second message waits
+  for the first turn's checkpoint), turns of different threads run
+  concurrently; ``max_concurrent_turns`` optionally caps the total;
+* compile the graph with an async checkpointer so checkpoint reads/writes
+  don't block the loop, e.g. ``AsyncSqliteSaver`` from
+  ``langgraph-checkpoint-sqlite``;
+* nodes should be ``async def`` and call ``ainvoke`` on the model
+  (``get_async_chat_model``); a sync node still works but occupies a worker
+  thread for its whole model call.
+
+    async with AsyncSqliteSaver.from_conn_string("chatbot.db") as checkpointer:
+        server = ChatServer(graph.compile(checkpointer=checkpointer), reply_node="chat_node")
+        state = await server.turn("thread-1", "Hello!")
+        async for token in server.stream_reply("thread-2", "Hi there"):
+            ...
+
+``create_app(server)`` exposes the same over HTTP, replies optionally as SSE (Starlette, optional).
+Await ``server.aclose()`` before the loop ends (the app does it on shutdown)
+to close the loop's pooled model connections.
+"""
+import asyncio
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+
+from langchain_core.messages import HumanMessage
+from langgraph.types import Command
+
+from common.llm_clients import aclose_clients
+
+
+def _as_input(message):
+    """A plain string becomes a human message; dicts and ``Command(resume=...)`` pass through."""
+    if isinstance(message, str):
+        return {"messages": [HumanMessage(content=message)]}
+    return message
+
+
+def _config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def reply_text(state: dict) -> str:
+    messages = state.get("messages") or []
+    return messages[-1].content if messages else ""
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+
+class ChatServer:
+    """Runs turns of many threads concurrently on the running loop, one turn at a time per thread."""
+
+    def __init__(self, graph, *, max_concurrent_turns: int | None = None, reply_node: str | None = None,
+                 latency_window: int = 10_000):
+        self.graph = graph
+        self.reply_node = reply_node
+        self.max_concurrent_turns = max_concurrent_turns
+        self._threads: dict[str, list] = {}   # thread_id -> [lock, turns holding or waiting]
+        self._slots = None
+        self._active = 0
+        self._stats = Counter()
+        self._latencies = deque(maxlen=latency_window)
+
+    @asynccontextmanager
+    async def _turn_slot(self, thread_id: str):
+        entry = self._threads.get(thread_id)
+        if entry is None:
+            entry = self._threads[thread_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        if entry[0].locked():
+            self._stats["queued_turns"] += 1
+        if self._slots is None and self.max_concurrent_turns:
+            self._slots = asyncio.Semaphore(self.max_concurrent_turns)
+        started = time.perf_counter()
+        try:
+            async with entry[0]:
+                if self._slots is not None:
+                    await self._slots.acquire()
+                self._active += 1
+                self._stats["peak_active"] = max(self._stats["peak_active"], self._active)
+                try:
+                    yield
+                except Exception:
+                    self._stats["errors"] += 1
+                    raise
+                finally:
+                    self._active -= 1
+                    if self._slots is not None:
+                        self._slots.release()
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._threads[thread_id]   # keep the map sized to live conversations
+            self._stats["turns"] += 1
+            self._latencies.append(time.perf_counter() - started)
+
+    async def turn(self, thread_id: str, message) -> dict:
+        """Run one turn (a message, an input dict or ``Command(resume=...)``); returns the final state.
+
+        An interrupted turn's state carries ``__interrupt__``; answer it with
+        ``turn(thread_id, Command(resume=...))``.
+        """
+        async with self._turn_slot(thread_id):
+            return await self.graph.ainvoke(_as_input(message), _config(thread_id))
+
+    async def stream_reply(self, thread_id: str, message):
+        """Yield the reply's tokens as the model produces them (only ``reply_node``'s, when set)."""
+        async with self._turn_slot(thread_id):
+            async for chunk, metadata in self.graph.astream(_as_input(message), _config(thread_id),
+                                                            stream_mode="messages"):
+                if not chunk.content:
+                    continue
+                if self.reply_node is None or metadata.get("langgraph_node") == self.reply_node:
+                    yield chunk.content
+
+    async def aclose(self) -> None:
+        """Close the pooled async model clients of the running loop (see ``llm_clients.aclose_clients``)."""
+        await aclose_clients()
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        for name in ("turns", "errors", "queued_turns", "peak_active"):
+            stats.setdefault(name, 0)
+        latencies = list(self._latencies)
+        stats.update(active=self._active, threads=len(self._threads),
+                     p50_ms=_percentile(latencies, 50) * 1000, p99_ms=_percentile(latencies, 99) * 1000)
+        return stats
+
+
+def create_app(server: ChatServer):
+    """Starlette app: ``POST /threads/{thread_id}/messages`` with ``{"content": ...}`` or ``{"resume": ...}``.
+
+    ``POST /threads/{thread_id}/stream`` streams the reply as coalesced SSE ``token`` events instead.
+    """
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    from common.token_stream import acoalesce, sse_event, sse_response
+
+    async def post_message(request):
+        thread_id = request.path_params["thread_id"]
+        body = await request.json()
+        message = Command(resume=body["resume"]) if "resume" in body else body["content"]
+        state = await server.turn(thread_id, message)
+        interrupts = [i.value for i in state.get("__interrupt__", [])]
+        return JSONResponse({"thread_id": thread_id, "reply": reply_text(state), "interrupts": interrupts})
+
+    async def stream_message(request):
+        thread_id = request.path_params["thread_id"]
+        body = await request.json()
+
+        async def events():
+            async for text in acoalesce(server.stream_reply(thread_id, body["content"])):
+                yield sse_event({"text": text}, "token")
+            yield sse_event({}, "end")
+
+        return sse_response(events())
+
+    async def stats(request):
+        return JSONResponse(server.stats())
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await server.aclose()
+
+    return Starlette(routes=[
+        Route("/threads/{thread_id}/messages", post_message, methods=["POST"]),
+        Route("/threads/{thread_id}/stream", stream_message, methods=["POST"]),
+        Route("/stats", stats),
+    ], lifespan=lifespan)
+
+
+async def serve(server: ChatServer, host: str = "127.0.0.1", port: int = 8000):
+    """Serve ``create_app(server)`` with uvicorn on the running loop."""
+    import uvicorn
+
+    await uvicorn.Server(uvicorn.Config(create_app(server), host=host, port=port, log_level="warning")).serve()
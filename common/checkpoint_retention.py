@@ -0,0 +1,249 @@
+"""Retention policy and background compaction for SQLite checkpoint history.
+
+Every super-step writes a checkpoint and ``update_state`` branches add more.
+Nothing is ever deleted, so ``get_state_history``/``checkpointer.list`` slow
+down and ``chatbot.db`` only grows. ``CheckpointCompactor`` applies a
+``RetentionPolicy`` to the SQLite savers in ``common`` (plain
+``SqliteSaver`` too):
+
+* ``keep_last``: the newest K checkpoints of each thread (per namespace) stay;
+* branch points (checkpoints with two or more children) and branch tips stay,
+  so every time-travel fork remains reachable;
+* interrupt points (checkpoints with a pending ``__interrupt__`` write) stay,
+  so paused runs can still be resumed;
+* ``thread_ttl``: threads idle for longer are deleted outright, through the
+  saver's ``delete_thread`` (thread catalog, message index and interrupt
+  index included).
+
+Everything else is deleted with its pending writes. A kept
+``DeltaSqliteSaver`` row whose parent is deleted is first rewritten as a full
+snapshot (``rebase``), so the surviving history still decodes. Threads whose
+graph uses LangGraph's own ``DeltaChannel`` must not be pruned this way.
+
+Freed pages are returned to the OS with ``PRAGMA incremental_vacuum``. A
+database created without ``auto_vacuum=INCREMENTAL`` is converted by one
+full ``VACUUM`` on the first pass (``convert=False`` to skip that).
+
+    compactor = CheckpointCompactor(checkpointer, RetentionPolicy(keep_last=50, thread_ttl=30 * 86400))
+    compactor.start(interval=600)      # background thread
+    report = compactor.run_once()      # or one pass, e.g. from cron
+    print(report.bytes_reclaimed)
+"""
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import NamedTuple
+
+INTERRUPT = "__interrupt__"
+_UUID_EPOCH = 0x01B21DD213814000   # 1582-10-15 in 100 ns ticks before the Unix epoch
+
+
+class RetentionPolicy(NamedTuple):
+    keep_last: int | None = 50          # newest checkpoints kept per thread and namespace; None keeps all
+    keep_branch_points: bool = True
+    keep_interrupts: bool = True
+    thread_ttl: float | None = None     # seconds since a thread's last checkpoint before it is deleted
+
+
+class RetentionReport(NamedTuple):
+    threads_scanned: int
+    threads_expired: int
+    checkpoints_deleted: int
+    writes_deleted: int
+    rebased: int                        # delta rows rewritten as full snapshots
+    bytes_reclaimed: int
+    seconds: float
+
+
+def checkpoint_time(checkpoint_id: str) -> float:
+    """Unix time a checkpoint was written, read from its UUIDv6 id."""
+    value = uuid.UUID(checkpoint_id).int
+    ticks = ((value >> 96) << 28) | (((value >> 80) & 0xFFFF) << 12) | ((value >> 64) & 0x0FFF)
+    return (ticks - _UUID_EPOCH) / 1e7
+
+
+def select_deletions(rows, interrupts, policy: RetentionPolicy) -> set:
+    """The ``(checkpoint_ns, checkpoint_id)`` pairs ``policy`` drops from one thread.
+
+    ``rows`` are ``(checkpoint_ns, checkpoint_id, parent_checkpoint_id)``;
+    ``interrupts`` the pairs that hold an interrupt write.
+    """
+    if policy.keep_last is None:
+        return set()
+    by_ns = defaultdict(list)
+    for ns, checkpoint_id, parent_id in rows:
+        by_ns[ns].append((checkpoint_id, parent_id))
+    doomed = set()
+    for ns, checkpoints in by_ns.items():
+        if len(checkpoints) <= policy.keep_last:
+            continue
+        checkpoints.sort(reverse=True)
+        keep = {checkpoint_id for checkpoint_id, _ in checkpoints[:policy.keep_last]}
+        if policy.keep_branch_points:
+            children = Counter(parent_id for _, parent_id in checkpoints if parent_id)
+            keep.update(checkpoint_id for checkpoint_id, _ in checkpoints
+                        if children[checkpoint_id] != 1)   # forks and tips
+        if policy.keep_interrupts:
+            keep.update(checkpoint_id for checkpoint_id, _ in checkpoints if (ns, checkpoint_id) in interrupts)
+        doomed.update((ns, checkpoint_id) for checkpoint_id, _ in checkpoints if checkpoint_id not in keep)
+    return doomed
+
+
+class CheckpointCompactor:
+    """Applies a ``RetentionPolicy`` to one saver, or every shard of a ``ShardedSqliteSaver``."""
+
+    def __init__(self, saver, policy: RetentionPolicy = RetentionPolicy(), *, vacuum_pages: int = 2000,
+                 convert: bool = True):
+        self.savers = list(saver.shards.values()) if hasattr(saver, "shards") else [saver]
+        self.policy = policy
+        self.vacuum_pages = vacuum_pages   # pages freed per incremental_vacuum call
+        self.convert = convert
+        self.last_report: RetentionReport | None = None
+        self.last_error: Exception | None = None
+        self.totals = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()   # one pass at a time
+
+    # --- one pass ---
+    def run_once(self) -> RetentionReport:
+        with self._lock:
+            started = time.perf_counter()
+            counts = Counter()
+            for saver in self.savers:
+                before = _db_bytes(saver)
+                counts.update(self._prune(saver))
+                self._vacuum(saver)
+                counts["bytes_reclaimed"] += max(0, before - _db_bytes(saver))
+            report = RetentionReport(
+                counts["threads_scanned"], counts["threads_expired"], counts["checkpoints_deleted"],
+                counts["writes_deleted"], counts["rebased"], counts["bytes_reclaimed"],
+                time.perf_counter() - started,
+            )
+            self.last_report = report
+            self.totals.update({k: v for k, v in report._asdict().items() if k != "seconds"})
+            self.totals["passes"] += 1
+            return report
+
+    def _prune(self, saver) -> Counter:
+        counts = Counter()
+        with saver.cursor(transaction=False) as cur:
+            threads = cur.execute(
+                "SELECT thread_id, COUNT(*), MAX(checkpoint_id) FROM checkpoints GROUP BY thread_id"
+            ).fetchall()
+        now = time.time()
+        for thread_id, count, newest in threads:
+            counts["threads_scanned"] += 1
+            if self.policy.thread_ttl is not None and now - checkpoint_time(newest) > self.policy.thread_ttl:
+                saver.delete_thread(thread_id)
+                counts["threads_expired"] += 1
+                counts["checkpoints_deleted"] += count
+                continue
+            if self.policy.keep_last is not None and count > self.policy.keep_last:
+                counts.update(self._prune_thread(saver, thread_id))
+        return counts
+
+    def _prune_thread(self, saver, thread_id: str) -> Counter:
+        with saver.cursor(transaction=False) as cur:
+            rows = cur.execute(
+                "SELECT checkpoint_ns, checkpoint_id, parent_checkpoint_id FROM checkpoints WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchall()
+            interrupts = set(cur.execute(
+                "SELECT DISTINCT checkpoint_ns, checkpoint_id FROM writes WHERE thread_id = ? AND channel = ?",
+                (thread_id, INTERRUPT),
+            ).fetchall())
+            doomed = select_deletions(rows, interrupts, self.policy)
+            if not doomed:
+                return Counter()
+            keys = [(thread_id, ns, checkpoint_id) for ns, checkpoint_id in doomed]
+            writes = sum(cur.execute(
+                "SELECT COUNT(*) FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", key
+            ).fetchone()[0] for key in keys)
+        counts = Counter(checkpoints_deleted=len(doomed), writes_deleted=writes)
+        rebase = getattr(saver, "rebase", None)
+        if rebase is not None:   # delta rows must not outlive the parent they are encoded against
+            orphans = defaultdict(list)
+            for ns, checkpoint_id, parent_id in rows:
+                if (ns, checkpoint_id) not in doomed and (ns, parent_id) in doomed:
+                    orphans[ns].append(checkpoint_id)
+            for ns, checkpoint_ids in orphans.items():
+                counts["rebased"] += rebase(thread_id, ns, checkpoint_ids)
+        root_deleted = sum(1 for ns, _ in doomed if ns == "")
+        with saver.cursor() as cur:
+            cur.executemany(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", keys)
+            cur.executemany(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", keys)
+            if root_deleted and hasattr(saver, "list_threads"):   # CatalogSqliteSaver counts checkpoints
+                cur.execute("UPDATE thread_catalog SET checkpoint_count = checkpoint_count - ? WHERE thread_id = ?",
+                            (root_deleted, thread_id))
+        return counts
+
+    # --- space ---
+    def _vacuum(self, saver) -> None:
+        def run(conn):
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                if not self.convert:
+                    return
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")   # the mode only takes effect after a full rebuild
+            while conn.execute("PRAGMA freelist_count").fetchone()[0]:
+                conn.execute(f"PRAGMA incremental_vacuum({self.vacuum_pages})")
+            if conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        db_path = getattr(saver, "db_path", None)
+        if db_path is not None:
+            # ConcurrentSqliteSaver commits on its own connection; a separate one waits on the file lock
+            conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+            try:
+                run(conn)
+            finally:
+                conn.close()
+            return
+        with saver.lock:
+            saver.conn.commit()
+            isolation, saver.conn.isolation_level = saver.conn.isolation_level, None
+            try:
+                run(saver.conn)
+            finally:
+                saver.conn.isolation_level = isolation
+
+    # --- background ---
+    def start(self, interval: float = 600.0) -> "CheckpointCompactor":
+        """Run a pass now and then every ``interval`` seconds on a daemon thread."""
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.run_once()
+                except sqlite3.Error as exc:   # e.g. locked for longer than the timeout; retry next pass
+                    self.totals["errors"] += 1
+                    self.last_error = exc
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=loop, daemon=True, name="checkpoint-compactor")
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        return dict(self.totals)
+
+
+def _db_bytes(saver) -> int:
+    with saver.cursor(transaction=False) as cur:
+        pages = cur.execute("PRAGMA page_count").fetchone()[0]
+        size = cur.execute("PRAGMA page_size").fetchone()[0]
+    return pages * size
@@ -0,0 +1,256 @@
+"""SQLite checkpointer for many concurrent sessions: WAL read pool and group commit.
+
+The stock setup in ``sqlite_persistence.py`` shares one connection (and one
+lock) between every Streamlit session, so reads queue behind writes and every
+write pays its own commit. ``ConcurrentSqliteSaver`` keeps the ``SqliteSaver``
+(and thread catalog) logic but changes where the SQL runs:
+
+* reads borrow a connection from a small pool of read-only WAL connections,
+  so they never wait for a write;
+* writes are recorded in the caller's thread and committed by one of the
+  callers (the leader). A writer that finds no commit running commits its
+  own unit at once, with no hand-off to another thread. Writers that arrive
+  while a commit runs queue up. When it finishes, the leader hands over to
+  the oldest of them, which commits everything queued (up to ``max_batch``
+  units, optionally lingering ``flush_interval`` seconds for more) in ONE
+  transaction. So no writer waits more than about two commits. Callers
+  return only once their unit is committed, so durability is unchanged.
+
+Group commit pays off when a commit is expensive, i.e. when it fsyncs:
+``synchronous="FULL"`` (durable on power loss) or slow disks. With the WAL
+default ``NORMAL`` a commit is cheap and a shared ``SqliteSaver`` is about
+as fast; see ``benchmarks/sqlite_checkpoint_load.py``.
+
+    checkpointer = ConcurrentSqliteSaver("chatbot.db", read_pool_size=4, synchronous="FULL")
+    app = workflow.compile(checkpointer=checkpointer)
+"""
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from common.thread_catalog import CatalogSqliteSaver
+
+
+def connect(db_path: str, read_only: bool = False, synchronous: str = "NORMAL") -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30,
+                           isolation_level=None)   # transactions are explicit
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={synchronous}")   # NORMAL: safe with WAL; FULL: fsync every commit
+    conn.execute("PRAGMA busy_timeout=30000")
+    if read_only:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
+class _RecordingCursor:
+    """Stands in for a write cursor: statements are replayed when the unit is committed.
+
+    Write paths in ``SqliteSaver`` only call ``execute``/``executemany`` and
+    never read results back, which is what makes this deferral possible. The
+    catalog's message index does read first; it is ``defer``-red and runs with
+    the real cursor inside the commit.
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=()):
+        self.statements.append((False, sql, params))
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self.statements.append((True, sql, list(seq_of_params)))
+        return self
+
+    def defer(self, fn):
+        """Run ``fn(cursor)`` at commit time, in order, for writes that must read first."""
+        self.statements.append((None, fn, None))
+
+    def close(self):
+        pass
+
+
+class _WriteUnit:
+    """One caller's recorded statements, waiting to be committed or to lead the next commit."""
+
+    __slots__ = ("statements", "done", "lead", "error")   # done: committed (or, before leading, promoted)
+
+    def __init__(self, statements):
+        self.statements = statements
+        self.done = threading.Event()
+        self.lead = False
+        self.error = None
+
+
+class ConcurrentSqliteSaver(CatalogSqliteSaver):
+    """``CatalogSqliteSaver`` with a WAL read pool and leader-based group commit."""
+
+    def __init__(self, db_path: str, *, read_pool_size: int = 4, flush_interval: float = 0.0,
+                 max_batch: int = 256, synchronous: str = "NORMAL", serde=None):
+        super().__init__(connect(db_path, synchronous=synchronous), serde=serde)
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._setup_lock = threading.Lock()
+        self._ready = False
+        self._readers: queue.Queue = queue.Queue()
+        for _ in range(read_pool_size):
+            self._readers.put(connect(db_path, read_only=True))
+        self._pending: deque = deque()   # units waiting for the next commit, oldest first
+        self._pending_lock = threading.Lock()
+        self._leading = False             # a caller is committing; guarded by _pending_lock
+        self._commit_lock = threading.Lock()   # the write connection, for setup/close
+        self.commits = 0
+        self.committed_units = 0
+
+    # ``SqliteSaver`` reaches for ``self.conn`` directly (e.g. in ``list``), so
+    # resolve it to the read connection this thread has borrowed, if any.
+    @property
+    def conn(self):
+        return getattr(self._local, "conn", None) or self._write_conn
+
+    @conn.setter
+    def conn(self, value):
+        self._write_conn = value
+
+    def _ensure_ready(self):
+        if self._ready:
+            return
+        with self._setup_lock:
+            if not self._ready:
+                with self._commit_lock:
+                    self.setup()   # on the write connection, before any unit is committed
+                self._ready = True
+
+    @contextmanager
+    def cursor(self, transaction: bool = True):
+        self._ensure_ready()
+        if transaction:
+            unit = getattr(self._local, "unit", None)
+            if unit is not None:   # inside put(): join the open write unit
+                yield unit
+                return
+            with self._write_unit() as recorder:
+                yield recorder
+            return
+
+        conn = self._readers.get()
+        previous = getattr(self._local, "conn", None)
+        self._local.conn = conn
+        cur = conn.cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+            self._local.conn = previous
+            self._readers.put(conn)
+
+    @contextmanager
+    def _write_unit(self):
+        """Collect every write made inside the block and commit them atomically."""
+        unit = getattr(self._local, "unit", None)
+        if unit is not None:
+            yield unit
+            return
+        self._ensure_ready()
+        recorder = _RecordingCursor()
+        self._local.unit = recorder
+        try:
+            yield recorder
+        finally:
+            self._local.unit = None
+        if recorder.statements:
+            self._submit(recorder.statements)
+
+    def _run_in_unit(self, unit, fn) -> None:
+        # The catalog reads before it writes: do both in the commit, on the write connection
+        unit.defer(fn)
+
+    # --- group commit ---
+    def _submit(self, statements):
+        """Queue one write unit and return once a commit containing it has finished."""
+        unit = _WriteUnit(statements)
+        with self._pending_lock:
+            self._pending.append(unit)
+            unit.lead = not self._leading
+            self._leading = True
+        if not unit.lead:
+            unit.done.wait()   # committed by a leader, or promoted to lead
+        if unit.lead:
+            unit.done.clear()
+            self._lead()
+        if unit.error is not None:
+            raise unit.error
+
+    def _lead(self):
+        """Commit everything queued, then hand leadership to the oldest unit queued meanwhile."""
+        if self.flush_interval:
+            time.sleep(self.flush_interval)   # linger so more writers join this batch
+        with self._pending_lock:
+            batch = [self._pending.popleft() for _ in range(min(len(self._pending), self.max_batch))]
+        try:
+            with self._commit_lock:
+                self._commit(batch)
+        except Exception as exc:   # e.g. the connection was closed: fail the batch, keep handing over
+            for unit in batch:
+                if not unit.done.is_set():
+                    unit.error = exc
+                    unit.done.set()
+        finally:
+            with self._pending_lock:
+                if self._pending:
+                    successor = self._pending[0]
+                    successor.lead = True
+                    successor.done.set()
+                else:
+                    self._leading = False
+
+    def _commit(self, batch):
+        cur = self._write_conn.cursor()
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+            for unit in batch:
+                for many, sql, params in unit.statements:
+                    if many is None:
+                        sql(cur)   # deferred read-then-write
+                    else:
+                        (cur.executemany if many else cur.execute)(sql, params)
+            cur.execute("COMMIT")
+        except Exception as exc:
+            if self._write_conn.in_transaction:
+                cur.execute("ROLLBACK")
+            if len(batch) == 1:
+                batch[0].error = exc
+                batch[0].done.set()
+            else:
+                for item in batch:   # isolate the failing unit, commit the rest
+                    self._commit([item])
+            return
+        finally:
+            cur.close()
+        self.commits += 1
+        self.committed_units += len(batch)
+        for unit in batch:
+            unit.done.set()
+
+    def stats(self) -> dict:
+        return {
+            "commits": self.commits,
+            "committed_units": self.committed_units,
+            "avg_batch": self.committed_units / self.commits if self.commits else 0.0,
+        }
+
+    def close(self):
+        with self._commit_lock:   # let an in-flight commit finish
+            while not self._readers.empty():
+                self._readers.get().close()
+            self._write_conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
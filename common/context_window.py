@@ -0,0 +1,159 @@
+"""Pre-model context window manager for long chat threads.
+
+The chat graphs send the whole ``state['messages']`` to the LLM every turn,
+so latency and cost grow with the thread. ``ContextWindow`` picks what the
+model actually sees, with one of three strategies:
+
+* ``"last_n"``: the last ``last_n`` messages;
+* ``"token_budget"``: as many recent messages as fit in ``max_tokens``;
+* ``"summary"``: a rolling summary (kept in state) plus the recent messages
+  verbatim. The summary is refreshed incrementally every ``summary_every``
+  user turns, folding in only the messages that left the window.
+
+An AI message that requested tools is never separated from its tool results,
+so the window never starts with an orphan ``ToolMessage``.
+
+    context_window = ContextWindow("summary", last_n=12, summarizer=llm)
+
+    class State(ContextWindowState):
+        messages: Annotated[list, add_messages]
+
+    def call_model(state):
+        return {"messages": [llm.invoke(context_window.select(state))]}
+
+    workflow.add_node("context", context_window)   # refreshes the summary
+    workflow.add_edge(START, "context")
+    workflow.add_edge("context", "agent")
+"""
+from typing import TypedDict
+
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+
+STRATEGIES = {"last_n", "token_budget", "summary"}
+
+
+class ContextWindowState(TypedDict, total=False):
+    summary: str          # rolling summary of messages[:summary_upto]
+    summary_upto: int     # number of leading messages folded into the summary
+
+
+def approx_token_count(message) -> int:
+    """Cheap token estimate (~4 chars per token) that needs no tokenizer."""
+    content = getattr(message, "content", message)
+    if not isinstance(content, str):
+        content = str(content)
+    return len(content) // 4 + 4
+
+
+def _is_tool_message(message) -> bool:
+    return isinstance(message, ToolMessage) or getattr(message, "type", None) == "tool"
+
+
+def group_boundaries(messages) -> list[int]:
+    """Indices where a window may start without splitting a tool-call/tool-result pair."""
+    return [i for i, msg in enumerate(messages) if not _is_tool_message(msg)]
+
+
+def _aligned_start(messages, start: int) -> int:
+    """Move ``start`` back to the nearest group boundary at or before it."""
+    for boundary in reversed(group_boundaries(messages)):
+        if boundary <= start:
+            return boundary
+    return 0
+
+
+def _split_system(messages):
+    lead = 0
+    while lead < len(messages) and isinstance(messages[lead], SystemMessage):
+        lead += 1
+    return list(messages[:lead]), list(messages[lead:])
+
+
+def last_n_messages(messages, n: int) -> list:
+    system, rest = _split_system(messages)
+    if len(rest) <= n:
+        return system + rest
+    return system + rest[_aligned_start(rest, len(rest) - n):]
+
+
+def fit_token_budget(messages, max_tokens: int, token_counter=approx_token_count) -> list:
+    """Newest messages that fit in ``max_tokens``; the latest group is always kept."""
+    system, rest = _split_system(messages)
+    budget = max_tokens - sum(token_counter(m) for m in system)
+    boundaries = group_boundaries(rest)
+    start = len(rest)
+    used = 0
+    for boundary in reversed(boundaries):
+        cost = sum(token_counter(m) for m in rest[boundary:start])
+        if used + cost > budget and start < len(rest):
+            break
+        used += cost
+        start = boundary
+    return system + rest[start:]
+
+
+def _render(messages) -> str:
+    lines = []
+    for msg in messages:
+        role = "User" if isinstance(msg, HumanMessage) else getattr(msg, "type", "message").capitalize()
+        lines.append(f"{role}: {getattr(msg, 'content', msg)}")
+    return "\n".join(lines)
+
+
+class ContextWindow:
+    """Configurable pre-model stage; use as a graph node and call ``select`` in the model node."""
+
+    def __init__(self, strategy: str = "last_n", *, last_n: int = 20, max_tokens: int = 4000,
+                 token_counter=approx_token_count, summarizer=None, summary_every: int = 5):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}'. Known: {sorted(STRATEGIES)}")
+        if strategy == "summary" and summarizer is None:
+            raise ValueError("The 'summary' strategy needs a summarizer chat model")
+        self.strategy = strategy
+        self.last_n = last_n
+        self.max_tokens = max_tokens
+        self.token_counter = token_counter
+        self.summarizer = summarizer
+        self.summary_every = summary_every
+
+    @staticmethod
+    def _summary_upto(state) -> int:
+        # A graph whose messages channel has no reducer replaces the list on each
+        # input; a summary pointing past its end no longer describes this history.
+        upto = state.get("summary_upto", 0)
+        return upto if upto <= len(state["messages"]) else 0
+
+    def select(self, state) -> list:
+        """Messages to send to the model this turn."""
+        messages = state["messages"]
+        if self.strategy == "last_n":
+            return last_n_messages(messages, self.last_n)
+        if self.strategy == "token_budget":
+            return fit_token_budget(messages, self.max_tokens, self.token_counter)
+        upto = self._summary_upto(state)
+        system, _ = _split_system(messages)
+        recent = messages[max(upto, len(system)):]
+        if upto and state.get("summary"):
+            system = system + [SystemMessage(content=f"Summary of the earlier conversation:\n{state['summary']}")]
+        return system + recent
+
+    def __call__(self, state) -> dict:
+        """Graph node: refresh the rolling summary when enough turns left the window."""
+        if self.strategy != "summary":
+            return {}
+        messages = state["messages"]
+        system, _ = _split_system(messages)
+        upto = max(self._summary_upto(state), len(system))
+        window_start = _aligned_start(messages, max(upto, len(messages) - self.last_n))
+        pending = messages[upto:window_start]
+        turns = sum(isinstance(m, HumanMessage) for m in pending)
+        if turns < self.summary_every:
+            return {}
+        previous = state.get("summary", "") if self._summary_upto(state) else ""
+        prompt = (
+            "Update the running summary of a conversation with the new messages below. "
+            "Keep facts, names, decisions and open questions; be concise.\n\n"
+            f"Current summary:\n{previous or '(empty)'}\n\nNew messages:\n{_render(pending)}"
+        )
+        summary = self.summarizer.invoke([HumanMessage(content=prompt)]).content
+        return {"summary": summary, "summary_upto": window_start}
@@ -0,0 +1,256 @@
+"""Delta-encoded, compressed checkpoint storage for the SQLite checkpointer.
+
+The chat graphs' ``messages`` channel holds the whole conversation, so every
+checkpoint re-stores all of it: storage and write time grow quadratically
+with thread length. ``DeltaSqliteSaver`` stores each checkpoint relative to
+its parent instead:
+
+* a channel whose version did not change is stored as a reference;
+* a list channel that only grew (``messages``) stores just the new tail;
+* anything else is stored in full;
+* every ``snapshot_every`` steps a full snapshot bounds the replay chain;
+* every payload is compressed (zstd if ``zstandard`` is installed, else zlib).
+
+Reads go through the normal ``get_tuple``/``list`` code: the serializer
+recognises delta rows and rebuilds them from their parents (cached LRU),
+so graphs, ``get_state`` and ``get_state_history`` need no changes. Rows
+written by a plain ``SqliteSaver`` stay readable.
+
+    checkpointer = DeltaSqliteSaver(conn, snapshot_every=20)
+"""
+import threading
+import zlib
+from collections import OrderedDict
+
+from langgraph.checkpoint.base import copy_checkpoint
+
+from common.concurrent_sqlite import ConcurrentSqliteSaver
+from common.thread_catalog import CatalogSqliteSaver
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+FULL, DELTA = "full", "delta"
+SAME, APPEND, SET = 0, 1, 2
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if codec == "zlib":
+        return zlib.compress(data, 6)
+    return data
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    return data
+
+
+def _copy_checkpoint(checkpoint: dict) -> dict:
+    # The pregel loop mutates the checkpoint it was handed (channel_versions,
+    # versions_seen, list values) after put() returns; the cache must never
+    # share a container with it, or the next delta compares against the
+    # mutated versions and stores changed channels as SAME.
+    copy = copy_checkpoint(checkpoint)
+    copy["channel_values"] = {
+        ch: list(value) if isinstance(value, list) else value
+        for ch, value in copy["channel_values"].items()
+    }
+    return copy
+
+
+class _DeltaSerde:
+    """Wraps the saver's serializer; checkpoint rows get the delta codec, the rest pass through."""
+
+    def __init__(self, saver, inner):
+        self.saver = saver
+        self.inner = inner
+
+    def dumps_typed(self, obj):
+        pending = getattr(self.saver._local, "encoding", None)
+        if pending is not None and obj is pending[0]:
+            return pending[1]
+        return self.inner.dumps_typed(obj)
+
+    def loads_typed(self, data):
+        type_, blob = data
+        if not type_ or not type_.startswith((FULL + ":", DELTA + ":")):
+            return self.inner.loads_typed(data)   # row written without delta encoding
+        return self.saver._decode(type_, blob)
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+
+class DeltaCheckpointMixin:
+    """Mix into any ``SqliteSaver`` subclass to store checkpoints as compressed deltas."""
+
+    def __init__(self, *args, snapshot_every: int = 20, compression: str | None = None,
+                 cache_size: int = 256, **kwargs):
+        super().__init__(*args, **kwargs)
+        if compression is None:
+            compression = "zstd" if zstandard is not None else "zlib"
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("compression='zstd' needs the 'zstandard' package")
+        self.snapshot_every = snapshot_every
+        self.compression = compression
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()   # (thread, ns, id) -> (checkpoint, depth)
+        self._cache_lock = threading.Lock()
+        if not hasattr(self, "_local"):
+            self._local = threading.local()
+        self.serde = _DeltaSerde(self, self.serde)
+
+    # --- cache ---
+    def _cache_get(self, key):
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+            return hit
+
+    def _cache_put(self, key, checkpoint, depth):
+        with self._cache_lock:
+            self._cache[key] = (checkpoint, depth)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # --- encoding ---
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_id = config["configurable"].get("checkpoint_id")
+        parent = None
+        if parent_id:
+            parent = self._cache_get((thread_id, checkpoint_ns, parent_id))
+            if parent is None:
+                with self.cursor(transaction=False):
+                    parent = self._load(thread_id, checkpoint_ns, parent_id)
+        encoded, depth = self._encode(thread_id, checkpoint_ns, parent_id, parent, checkpoint)
+        self._local.encoding = (checkpoint, encoded)
+        try:
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+        finally:
+            self._local.encoding = None
+        self._cache_put((thread_id, checkpoint_ns, checkpoint["id"]), _copy_checkpoint(checkpoint), depth)
+        return next_config
+
+    def _encode(self, thread_id, checkpoint_ns, parent_id, parent, checkpoint):
+        if parent is None or parent[1] + 1 >= self.snapshot_every:
+            record = {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns, "checkpoint": checkpoint}
+            kind, depth = FULL, 0
+        else:
+            parent_cp, parent_depth = parent
+            old_values = parent_cp["channel_values"]
+            old_versions = parent_cp.get("channel_versions", {})
+            values = {}
+            for ch, value in checkpoint["channel_values"].items():
+                if ch in old_values and checkpoint["channel_versions"].get(ch) == old_versions.get(ch):
+                    values[ch] = (SAME,)
+                    continue
+                old = old_values.get(ch)
+                if (isinstance(value, list) and isinstance(old, list)
+                        and len(value) >= len(old) and value[:len(old)] == old):
+                    values[ch] = (APPEND, value[len(old):])
+                else:
+                    values[ch] = (SET, value)
+            record = {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "parent": parent_id,
+                "base": {k: v for k, v in checkpoint.items() if k != "channel_values"},
+                "values": values,
+            }
+            kind, depth = DELTA, parent_depth + 1
+        record["depth"] = depth
+        inner_type, payload = self.serde.inner.dumps_typed(record)
+        return (f"{kind}:{self.compression}:{inner_type}", _compress(self.compression, payload)), depth
+
+    # --- decoding ---
+    def _decode(self, type_, blob):
+        kind, codec, inner_type = type_.split(":", 2)
+        record = self.serde.inner.loads_typed((inner_type, _decompress(codec, blob)))
+        if kind == FULL:
+            checkpoint = record["checkpoint"]
+            self._cache_put((record["thread_id"], record["checkpoint_ns"], checkpoint["id"]),
+                            _copy_checkpoint(checkpoint), 0)
+            return checkpoint
+        key = (record["thread_id"], record["checkpoint_ns"], record["parent"])
+        parent = self._cache_get(key) or self._load(*key)
+        parent_values = parent[0]["channel_values"]
+        values = {}
+        for ch, entry in record["values"].items():
+            op = entry[0]
+            if op == SAME:
+                value = parent_values[ch]
+                values[ch] = list(value) if isinstance(value, list) else value
+            elif op == APPEND:
+                values[ch] = parent_values[ch] + list(entry[1])
+            else:
+                values[ch] = entry[1]
+        checkpoint = dict(record["base"], channel_values=values)
+        self._cache_put((record["thread_id"], record["checkpoint_ns"], checkpoint["id"]),
+                        _copy_checkpoint(checkpoint), record["depth"])
+        return checkpoint
+
+    def rebase(self, thread_id: str, checkpoint_ns: str, checkpoint_ids) -> int:
+        """Rewrite delta rows as full snapshots, so the ancestors they depend on can be deleted.
+
+        Rows that are already full are left alone. Returns the number rewritten.
+        """
+        rewritten, checkpoints = [], []
+        with self.cursor(transaction=False):
+            for checkpoint_id in checkpoint_ids:
+                row = self.conn.execute(
+                    "SELECT type FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+                if row is None or not (row[0] or "").startswith(DELTA + ":"):
+                    continue
+                checkpoint, _ = self._load(thread_id, checkpoint_ns, checkpoint_id)
+                (type_, blob), _ = self._encode(thread_id, checkpoint_ns, None, None, checkpoint)
+                rewritten.append((type_, blob, thread_id, checkpoint_ns, checkpoint_id))
+                checkpoints.append(checkpoint)
+        if rewritten:
+            with self.cursor() as cur:
+                cur.executemany(
+                    "UPDATE checkpoints SET type = ?, checkpoint = ? "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", rewritten)
+        for (*_, checkpoint_id), checkpoint in zip(rewritten, checkpoints):
+            self._cache_put((thread_id, checkpoint_ns, checkpoint_id), _copy_checkpoint(checkpoint), 0)
+        return len(rewritten)
+
+    def _load(self, thread_id, checkpoint_ns, checkpoint_id):
+        """(checkpoint, depth) for one row; caller must hold a read cursor.
+
+        May be the cached entry itself: read it, never mutate or return it.
+        """
+        cached = self._cache_get((thread_id, checkpoint_ns, checkpoint_id))
+        if cached is not None:
+            return cached
+        row = self.conn.execute(
+            "SELECT type, checkpoint FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchone()
+        if row is None:
+            raise LookupError(f"Missing parent checkpoint {checkpoint_id} of thread {thread_id}")
+        checkpoint = self.serde.loads_typed(row)
+        cached = self._cache_get((thread_id, checkpoint_ns, checkpoint_id))
+        # Rows not written by this mixin (plain or full) restart the chain
+        return cached if cached is not None else (checkpoint, self.snapshot_every)
+
+
+class DeltaSqliteSaver(DeltaCheckpointMixin, CatalogSqliteSaver):
+    """``CatalogSqliteSaver`` storing compressed per-step deltas with periodic snapshots."""
+
+
+class ConcurrentDeltaSqliteSaver(DeltaCheckpointMixin, ConcurrentSqliteSaver):
+    """Delta storage on top of the WAL read pool + group commit."""
@@ -0,0 +1,272 @@
+"""Local fast path for LLM routing decisions, with structured-output fallback.
+
+Classifying "The app crashed three times today." as negative does not need
+a model round trip. ``FastPathRouter`` wraps the structured-output model a
+routing node calls (``sentiment_model``, ``structured_evaluator_llm``) and
+asks a cheap local classifier first:
+
+* at or above ``threshold`` confidence the local label is returned, as the
+  same schema the model would return (``defaults`` fill the other fields);
+* below it, or for labels not in ``labels``, the model answers, and the
+  model's label is appended to a ``DecisionLog`` for training;
+* local classifiers are a keyword ``LexiconClassifier``, a
+  ``NaiveBayesClassifier`` trained from the decision log, or any callable
+  ``text -> (label, confidence)`` (e.g. hard rules).
+
+    log = DecisionLog("sentiment_decisions.jsonl")
+    local = NaiveBayesClassifier.fit(*log.examples()) if len(log) >= 200 else LexiconClassifier(SENTIMENT_LEXICON)
+    sentiment_model = FastPathRouter(model.with_structured_output(SentimentSchema), local,
+                                     schema=SentimentSchema, field="sentiment", threshold=0.9, log=log)
+
+``evaluate_router(local, log.read())`` replays logged decisions offline and
+reports, per threshold, how many calls the fast path would take, how often
+it agrees with the model and the model latency it would save.
+"""
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+_NEGATIONS = {"not", "no", "never", "don't", "doesn't", "didn't", "isn't", "wasn't", "aren't", "weren't",
+              "can't", "won't", "wouldn't", "couldn't", "nowhere", "hardly", "barely", "nothing", "without"}
+_SENTENCE = re.compile(r"[.;!?]")
+_CONTRAST = re.compile(r"\b(?:but|however)\b")   # "X but Y": the verdict is Y
+_CLAUSE = re.compile(r"[,:]")
+_NEGATION_SCOPE = 3   # words before a term that a negation reaches ("not really that fast")
+
+# Starter lexicon for app-review sentiment, until enough decisions are logged to train on
+SENTIMENT_LEXICON = {
+    "negative": ["crash", "crashed", "crashes", "bug", "broken", "slow", "frustrating", "useless", "worst",
+                 "refund", "hate", "error", "freeze", "freezes", "froze", "not working"],
+    "positive": ["love", "great", "awesome", "excellent", "smooth", "fast", "perfect", "amazing", "thank you",
+                 "helpful", "works great"],
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased words plus bigrams; a negation is glued to the next word ("not_good")."""
+    words = _TOKEN.findall(text.lower().replace("\u2019", "'"))
+    tokens, negate = [], False
+    for word in words:
+        tokens.append(f"not_{word}" if negate else word)
+        negate = word in _NEGATIONS
+    return tokens + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def last_message_text(value) -> str:
+    """The text a structured model was asked about: a prompt string or the last message's content."""
+    if isinstance(value, (list, tuple)) and value:
+        value = value[-1]
+        if isinstance(value, tuple):   # ("user", "text") message tuples
+            value = value[-1]
+    return getattr(value, "content", value) if not isinstance(value, str) else value
+
+
+class LexiconClassifier:
+    """Counts keyword/phrase hits per label; confidence comes from how unanimous they are.
+
+    Hits that all point to one label score ``1 - 0.1 / hits`` (one hit 0.9,
+    two 0.95, three 0.97): a single "crashed" is already a strong signal.
+    Any disagreement caps confidence at ``0.6 * share`` of the winning label,
+    so mixed reviews stay below useful thresholds and go to the model.
+
+    A term with a negation up to three words before it in the same clause
+    ("not fast", "nowhere near amazing") counts for no label but as
+    disagreement, so negated reviews fall back to the model instead of being
+    routed by the keyword they negate. So does a term before "but" or
+    "however" in its sentence ("I used to hate it but now it is fine").
+    """
+
+    def __init__(self, lexicon: dict[str, list[str]]):
+        self.lexicon = {label: [tuple(_TOKEN.findall(term.lower())) for term in terms]
+                        for label, terms in lexicon.items()}
+
+    def predict(self, text: str) -> tuple[str | None, float]:
+        hits, doubtful = Counter(), 0
+        for sentence in _SENTENCE.split(text.lower().replace("\u2019", "'")):
+            parts = _CONTRAST.split(sentence)
+            for n, part in enumerate(parts):
+                overruled = n < len(parts) - 1
+                for clause in _CLAUSE.split(part):
+                    words = _TOKEN.findall(clause)
+                    for label, terms in self.lexicon.items():
+                        for term in terms:
+                            for i in range(len(words) - len(term) + 1):
+                                if tuple(words[i:i + len(term)]) != term:
+                                    continue
+                                if overruled or _NEGATIONS.intersection(words[max(0, i - _NEGATION_SCOPE):i]):
+                                    doubtful += 1
+                                else:
+                                    hits[label] += 1
+        total = sum(hits.values()) + doubtful
+        if not hits:
+            return None, 0.0
+        label, top = hits.most_common(1)[0]
+        if top == total:
+            return label, 1.0 - 0.1 / top
+        return label, 0.6 * top / total
+
+
+class NaiveBayesClassifier:
+    """Multinomial naive Bayes over ``tokenize`` features; small enough to train on every start."""
+
+    def __init__(self, priors: dict[str, float], likelihoods: dict[str, dict[str, float]],
+                 unseen: dict[str, float]):
+        self.priors = priors
+        self.likelihoods = likelihoods
+        self.unseen = unseen
+
+    @classmethod
+    def fit(cls, texts: list[str], labels: list[str], alpha: float = 1.0) -> "NaiveBayesClassifier":
+        counts = defaultdict(Counter)
+        for text, label in zip(texts, labels):
+            counts[label].update(tokenize(text))
+        vocab = set().union(*counts.values()) if counts else set()
+        priors, likelihoods, unseen = {}, {}, {}
+        n = len(labels)
+        for label, tokens in counts.items():
+            priors[label] = math.log(labels.count(label) / n)
+            denominator = sum(tokens.values()) + alpha * (len(vocab) + 1)
+            likelihoods[label] = {t: math.log((c + alpha) / denominator) for t, c in tokens.items()}
+            unseen[label] = math.log(alpha / denominator)
+        return cls(priors, likelihoods, unseen)
+
+    def predict(self, text: str) -> tuple[str | None, float]:
+        if not self.priors:
+            return None, 0.0
+        tokens = [t for t in tokenize(text) if any(t in table for table in self.likelihoods.values())]
+        scores = {label: prior + sum(self.likelihoods[label].get(t, self.unseen[label]) for t in tokens)
+                  for label, prior in self.priors.items()}
+        best = max(scores, key=scores.get)
+        total = sum(math.exp(s - scores[best]) for s in scores.values())
+        return best, 1.0 / total
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"priors": self.priors, "likelihoods": self.likelihoods, "unseen": self.unseen}, f)
+
+    @classmethod
+    def load(cls, path: str) -> "NaiveBayesClassifier":
+        with open(path) as f:
+            return cls(**json.load(f))
+
+
+class DecisionLog:
+    """Append-only JSONL of ``{"text", "label", "seconds"}`` decisions made by the model."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, text: str, label: str, seconds: float) -> None:
+        line = json.dumps({"text": text, "label": label, "seconds": round(seconds, 4), "ts": time.time()})
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+    def read(self) -> list[dict]:
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def examples(self) -> tuple[list[str], list[str]]:
+        records = self.read()
+        return [r["text"] for r in records], [r["label"] for r in records]
+
+    def __len__(self) -> int:
+        return len(self.read())
+
+
+class FastPathRouter:
+    """Drop-in for a structured-output model: local label when confident, the model otherwise."""
+
+    def __init__(self, fallback, local, *, schema, field: str, threshold: float = 0.9,
+                 labels=None, defaults: dict | None = None, to_text=last_message_text,
+                 log: DecisionLog | None = None):
+        self.fallback = fallback
+        self.predict = local.predict if hasattr(local, "predict") else local
+        self.schema = schema
+        self.field = field
+        self.threshold = threshold
+        self.labels = set(labels) if labels is not None else None
+        self.defaults = defaults or {}
+        self.to_text = to_text
+        self.log = log
+        self._stats = Counter()
+        self._lock = threading.Lock()
+
+    def _local(self, text):
+        label, confidence = self.predict(text)
+        if label is None or confidence < self.threshold:
+            return None
+        if self.labels is not None and label not in self.labels:
+            return None
+        return self.schema(**{**self.defaults, self.field: label})
+
+    def _record(self, text, result, seconds):
+        with self._lock:
+            self._stats["fallback"] += 1
+            self._stats["fallback_s"] += seconds
+        if self.log is not None:
+            self.log.append(text, getattr(result, self.field), seconds)
+
+    def invoke(self, input, config=None, **kwargs):
+        text = self.to_text(input)
+        fast = self._local(text)
+        if fast is not None:
+            with self._lock:
+                self._stats["fast"] += 1
+            return fast
+        started = time.perf_counter()
+        result = self.fallback.invoke(input, config, **kwargs)
+        self._record(text, result, time.perf_counter() - started)
+        return result
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        text = self.to_text(input)
+        fast = self._local(text)
+        if fast is not None:
+            with self._lock:
+                self._stats["fast"] += 1
+            return fast
+        started = time.perf_counter()
+        result = await self.fallback.ainvoke(input, config, **kwargs)
+        self._record(text, result, time.perf_counter() - started)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            fast, fallback, seconds = self._stats["fast"], self._stats["fallback"], self._stats["fallback_s"]
+        mean = seconds / fallback if fallback else 0.0
+        return {"fast": fast, "fallback": fallback, "fast_share": fast / (fast + fallback) if fast + fallback else 0.0,
+                "mean_model_s": mean, "est_saved_s": fast * mean}
+
+
+def evaluate_router(local, records: list[dict], thresholds=(0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.99)) -> list[dict]:
+    """Replay logged model decisions through ``local``; one row per threshold.
+
+    ``coverage`` is the share the fast path would answer, ``agreement`` how
+    often it matches the model there, ``saved_s`` the logged model seconds it
+    would skip minus the local classifier's own time.
+    """
+    predict = local.predict if hasattr(local, "predict") else local
+    started = time.perf_counter()
+    predictions = [predict(r["text"]) for r in records]
+    local_s = time.perf_counter() - started
+    rows = []
+    for threshold in thresholds:
+        covered = [(r, label) for r, (label, confidence) in zip(records, predictions)
+                   if label is not None and confidence >= threshold]
+        agree = sum(label == r["label"] for r, label in covered)
+        rows.append({
+            "threshold": threshold,
+            "coverage": len(covered) / len(records) if records else 0.0,
+            "agreement": agree / len(covered) if covered else 1.0,
+            "saved_s": sum(r.get("seconds", 0.0) for r, _ in covered) - local_s,
+            "local_ms_per_call": local_s / len(records) * 1000 if records else 0.0,
+        })
+    return rows
@@ -0,0 +1,407 @@
+"""Latency histograms for compiled graphs, exported as Prometheus text or OTLP JSON.
+
+``instrument(graph)`` attaches to any ``StateGraph.compile()`` result and
+records, per graph:
+
+* ``graph_run_seconds`` and ``graph_supersteps``: wall time and number of
+  super-steps of each top-level run;
+* ``graph_node_seconds{node}``: wall time of every node execution;
+* ``llm_seconds``, ``llm_ttft_seconds`` and ``llm_inter_token_seconds``
+  ``{node}``: model call time and, for streamed runs (``stream_mode="messages"``
+  or ``astream``), time to first token and the gaps between tokens;
+* ``tool_seconds{tool, status}``: every tool call, wherever it runs;
+* ``checkpoint_serialize_seconds{op}`` and ``checkpoint_write_seconds{op}``:
+  the checkpointer's serde calls and its ``put``/``put_writes`` (write time
+  includes serialization), plus ``checkpoint_read_seconds``.
+
+Node, model and tool timings come from a callback handler bound to the graph;
+checkpoint timings from wrapping the graph's checkpointer instance.
+
+    metrics = GraphMetrics()
+    chatbot = instrument(graph.compile(checkpointer=checkpointer), metrics, name="chatbot")
+    serve_prometheus(metrics, port=9464)              # GET /metrics
+    # or: OTLPFileExporter(metrics, "metrics.jsonl", interval=15).start()
+"""
+import bisect
+import functools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Seconds; from sub-millisecond serde calls to multi-minute agent runs
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+STEP_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 25, 50, 100)
+
+DESCRIPTIONS = {
+    "graph_run_seconds": "Wall time of a top-level graph run",
+    "graph_supersteps": "Super-steps per top-level graph run",
+    "graph_node_seconds": "Wall time of one node execution",
+    "llm_seconds": "Chat model call duration",
+    "llm_ttft_seconds": "Time to first streamed token",
+    "llm_inter_token_seconds": "Gap between consecutive streamed tokens",
+    "tool_seconds": "Tool call duration",
+    "checkpoint_serialize_seconds": "Checkpoint (de)serialization time",
+    "checkpoint_write_seconds": "Checkpointer write time, serialization included",
+    "checkpoint_read_seconds": "Checkpointer read time, deserialization included",
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics) for one label set."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)   # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (coarse, for summaries)."""
+        rank, seen = q * self.count, 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank and count:
+                return bound
+        return 0.0
+
+
+class GraphMetrics:
+    """Thread-safe registry of histograms keyed by metric name and labels."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.started = time.time()
+        self._series: dict[str, dict[tuple, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        bounds = STEP_BUCKETS if name == "graph_supersteps" else self.buckets
+        with self._lock:
+            series = self._series.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(bounds)
+            histogram.observe(value)
+
+    def snapshot(self) -> dict:
+        """``{name: {labels: Histogram copy}}``."""
+        with self._lock:
+            out = {}
+            for name, series in self._series.items():
+                out[name] = {}
+                for key, histogram in series.items():
+                    copy = Histogram(histogram.bounds)
+                    copy.counts, copy.count, copy.sum = list(histogram.counts), histogram.count, histogram.sum
+                    out[name][key] = copy
+            return out
+
+    def summary(self) -> dict:
+        """Count, mean and coarse p50/p99 per series, for printing."""
+        rows = {}
+        for name, series in self.snapshot().items():
+            for key, h in series.items():
+                label = name + ("{" + ",".join(f"{k}={v}" for k, v in key) + "}" if key else "")
+                rows[label] = {"count": h.count, "mean": h.sum / h.count if h.count else 0.0,
+                               "p50<=": h.quantile(0.5), "p99<=": h.quantile(0.99)}
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self.started = time.time()
+
+
+# --- callbacks: nodes, super-steps, models, tools ---
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Times node, model and tool runs of one graph from its callback events."""
+
+    def __init__(self, metrics: GraphMetrics, graph: str):
+        self.metrics = metrics
+        self.graph = graph
+        self._runs: dict = {}    # run_id -> (kind, start, labels)
+        self._roots: dict = {}   # root run_id -> set of super-steps seen
+        self._root_of: dict = {}  # chain run_id -> its top-level run_id
+        self._streams: dict = {}  # llm run_id -> time of the last token (None before the first)
+        self._lock = threading.Lock()
+
+    def _start(self, run_id, kind, **labels):
+        with self._lock:
+            self._runs[run_id] = (kind, time.perf_counter(), labels)
+
+    def _end(self, run_id, **extra):
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        kind, start, labels = run
+        elapsed = time.perf_counter() - start
+        self.metrics.observe(kind, elapsed, graph=self.graph, **labels, **extra)
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None,
+                       **kwargs):
+        metadata = metadata or {}
+        if parent_run_id is None or parent_run_id not in self._root_of:   # the graph may run inside another chain
+            with self._lock:
+                self._roots[run_id] = set()
+                self._root_of[run_id] = run_id
+            self._start(run_id, "graph_run_seconds")
+            return
+        with self._lock:
+            root = self._root_of[run_id] = self._root_of.get(parent_run_id, parent_run_id)
+        node = metadata.get("langgraph_node")
+        # The node's own run (not a runnable nested inside it) is tagged with its super-step
+        if node is not None and kwargs.get("name") == node and any(t.startswith("graph:step:") for t in tags or ()):
+            self._start(run_id, "graph_node_seconds", node=node)
+            if parent_run_id == root:   # subgraph steps don't count as the outer graph's
+                with self._lock:
+                    self._roots[root].add(metadata.get("langgraph_step"))
+
+    def _chain_done(self, run_id):
+        self._end(run_id)
+        with self._lock:
+            self._root_of.pop(run_id, None)
+            steps = self._roots.pop(run_id, None)
+        if steps is not None:
+            self.metrics.observe("graph_supersteps", len(steps), graph=self.graph)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._chain_done(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._chain_done(run_id)
+
+    def _llm_start(self, run_id, metadata):
+        self._start(run_id, "llm_seconds", node=(metadata or {}).get("langgraph_node", ""))
+        with self._lock:
+            self._streams[run_id] = None
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._llm_start(run_id, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._llm_start(run_id, metadata)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        now = time.perf_counter()
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None or run_id not in self._streams:
+                return
+            last, self._streams[run_id] = self._streams[run_id], now
+        node = run[2].get("node", "")
+        if last is None:
+            self.metrics.observe("llm_ttft_seconds", now - run[1], graph=self.graph, node=node)
+        else:
+            self.metrics.observe("llm_inter_token_seconds", now - last, graph=self.graph, node=node)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._end(run_id)
+        with self._lock:
+            self._streams.pop(run_id, None)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self.on_llm_end(None, run_id=run_id)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._start(run_id, "tool_seconds", tool=kwargs.get("name") or (serialized or {}).get("name", ""))
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id, status=getattr(output, "status", "success"))
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, status="error")
+
+
+# --- checkpointer ---
+class _TimedSerde:
+    """Serde proxy timing (de)serialization; everything else is delegated."""
+
+    def __init__(self, inner, metrics: GraphMetrics, graph: str):
+        self._inner = inner
+        self._metrics = metrics
+        self._graph = graph
+
+    def dumps_typed(self, obj):
+        start = time.perf_counter()
+        try:
+            return self._inner.dumps_typed(obj)
+        finally:
+            self._metrics.observe("checkpoint_serialize_seconds", time.perf_counter() - start,
+                                  graph=self._graph, op="dumps")
+
+    def loads_typed(self, data):
+        start = time.perf_counter()
+        try:
+            return self._inner.loads_typed(data)
+        finally:
+            self._metrics.observe("checkpoint_serialize_seconds", time.perf_counter() - start,
+                                  graph=self._graph, op="loads")
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+def _timed(method, metrics, name, graph, op):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            metrics.observe(name, time.perf_counter() - start, graph=graph, op=op)
+    return wrapper
+
+
+def _atimed(method, metrics, name, graph, op):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            metrics.observe(name, time.perf_counter() - start, graph=graph, op=op)
+    return wrapper
+
+
+CHECKPOINT_METHODS = {
+    "put": "checkpoint_write_seconds", "put_writes": "checkpoint_write_seconds",
+    "get_tuple": "checkpoint_read_seconds",
+}
+
+
+def instrument_checkpointer(saver, metrics: GraphMetrics, graph: str = "graph"):
+    """Wrap a checkpointer instance in place (idempotent) and return it."""
+    if getattr(saver, "_metrics_instrumented", False):
+        return saver
+    saver.serde = _TimedSerde(saver.serde, metrics, graph)
+    for op, name in CHECKPOINT_METHODS.items():
+        setattr(saver, op, _timed(getattr(saver, op), metrics, name, graph, op))
+        setattr(saver, "a" + op, _atimed(getattr(saver, "a" + op), metrics, name, graph, op))
+    saver._metrics_instrumented = True
+    return saver
+
+
+def instrument(graph, metrics: GraphMetrics, name: str = "graph"):
+    """The compiled graph with metrics callbacks bound; its checkpointer is timed too."""
+    from langgraph.checkpoint.base import BaseCheckpointSaver
+
+    if isinstance(graph.checkpointer, BaseCheckpointSaver):
+        instrument_checkpointer(graph.checkpointer, metrics, name)
+    return graph.with_config(callbacks=[MetricsCallbackHandler(metrics, name)])
+
+
+# --- exporters ---
+def _label_text(key, extra=()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def to_prometheus_text(metrics: GraphMetrics) -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for name, series in sorted(metrics.snapshot().items()):
+        lines.append(f"# HELP {name} {DESCRIPTIONS.get(name, name)}")
+        lines.append(f"# TYPE {name} histogram")
+        for key, h in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(h.bounds + (float("inf"),), h.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{name}_bucket{_label_text(key, [('le', le)])} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(key)} {h.sum}")
+            lines.append(f"{name}_count{_label_text(key)} {h.count}")
+    return "\n".join(lines) + "\n"
+
+
+def serve_prometheus(metrics: GraphMetrics, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` from a daemon thread; returns the server (``shutdown()`` to stop)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = to_prometheus_text(metrics).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+    return server
+
+
+def to_otlp_json(metrics: GraphMetrics, service_name: str = "langgraph") -> dict:
+    """One OTLP/JSON ``MetricsData`` document (cumulative histograms)."""
+    start_ns, now_ns = int(metrics.started * 1e9), time.time_ns()
+    out = []
+    for name, series in sorted(metrics.snapshot().items()):
+        points = [{
+            "attributes": [{"key": k, "value": {"stringValue": str(v)}} for k, v in key],
+            "startTimeUnixNano": str(start_ns),
+            "timeUnixNano": str(now_ns),
+            "count": str(h.count),
+            "sum": h.sum,
+            "bucketCounts": [str(c) for c in h.counts],
+            "explicitBounds": list(h.bounds),
+        } for key, h in sorted(series.items())]
+        out.append({"name": name, "description": DESCRIPTIONS.get(name, ""),
+                    "unit": "1" if name == "graph_supersteps" else "s",
+                    "histogram": {"aggregationTemporality": 2, "dataPoints": points}})
+    return {"resourceMetrics": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+        "scopeMetrics": [{"scope": {"name": "common.graph_metrics"}, "metrics": out}],
+    }]}
+
+
+class OTLPFileExporter:
+    """Appends one OTLP/JSON line per export, the format the OpenTelemetry Collector's file receiver reads."""
+
+    def __init__(self, metrics: GraphMetrics, path: str, *, interval: float = 15.0, service_name: str = "langgraph"):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.service_name = service_name
+        self._stop = threading.Event()
+        self._thread = None
+
+    def export(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(to_otlp_json(self.metrics, self.service_name)) + "\n")
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.export()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="metrics-otlp")
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        """Stop the timer and write a final export."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.export()
@@ -0,0 +1,173 @@
+"""Hybrid lexical + dense retrieval for ``rag_tool``.
+
+``vectorstore.as_retriever()`` embeds every query and ranks by vector
+similarity only, so exact-term questions ("multi-head attention", equation
+and section names) can miss the chunk that literally contains them.
+``HybridRetriever`` combines:
+
+* ``BM25Index``: an inverted index (term -> chunk positions + term
+  frequencies) built once at ingestion time and persisted next to the FAISS
+  index by ``IndexStore``;
+* the FAISS store, queried with embeddings from an LRU cache, so repeated or
+  re-phrased-identically queries skip model inference;
+* reciprocal-rank fusion (RRF) of the two rankings;
+* a lexical fast path: when every query term is indexed and at most ``k``
+  chunks contain all of them, the query is selective enough that BM25 alone
+  is trusted and no embedding is computed.
+
+    bm25 = index_store.bm25_index(vectorstore)
+    retriever = HybridRetriever(vectorstore=vectorstore, bm25=bm25, k=4)
+"""
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict, PrivateAttr
+
+TOKEN = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by does for from how in is it of on or that the this to was what when "
+    "where which who why with according document paper explain describe".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index of chunk ids."""
+
+    def __init__(self, doc_ids: list[str], postings: dict, doc_lens: np.ndarray, k1: float = 1.5, b: float = 0.75):
+        self.doc_ids = doc_ids
+        self.postings = postings   # term -> (positions int32[], term frequencies float32[])
+        self.doc_lens = doc_lens
+        self.k1 = k1
+        self.b = b
+        self.avg_len = float(doc_lens.mean()) if len(doc_lens) else 0.0
+        n = len(doc_ids)
+        self.idf = {term: math.log(1 + (n - len(pos) + 0.5) / (len(pos) + 0.5))
+                    for term, (pos, _) in postings.items()}
+
+    @classmethod
+    def build(cls, docs, ids: list[str], **params) -> "BM25Index":
+        term_docs: dict[str, list[tuple[int, int]]] = {}
+        lens = np.zeros(len(ids), dtype=np.float32)
+        for i, doc in enumerate(docs):
+            counts = Counter(tokenize(doc.page_content))
+            lens[i] = sum(counts.values())
+            for term, tf in counts.items():
+                term_docs.setdefault(term, []).append((i, tf))
+        postings = {
+            term: (np.fromiter((p for p, _ in entries), np.int32, len(entries)),
+                   np.fromiter((tf for _, tf in entries), np.float32, len(entries)))
+            for term, entries in term_docs.items()
+        }
+        return cls(list(ids), postings, lens, **params)
+
+    @classmethod
+    def from_vectorstore(cls, vectorstore, **params) -> "BM25Index":
+        ids = list(vectorstore.index_to_docstore_id.values())
+        return cls.build((vectorstore.docstore.search(i) for i in ids), ids, **params)
+
+    def save(self, path) -> None:
+        """Write as plain ``.npz`` arrays: loading it never unpickles anything."""
+        terms = list(self.postings)
+        lengths = np.fromiter((len(self.postings[t][0]) for t in terms), np.int64, len(terms))
+        with open(path, "wb") as f:
+            np.savez(
+                f, doc_ids=np.array(self.doc_ids, dtype=str), doc_lens=self.doc_lens,
+                terms=np.array(terms, dtype=str), offsets=np.concatenate([[0], np.cumsum(lengths)]),
+                positions=np.concatenate([self.postings[t][0] for t in terms] or [np.zeros(0, np.int32)]),
+                tfs=np.concatenate([self.postings[t][1] for t in terms] or [np.zeros(0, np.float32)]),
+                params=np.array([self.k1, self.b]),
+            )
+
+    @classmethod
+    def load(cls, path) -> "BM25Index":
+        with np.load(path, allow_pickle=False) as data:
+            offsets, positions, tfs = data["offsets"], data["positions"], data["tfs"]
+            postings = {term: (positions[start:end], tfs[start:end])
+                        for term, start, end in zip(data["terms"].tolist(), offsets[:-1], offsets[1:])}
+            k1, b = data["params"].tolist()
+            return cls(data["doc_ids"].tolist(), postings, data["doc_lens"], k1=k1, b=b)
+
+    def search(self, query: str, k: int) -> tuple[list[tuple[str, float]], int]:
+        """Top ``k`` (chunk id, score), and how many chunks contain every query term."""
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        terms = [t for t in query_terms if t in self.postings]
+        if not terms or not self.doc_ids:
+            return [], 0
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        matched = np.zeros(len(self.doc_ids), dtype=np.int16)
+        norm = self.k1 * (1 - self.b + self.b * self.doc_lens / (self.avg_len or 1.0))
+        for term in terms:
+            pos, tf = self.postings[term]
+            scores[pos] += self.idf[term] * tf * (self.k1 + 1) / (tf + norm[pos])
+            matched[pos] += 1
+        k = min(k, int(np.count_nonzero(scores)))
+        top = np.argpartition(-scores, k - 1)[:k] if k else np.array([], dtype=np.int64)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        # An unindexed query term means no chunk matches them all
+        exact = int(np.count_nonzero(matched == len(terms))) if len(terms) == len(query_terms) else 0
+        return [(self.doc_ids[i], float(scores[i])) for i in top], exact
+
+
+class HybridRetriever(BaseRetriever):
+    """BM25 + FAISS with reciprocal-rank fusion and a lexical-only fast path."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    vectorstore: object
+    bm25: BM25Index
+    k: int = 4
+    fetch_k: int = 20            # candidates taken from each ranking before fusion
+    rrf_k: int = 60              # RRF damping constant from the original paper
+    lexical_max_matches: int | None = None   # fast path if 1..this many chunks hold every term (default k)
+    cache_size: int = 512
+
+    _cache: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _stats: Counter = PrivateAttr(default_factory=Counter)
+
+    def _query_vector(self, query: str) -> list[float]:
+        key = " ".join(query.lower().split())
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                self._stats["embedding_cache_hits"] += 1
+                return vector
+        vector = self.vectorstore.embedding_function.embed_query(query)
+        with self._lock:
+            self._stats["embeddings"] += 1
+            self._cache[key] = vector
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return vector
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None):
+        lexical, exact = self.bm25.search(query, self.fetch_k)
+        docstore = self.vectorstore.docstore
+        if 0 < exact <= (self.lexical_max_matches or self.k):
+            self._stats["lexical_fast_path"] += 1
+            return [docstore.search(doc_id) for doc_id, _ in lexical[:self.k]]
+
+        self._stats["hybrid"] += 1
+        dense = self.vectorstore.similarity_search_with_score_by_vector(self._query_vector(query), k=self.fetch_k)
+        fused: dict[str, float] = {}
+        docs = {}
+        for rank, (doc_id, _) in enumerate(lexical):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+        for rank, (doc, _) in enumerate(dense):
+            fused[doc.id] = fused.get(doc.id, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+            docs[doc.id] = doc
+        best = sorted(fused, key=fused.get, reverse=True)[:self.k]
+        return [docs.get(doc_id) or docstore.search(doc_id) for doc_id in best]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,337 @@
+"""Indexed queue of pending human-in-the-loop interrupts, with bulk resume.
+
+An ``interrupt(...)`` is only visible by re-invoking its thread or loading
+its checkpoint and reading the pending writes, one thread at a time. With
+thousands of paused threads, "what is waiting for approval, oldest first?"
+becomes a scan of every checkpoint. ``InterruptIndexMixin`` records each
+interrupt as a row of an ``interrupt_index`` table as the checkpointer
+persists it, and keeps the row's status current:
+
+* ``pending``: raised and not answered yet;
+* ``resumed``: the interrupted task ran again and finished (or interrupted
+  again, which adds a new pending row);
+* ``failed``: the resumed task raised;
+* ``superseded``: the thread moved on without an answer (e.g. new input).
+
+Rows are indexed by status, type and age, so listing pending approvals
+costs one indexed page query, not a checkpoint scan. The type is the
+interrupt payload's ``"type"`` key when it has one (``{"type": "approval", ...}``),
+else ``"interrupt"``.
+
+    checkpointer = InterruptSqliteSaver(sqlite3.connect("hitl.db", check_same_thread=False))
+    app = builder.compile(checkpointer=checkpointer)
+    page = checkpointer.list_interrupts(type="approval", older_than=3600, limit=100)
+    result = resume_interrupts(app, page.interrupts, {"approved": "yes"}, label="approved")
+
+``resume_interrupts`` issues ``Command(resume=...)`` for many threads at
+once from a thread pool (``SqliteSaver`` is sync-only) and records the
+decision label on the rows it answered.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from langgraph.types import Command
+
+from common.thread_catalog import CatalogSqliteSaver
+
+# Reserved channel names LangGraph writes pending interrupts, resume values and task errors to
+INTERRUPT, RESUME, ERROR = "__interrupt__", "__resume__", "__error__"
+NULL_TASK_ID = "00000000-0000-0000-0000-000000000000"
+STATUSES = {"pending", "resumed", "failed", "superseded"}
+DEFAULT_TYPE = "interrupt"
+
+_COLUMNS = ("id, thread_id, checkpoint_id, task_id, interrupt_id, type, status, "
+            "value_type, value, created_at, resolved_at, decision")
+
+
+class PendingInterrupt(NamedTuple):
+    id: int
+    thread_id: str
+    checkpoint_id: str
+    task_id: str
+    interrupt_id: str
+    type: str
+    status: str
+    value: object
+    created_at: float
+    resolved_at: float | None
+    decision: str | None
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+
+class InterruptPage(NamedTuple):
+    interrupts: list[PendingInterrupt]   # oldest first
+    next_cursor: tuple | None            # pass back as ``cursor=`` for the next page
+
+
+class BulkResult(NamedTuple):
+    resumed: list[str]          # thread ids
+    failed: dict[str, str]      # thread id -> error
+    skipped: list[str]          # no longer pending when their turn came
+    seconds: float
+
+    def __str__(self):
+        return (f"{len(self.resumed)} threads resumed, {len(self.failed)} failed, "
+                f"{len(self.skipped)} skipped in {self.seconds:.2f}s")
+
+
+def interrupt_type(value) -> str:
+    if isinstance(value, dict) and isinstance(value.get("type"), str):
+        return value["type"]
+    return DEFAULT_TYPE
+
+
+class InterruptIndexMixin:
+    """Mix into a ``CatalogSqliteSaver`` subclass to index interrupts as they are written."""
+
+    def setup(self) -> None:
+        if self.is_setup:
+            return
+        super().setup()
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS interrupt_index (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                thread_id TEXT NOT NULL,
+                checkpoint_id TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                interrupt_id TEXT NOT NULL,
+                type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                value_type TEXT,
+                value BLOB,
+                created_at REAL NOT NULL,
+                resolved_at REAL,
+                decision TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_interrupt_status
+                ON interrupt_index(status, created_at, id);
+            CREATE INDEX IF NOT EXISTS idx_interrupt_type
+                ON interrupt_index(type, status, created_at, id);
+            CREATE INDEX IF NOT EXISTS idx_interrupt_thread
+                ON interrupt_index(thread_id, status);
+            """
+        )
+
+    # --- maintained on write ---
+    def put_writes(self, config, writes, task_id, task_path=""):
+        super().put_writes(config, writes, task_id, task_path)
+        # Subgraph interrupts also surface as writes of the parent task in the root namespace
+        if config["configurable"].get("checkpoint_ns") or task_id == NULL_TASK_ID:
+            return
+        if all(channel == RESUME for channel, _ in writes):
+            return   # the answer was recorded; the task has not run with it yet
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        raised = [i for channel, value in writes if channel == INTERRUPT for i in value]
+        failed = any(channel == ERROR for channel, _ in writes)
+        now = time.time()
+        with self.cursor(transaction=False) as cur:
+            open_rows = cur.execute(
+                # The next checkpoint can land before these writes (sync graphs persist in the
+                # background), so rows it marked superseded at this checkpoint are still open here
+                "SELECT id, interrupt_id, checkpoint_id, value_type, value FROM interrupt_index "
+                "WHERE thread_id = ? AND task_id = ? "
+                "AND (status = 'pending' OR (status = 'superseded' AND checkpoint_id = ?))",
+                (thread_id, task_id, checkpoint_id),
+            ).fetchall()
+        if not raised and not open_rows:
+            return
+        new_rows = []
+        for interrupt in raised:
+            typed = self.serde.dumps_typed(interrupt.value)
+            replay = [row for row in open_rows
+                      if row[1] == interrupt.id and row[2] == checkpoint_id and (row[3], row[4]) == typed]
+            if replay:   # the same interrupt written again, e.g. when the task is retried
+                open_rows = [row for row in open_rows if row not in replay]
+                continue
+            new_rows.append((thread_id, checkpoint_id, task_id, interrupt.id, interrupt_type(interrupt.value),
+                             "pending", *typed, now))
+        # Whatever was pending for this task has been answered: it finished, failed or asked again
+        done = [row[0] for row in open_rows]
+        if not raised or new_rows:
+            with self.cursor() as cur:
+                if done:
+                    cur.executemany(
+                        "UPDATE interrupt_index SET status = ?, resolved_at = ? WHERE id = ?",
+                        [("failed" if failed else "resumed", now, row_id) for row_id in done],
+                    )
+                if new_rows:
+                    cur.executemany(
+                        "INSERT INTO interrupt_index (thread_id, checkpoint_id, task_id, interrupt_id, type, "
+                        "status, value_type, value, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        new_rows,
+                    )
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with self._write_unit() as cur:   # same transaction as the checkpoint and catalog rows
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            parent_id = config["configurable"].get("checkpoint_id")
+            if parent_id and not config["configurable"].get("checkpoint_ns"):
+                # A new root checkpoint after an interrupted one: anything still open there was bypassed
+                cur.execute(
+                    "UPDATE interrupt_index SET status = 'superseded', resolved_at = ? "
+                    "WHERE thread_id = ? AND checkpoint_id = ? AND status = 'pending'",
+                    (time.time(), str(config["configurable"]["thread_id"]), parent_id),
+                )
+        return next_config
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM interrupt_index WHERE thread_id = ?", (str(thread_id),))
+
+    # --- queries ---
+    def _row(self, row) -> PendingInterrupt:
+        id_, thread_id, checkpoint_id, task_id, interrupt_id, type_, status, vtype, value, *rest = row
+        return PendingInterrupt(id_, thread_id, checkpoint_id, task_id, interrupt_id, type_, status,
+                                self.serde.loads_typed((vtype, value)), *rest)
+
+    @staticmethod
+    def _filters(status, type, older_than, thread_id):
+        if status is not None and status not in STATUSES:
+            raise ValueError(f"status must be one of {sorted(STATUSES)}")
+        clauses, params = [], []
+        for column, value in (("status", status), ("type", type), ("thread_id", thread_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if older_than is not None:
+            clauses.append("created_at <= ?")
+            params.append(time.time() - older_than)
+        return clauses, params
+
+    def list_interrupts(self, status: str | None = "pending", type: str | None = None,
+                        older_than: float | None = None, thread_id: str | None = None,
+                        limit: int = 50, cursor: tuple | None = None) -> InterruptPage:
+        """One page of interrupts, oldest first; ``older_than`` is an age in seconds."""
+        clauses, params = self._filters(status, type, older_than, thread_id)
+        if cursor is not None:
+            clauses.append("(created_at, id) > (?, ?)")
+            params.extend(cursor)
+        query = f"SELECT {_COLUMNS} FROM interrupt_index"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created_at, id LIMIT ?"
+        with self.cursor(transaction=False) as cur:
+            rows = cur.execute(query, (*params, limit + 1)).fetchall()
+        interrupts = [self._row(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = (interrupts[-1].created_at, interrupts[-1].id)
+        return InterruptPage(interrupts, next_cursor)
+
+    def count_interrupts(self, status: str | None = "pending", type: str | None = None,
+                         older_than: float | None = None) -> int:
+        clauses, params = self._filters(status, type, older_than, None)
+        query = "SELECT COUNT(*) FROM interrupt_index" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        with self.cursor(transaction=False) as cur:
+            return cur.execute(query, params).fetchone()[0]
+
+    def get_interrupt(self, row_id: int) -> PendingInterrupt | None:
+        with self.cursor(transaction=False) as cur:
+            row = cur.execute(f"SELECT {_COLUMNS} FROM interrupt_index WHERE id = ?", (row_id,)).fetchone()
+        return self._row(row) if row else None
+
+    def record_decision(self, row_ids, decision: str) -> None:
+        """Label answered interrupts (e.g. ``"approved"``); the status itself follows the graph."""
+        with self.cursor() as cur:
+            cur.executemany("UPDATE interrupt_index SET decision = ? WHERE id = ?",
+                            [(decision, row_id) for row_id in row_ids])
+
+    def rebuild_interrupt_index(self) -> int:
+        """Index the open interrupts of a database written before the index existed.
+
+        Reads the interrupt writes of each thread's latest root checkpoint only,
+        skipping tasks that already ran to completion there.
+        Returns the number of interrupts indexed.
+        """
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM interrupt_index")
+        with self.cursor(transaction=False) as cur:
+            rows = cur.execute(
+                """
+                SELECT w.thread_id, w.checkpoint_id, w.task_id, w.type, w.value
+                FROM writes w
+                JOIN (SELECT thread_id, MAX(checkpoint_id) AS checkpoint_id FROM checkpoints
+                      WHERE checkpoint_ns = '' GROUP BY thread_id) latest
+                  ON latest.thread_id = w.thread_id AND latest.checkpoint_id = w.checkpoint_id
+                WHERE w.checkpoint_ns = '' AND w.channel = ?
+                  AND NOT EXISTS (SELECT 1 FROM writes done
+                                  WHERE done.thread_id = w.thread_id AND done.checkpoint_ns = ''
+                                    AND done.checkpoint_id = w.checkpoint_id AND done.task_id = w.task_id
+                                    AND done.channel NOT IN (?, ?, ?))
+                ORDER BY w.thread_id, w.task_id, w.idx
+                """, (INTERRUPT, INTERRUPT, RESUME, ERROR),
+            ).fetchall()
+        by_task = {}
+        for thread_id, checkpoint_id, task_id, type_, blob in rows:
+            for interrupt in self.serde.loads_typed((type_, blob)):
+                by_task[(thread_id, task_id, interrupt.id)] = (checkpoint_id, interrupt)   # keep the latest
+        now = time.time()
+        with self.cursor() as cur:
+            cur.executemany(
+                "INSERT INTO interrupt_index (thread_id, checkpoint_id, task_id, interrupt_id, type, status, "
+                "value_type, value, created_at) VALUES (?, ?, ?, ?, ?, 'pending', ?, ?, ?)",
+                [(thread_id, checkpoint_id, task_id, interrupt.id, interrupt_type(interrupt.value),
+                  *self.serde.dumps_typed(interrupt.value), now)
+                 for (thread_id, task_id, _), (checkpoint_id, interrupt) in by_task.items()],
+            )
+        return len(by_task)
+
+
+class InterruptSqliteSaver(InterruptIndexMixin, CatalogSqliteSaver):
+    """``CatalogSqliteSaver`` that also indexes interrupts."""
+
+
+# --- bulk resume ---
+def _resume_commands(store, interrupts, decision):
+    """``{thread_id: (Command, row ids)}`` for the interrupts still pending."""
+    by_thread: dict[str, list[PendingInterrupt]] = {}
+    for item in interrupts:
+        by_thread.setdefault(item.thread_id, []).append(item)
+    commands, skipped = {}, []
+    for thread_id, items in by_thread.items():
+        pending = {i.interrupt_id: i for i in store.list_interrupts(thread_id=thread_id, limit=1000).interrupts}
+        items = [i for i in items if i.interrupt_id in pending]
+        if not items:
+            skipped.append(thread_id)
+            continue
+        values = {i.interrupt_id: decision(i) if callable(decision) else decision for i in items}
+        # One open interrupt takes a bare value; several need the id -> value map
+        resume = next(iter(values.values())) if len(pending) == 1 else values
+        commands[thread_id] = (Command(resume=resume), [pending[i.interrupt_id].id for i in items])
+    return commands, skipped
+
+
+def resume_interrupts(graph, interrupts, decision, *, label: str | None = None,
+                      max_workers: int = 16) -> BulkResult:
+    """Answer many interrupts at once; ``decision`` is a resume value or ``f(PendingInterrupt) -> value``.
+
+    Threads are resumed concurrently in a thread pool (one ``invoke`` each);
+    ``label`` (e.g. ``"approved"``) is recorded on the rows of threads that resumed.
+    """
+    store = graph.checkpointer
+    started = time.perf_counter()
+    commands, skipped = _resume_commands(store, interrupts, decision)
+
+    def run(thread_id):
+        command, _ = commands[thread_id]
+        graph.invoke(command, {"configurable": {"thread_id": thread_id}})
+
+    resumed, failed = [], {}
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resume") as pool:
+        futures = {thread_id: pool.submit(run, thread_id) for thread_id in commands}
+        for thread_id, future in futures.items():
+            try:
+                future.result()
+                resumed.append(thread_id)
+            except Exception as exc:
+                failed[thread_id] = repr(exc)
+    if label is not None:
+        store.record_decision([row for t in resumed for row in commands[t][1]], label)
+    return BulkResult(resumed, failed, skipped, time.perf_counter() - started)
@@ -0,0 +1,165 @@
+"""Persistent SQLite response cache for chat models, with LRU/TTL eviction.
+
+Plugs into LangChain's own cache hook, so it is opt-in per model:
+
+    from common.llm_cache import SQLiteLLMCache
+
+    llm_cache = SQLiteLLMCache("llm_cache.db", max_entries=5_000, ttl_seconds=7 * 24 * 3600)
+    model = ChatGroq(model="llama-3.3-70b-versatile", cache=llm_cache)
+    structured_model = model.with_structured_output(Evaluation)   # cached too
+
+The key is a hash of the normalized prompt plus LangChain's ``llm_string``,
+which already carries the model name, temperature and any bound tools /
+structured-output schema. A different schema or temperature is a different
+entry, while whitespace-only prompt differences hit the same one.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace in message contents and drop per-run noise (ids)."""
+    try:
+        data = json.loads(prompt)
+    except ValueError:
+        return " ".join(prompt.split())
+
+    def _clean(node):
+        if isinstance(node, dict):
+            out = {}
+            for key, value in node.items():
+                if key == "id" and isinstance(value, str):
+                    continue
+                if key == "content" and isinstance(value, str):
+                    value = " ".join(value.split())
+                out[key] = _clean(value)
+            return out
+        if isinstance(node, list):
+            return [_clean(item) for item in node]
+        return node
+
+    return json.dumps(_clean(data), sort_keys=True)
+
+
+class SQLiteLLMCache(BaseCache):
+    """LangChain ``BaseCache`` stored in SQLite with size- and age-based eviction.
+
+    ``max_entries`` / ``max_bytes`` evict least-recently-used rows,
+    ``ttl_seconds`` expires rows by creation time. ``stats()`` reports
+    hit/miss counters for the lifetime of this object.
+    """
+
+    def __init__(self, db_path: str = "llm_cache.db", max_entries: int = 10_000,
+                 max_bytes: int | None = None, ttl_seconds: float | None = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key         TEXT PRIMARY KEY,
+                value       TEXT NOT NULL,
+                size        INTEGER NOT NULL,
+                created_at  REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache(last_access);
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache(created_at);
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        raw = normalize_prompt(prompt) + "\x00" + llm_string
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str):
+        key = self.make_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return loads(row[0], allowed_objects="core")
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        key = self.make_key(prompt, llm_string)
+        value = dumps(return_val)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        cur = self._conn
+        if self.ttl_seconds is not None:
+            self.evictions += cur.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+        if self.max_entries is not None:
+            self.evictions += cur.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache "
+                "ORDER BY last_access DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+            ).rowcount
+        if self.max_bytes is not None:
+            total = cur.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+            if total > self.max_bytes:
+                # Walk from least recently used and drop until under budget
+                for key, size in cur.execute(
+                    "SELECT key, size FROM llm_cache ORDER BY last_access ASC"
+                ).fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    cur.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    total -= size
+                    self.evictions += 1
+
+    def clear(self, **kwargs) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self) -> None:
+        self._conn.close()
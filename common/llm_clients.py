@@ -0,0 +1,171 @@
+"""Process-wide registry of pooled chat model clients.
+
+Building ``ChatGroq(...)`` inside a node means every turn gets a brand new HTTP
+client: a new connection pool, a new TLS handshake and the provider SDK setup
+all over again. The registry below hands out one chat model per
+(provider, model, options) and backs it with a shared keep-alive ``httpx``
+pool, so turns after the first reuse warm connections.
+
+Usage inside a node:
+
+    from common.llm_clients import get_chat_model
+
+    def call_model(state):
+        llm = get_chat_model("groq", "llama-3.3-70b-versatile")
+        return {"messages": [llm.invoke(state["messages"])]}
+
+Async graphs should use ``get_async_chat_model`` so that the async pool is
+bound to the event loop that actually awaits it. Await ``aclose_clients()``
+before that loop shuts down (``ChatServer.aclose`` does) so its pooled
+connections are closed rather than leaked.
+"""
+import asyncio
+import threading
+import weakref
+
+import httpx
+
+DEFAULT_MAX_CONNECTIONS = 20        # hard cap on concurrent sockets per provider
+DEFAULT_MAX_KEEPALIVE = 10          # idle sockets kept warm for the next turn
+DEFAULT_KEEPALIVE_EXPIRY = 30.0     # seconds before an idle socket is dropped
+DEFAULT_TIMEOUT = 60.0
+
+_lock = threading.Lock()
+_limits = httpx.Limits(
+    max_connections=DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections=DEFAULT_MAX_KEEPALIVE,
+    keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+)
+_http_clients: dict = {}                                # provider -> httpx.Client
+_models: dict = {}                                      # key -> chat model (sync pool)
+_async_state: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # loop -> {...}
+
+
+# --- Provider factories (imported lazily so unused SDKs never load) ---
+def _build_groq(model, http_client, http_async_client, **kwargs):
+    from langchain_groq import ChatGroq
+    return ChatGroq(model=model, http_client=http_client,
+                    http_async_client=http_async_client, **kwargs)
+
+
+def _build_openai(model, http_client, http_async_client, **kwargs):
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=model, http_client=http_client,
+                      http_async_client=http_async_client, **kwargs)
+
+
+PROVIDERS = {
+    "groq": _build_groq,
+    "openai": _build_openai,
+}
+
+
+def _model_key(provider, model, kwargs):
+    return (provider, model, tuple(sorted(kwargs.items())))
+
+
+def configure_pool(max_connections=DEFAULT_MAX_CONNECTIONS,
+                   max_keepalive=DEFAULT_MAX_KEEPALIVE,
+                   keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY):
+    """Change pool limits. Existing clients are closed and rebuilt on next use."""
+    global _limits
+    close_clients()
+    with _lock:
+        _limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+
+
+def get_http_client(provider: str) -> httpx.Client:
+    """Shared keep-alive sync HTTP client for a provider."""
+    with _lock:
+        client = _http_clients.get(provider)
+        if client is None:
+            client = httpx.Client(limits=_limits, timeout=DEFAULT_TIMEOUT)
+            _http_clients[provider] = client
+        return client
+
+
+def get_async_http_client(provider: str) -> httpx.AsyncClient:
+    """Shared keep-alive async HTTP client for a provider on the running loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        state = _async_state.setdefault(loop, {"http": {}, "models": {}})
+        client = state["http"].get(provider)
+        if client is None:
+            client = httpx.AsyncClient(limits=_limits, timeout=DEFAULT_TIMEOUT)
+            state["http"][provider] = client
+        return client
+
+
+def get_chat_model(provider: str = "groq", model: str = "llama-3.3-70b-versatile", **kwargs):
+    """Return the process-wide chat model for (provider, model, kwargs).
+
+    Extra kwargs (temperature, base_url, ...) are forwarded to the provider
+    class and become part of the registry key, so they must be hashable.
+    """
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown provider '{provider}'. Known: {sorted(PROVIDERS)}")
+    key = _model_key(provider, model, kwargs)
+    llm = _models.get(key)
+    if llm is not None:
+        return llm
+    http_client = get_http_client(provider)
+    with _lock:
+        llm = _models.get(key)
+        if llm is None:
+            llm = PROVIDERS[provider](model, http_client, None, **kwargs)
+            _models[key] = llm
+        return llm
+
+
+def get_async_chat_model(provider: str = "groq", model: str = "llama-3.3-70b-versatile", **kwargs):
+    """Async twin of ``get_chat_model``; must be called from inside a running loop."""
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown provider '{provider}'. Known: {sorted(PROVIDERS)}")
+    key = _model_key(provider, model, kwargs)
+    http_async_client = get_async_http_client(provider)
+    http_client = get_http_client(provider)
+    loop = asyncio.get_running_loop()
+    with _lock:
+        models = _async_state[loop]["models"]
+        llm = models.get(key)
+        if llm is None:
+            llm = PROVIDERS[provider](model, http_client, http_async_client, **kwargs)
+            models[key] = llm
+        return llm
+
+
+async def _aclose_state(state: dict) -> None:
+    for client in state["http"].values():
+        await client.aclose()
+
+
+async def aclose_clients():
+    """Close the running loop's pooled async clients; the next ``get_async_chat_model`` rebuilds them."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        state = _async_state.pop(loop, None)
+    if state is not None:
+        await _aclose_state(state)
+
+
+def close_clients():
+    """Close every pooled sync client, and the async ones of loops that are still running.
+
+    Async clients can only be closed on their own loop: for a running loop the
+    close is scheduled there, and pools of a stopped loop are dropped with it.
+    From inside a running loop prefer ``await aclose_clients()``.
+    """
+    with _lock:
+        for client in _http_clients.values():
+            client.close()
+        _http_clients.clear()
+        _models.clear()
+        states = list(_async_state.items())
+        _async_state.clear()
+    for loop, state in states:
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(_aclose_state(state), loop)
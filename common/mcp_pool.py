@@ -0,0 +1,356 @@
+"""Long-lived, pooled MCP sessions with cached tool schemas and auto-reconnect.
+
+``MultiServerMCPClient.get_tools()`` connects to every server (for stdio:
+spawns the child process and runs the MCP handshake) just to list tools, and
+each tool call it returns opens a fresh session again. ``MCPConnectionManager``
+keeps sessions open instead:
+
+* sessions are owned by a background event loop and reused for every call.
+  MCP requests carry ids, so one session multiplexes many calls at once
+  (``max_in_flight`` per session); another session, up to ``pool_size``
+  per server, is opened only once every open one is full. ``call_many()``
+  sends a whole fan-out in one hop to that loop;
+* connections are lazy: nothing is spawned until the first tool call
+  (or ``warm()``);
+* tool schemas are cached in a JSON file keyed by the server's connection
+  config, so ``get_tools()`` needs no connection at startup. When a session
+  connects, the server's tool list is fingerprinted and compared with the
+  cache; a changed schema updates the cache and the tools;
+* a call that fails at the transport level (the stdio child died, the pipe
+  broke) reconnects that session and retries once; ``health_check()`` pings
+  every open session and reconnects the dead ones, optionally on a timer.
+
+The returned tools work from sync and async graphs alike:
+
+    manager = MCPConnectionManager({"arith": {"transport": "stdio", "command": "python3",
+                                              "args": ["arith_server.py"]}})
+    tools = manager.get_tools()
+    tool_node = ConcurrentToolNode(tools)
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from langchain_core.tools import StructuredTool, ToolException
+
+
+def _fingerprint(data) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _result_content(result):
+    texts = [block.text for block in result.content if getattr(block, "type", None) == "text"]
+    if result.isError:
+        raise ToolException("\n".join(texts) or "MCP tool error")
+    if texts:
+        return texts[0] if len(texts) == 1 else texts
+    return json.dumps(result.structuredContent) if result.structuredContent is not None else ""
+
+
+class _PooledSession:
+    """One MCP session kept open by a task on the manager loop (anyio needs enter/exit in one task)."""
+
+    def __init__(self, connection: dict, max_in_flight: int | None = None):
+        self.connection = connection
+        self.max_in_flight = max_in_flight
+        self.session = None
+        self.server_info = None
+        self.in_flight = 0   # calls routed here, including those waiting for a slot
+        self.sending = 0     # requests on the wire awaiting their response
+        self.slots = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        self.replacement = None
+        self._stop = None
+        self._task = None
+
+    async def start(self):
+        from langchain_mcp_adapters.sessions import create_session
+
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        self._stop = asyncio.Event()
+
+        async def hold():
+            try:
+                async with create_session(self.connection) as session:
+                    init = await session.initialize()
+                    self.session, self.server_info = session, init.serverInfo
+                    ready.set_result(None)
+                    await self._stop.wait()
+            except BaseException as exc:
+                if not ready.done():
+                    ready.set_exception(exc)
+            finally:
+                self.session = None
+
+        self._task = loop.create_task(hold())
+        await ready
+
+    @property
+    def full(self) -> bool:
+        return self.max_in_flight is not None and self.in_flight >= self.max_in_flight
+
+    async def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, Exception):
+                self._task.cancel()
+        self.session = None
+
+
+class MCPConnectionManager:
+    """Pooled, lazily connected MCP sessions shared by every graph in the process."""
+
+    def __init__(self, connections: dict, *, pool_size: int = 1, max_in_flight: int | None = 32,
+                 schema_cache: str | None = "mcp_schemas.json", call_timeout: float | None = 30.0,
+                 health_interval: float | None = None):
+        self.connections = connections
+        self.pool_size = pool_size
+        self.max_in_flight = max_in_flight
+        self.schema_cache = Path(schema_cache) if schema_cache else None
+        self.call_timeout = call_timeout
+        self._pools: dict[str, list[_PooledSession]] = {name: [] for name in connections}
+        self._schemas: dict[str, dict] = self._read_schema_cache()
+        self._tools: dict[str, list] = {}
+        self._stats = Counter()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True, name="mcp-sessions")
+        self._thread.start()
+        self._locks = {name: asyncio.Lock() for name in connections}
+        if health_interval:
+            asyncio.run_coroutine_threadsafe(self._health_loop(health_interval), self._loop)
+
+    # --- loop bridging ---
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _run(self, coro):
+        return self._submit(coro).result()
+
+    async def _arun(self, coro):
+        return await asyncio.wrap_future(self._submit(coro))
+
+    # --- schema cache ---
+    def _config_key(self, server: str) -> str:
+        return _fingerprint(self.connections[server])
+
+    def _read_schema_cache(self) -> dict:
+        if self.schema_cache is None or not self.schema_cache.exists():
+            return {}
+        cached = json.loads(self.schema_cache.read_text())
+        # An entry written for a different command/url/args is not this server's schema
+        return {name: entry for name, entry in cached.items()
+                if name in self.connections and entry.get("config") == self._config_key(name)}
+
+    def _write_schema_cache(self) -> None:
+        if self.schema_cache is None:
+            return
+        tmp = self.schema_cache.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._schemas, indent=2))
+        tmp.replace(self.schema_cache)
+
+    async def _refresh_schema(self, server: str, pooled: _PooledSession) -> None:
+        listed = await pooled.session.list_tools()
+        tools = [{"name": t.name, "description": t.description or "", "inputSchema": t.inputSchema}
+                 for t in listed.tools]
+        version = getattr(pooled.server_info, "version", None)
+        fingerprint = _fingerprint([version, tools])
+        cached = self._schemas.get(server)
+        if cached is not None and cached["fingerprint"] == fingerprint:
+            return
+        if cached is not None:
+            self._stats["schema_changes"] += 1
+        self._schemas[server] = {"config": self._config_key(server), "server_version": version,
+                                 "fingerprint": fingerprint, "tools": tools}
+        self._tools.pop(server, None)
+        self._write_schema_cache()
+
+    # --- sessions ---
+    async def _open(self, server: str) -> _PooledSession:
+        pooled = _PooledSession(self.connections[server], self.max_in_flight)
+        started = time.perf_counter()
+        await pooled.start()
+        self._stats["connects"] += 1
+        self._stats["connect_seconds"] += time.perf_counter() - started
+        await self._refresh_schema(server, pooled)
+        return pooled
+
+    def _pick(self, server: str) -> _PooledSession | None:
+        """Least loaded live session, unless all are full and the pool may still grow."""
+        pool = self._pools[server]
+        live = [p for p in pool if p.session is not None]
+        if not live:
+            return None
+        least = min(live, key=lambda p: p.in_flight)
+        if not least.full or len(pool) >= self.pool_size:
+            return least
+        return None
+
+    async def _acquire(self, server: str) -> _PooledSession:
+        pooled = self._pick(server)
+        if pooled is not None:
+            return pooled
+        async with self._locks[server]:
+            pooled = self._pick(server)
+            if pooled is not None:
+                return pooled
+            pool = self._pools[server]
+            pool[:] = [p for p in pool if p.session is not None]   # forget sessions that died
+            pooled = await self._open(server)
+            pool.append(pooled)
+            return pooled
+
+    async def _reconnect(self, server: str, pooled: _PooledSession) -> _PooledSession:
+        async with self._locks[server]:
+            # Every call multiplexed on a dead session fails at once; only the first reconnects
+            if pooled.replacement is not None and pooled.replacement.session is not None:
+                return pooled.replacement
+            await pooled.stop()
+            pool = self._pools[server]
+            if pooled in pool:
+                pool.remove(pooled)
+            fresh = await self._open(server)
+            pool.append(fresh)
+            pooled.replacement = fresh
+            self._stats["reconnects"] += 1
+            return fresh
+
+    async def _send(self, pooled: _PooledSession, name: str, arguments: dict):
+        if pooled.slots is not None:
+            async with pooled.slots:
+                return await self._send_now(pooled, name, arguments)
+        return await self._send_now(pooled, name, arguments)
+
+    async def _send_now(self, pooled: _PooledSession, name: str, arguments: dict):
+        pooled.sending += 1
+        self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], pooled.sending)
+        try:
+            return await pooled.session.call_tool(name, arguments)
+        finally:
+            pooled.sending -= 1
+
+    async def _call(self, server: str, name: str, arguments: dict):
+        pooled = await self._acquire(server)
+        for attempt in (1, 2):
+            pooled.in_flight += 1
+            try:
+                result = await asyncio.wait_for(self._send(pooled, name, arguments), self.call_timeout)
+            except asyncio.TimeoutError:
+                self._stats["timeouts"] += 1
+                raise
+            except Exception:
+                # Transport failure (tool errors come back as isError results, not exceptions)
+                if attempt == 2:
+                    self._stats["failures"] += 1
+                    raise
+                pooled = await self._reconnect(server, pooled)
+                continue
+            finally:
+                pooled.in_flight -= 1
+            self._stats["calls"] += 1
+            return _result_content(result)
+
+    async def _call_many(self, calls):
+        return await asyncio.gather(*(self._call(*call) for call in calls), return_exceptions=True)
+
+    async def _health(self) -> dict:
+        report = {}
+        for server, pool in self._pools.items():
+            report[server] = []
+            for pooled in list(pool):
+                try:
+                    await asyncio.wait_for(pooled.session.send_ping(), 5)
+                    report[server].append(True)
+                except Exception:
+                    self._stats["health_failures"] += 1
+                    await self._reconnect(server, pooled)
+                    report[server].append(False)
+        return report
+
+    async def _health_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self._health()
+
+    # --- public API ---
+    def call_tool(self, server: str, name: str, arguments: dict):
+        return self._run(self._call(server, name, arguments))
+
+    async def acall_tool(self, server: str, name: str, arguments: dict):
+        return await self._arun(self._call(server, name, arguments))
+
+    def call_many(self, calls: list[tuple[str, str, dict]]) -> list:
+        """Run ``(server, tool, arguments)`` calls concurrently; failures are returned, not raised."""
+        return self._run(self._call_many(calls))
+
+    async def acall_many(self, calls: list[tuple[str, str, dict]]) -> list:
+        return await self._arun(self._call_many(calls))
+
+    async def _fill(self, server: str, sessions: int):
+        async with self._locks[server]:
+            pool = self._pools[server]
+            pool[:] = [p for p in pool if p.session is not None]
+            while len(pool) < min(sessions, self.pool_size):
+                pool.append(await self._open(server))
+
+    def warm(self, server: str | None = None, wait: bool = False, sessions: int = 1):
+        """Open ``sessions`` sessions per server (capped at ``pool_size``) in the background, or wait for them."""
+        futures = [self._submit(self._fill(s, sessions)) for s in ([server] if server else self.connections)]
+        if wait:
+            for future in futures:
+                future.result()
+
+    def health_check(self) -> dict:
+        """Ping every open session, reconnecting dead ones; ``{server: [alive, ...]}``."""
+        return self._run(self._health())
+
+    def _build_tool(self, server: str, schema: dict):
+        name = schema["name"]
+
+        def call(**kwargs):
+            return self.call_tool(server, name, kwargs)
+
+        async def acall(**kwargs):
+            return await self.acall_tool(server, name, kwargs)
+
+        return StructuredTool(name=name, description=schema["description"], args_schema=schema["inputSchema"],
+                              func=call, coroutine=acall, handle_tool_error=True,
+                              metadata={"mcp_server": server})
+
+    def get_tools(self, server: str | None = None) -> list:
+        """Tools for one or all servers; connects only for servers with no cached schema."""
+        tools = []
+        for name in ([server] if server else self.connections):
+            if name not in self._schemas:
+                self._run(self._acquire(name))
+            if name not in self._tools:
+                self._tools[name] = [self._build_tool(name, s) for s in self._schemas[name]["tools"]]
+            tools.extend(self._tools[name])
+        return tools
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        stats["sessions"] = {name: sum(p.session is not None for p in pool) for name, pool in self._pools.items()}
+        return stats
+
+    def close(self):
+        async def _close():
+            for pool in self._pools.values():
+                for pooled in pool:
+                    await pooled.stop()
+                pool.clear()
+        self._run(_close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
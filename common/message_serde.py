@@ -0,0 +1,177 @@
+"""Compact msgpack checkpoint serializer for chat message lists.
+
+LangGraph's ``JsonPlusSerializer`` stores every ``HumanMessage``/``AIMessage``
+as a generic pydantic dump: the module path, the class name, every field
+including empty defaults, and the full ``response_metadata``. Chat
+checkpoints are mostly message lists, and the model name, fingerprint and
+finish reason repeat on every AI message. ``CompactSerializer`` is a drop-in
+``serde`` that:
+
+* encodes the standard message classes as a small msgpack ext,
+  ``[kind, content, non-default fields]``, rebuilt without re-validation
+  (the values were validated when the message was made);
+* interns each message's string/flag metadata (``model_name``,
+  ``system_fingerprint``, ``finish_reason``, ...) into a per-payload table,
+  so a 100-turn thread stores it once; counters such as ``token_usage``
+  stay inline;
+* optionally drops ``response_metadata`` keys nobody reads
+  (``drop_metadata={"logprobs"}``); lossless by default;
+* compresses payloads of ``compress_threshold`` bytes or more (zstd if
+  ``zstandard`` is installed, else zlib).
+
+Everything else (``Send``, pydantic state, datetimes, ...) goes through
+LangGraph's own msgpack hooks, and rows in any format ``JsonPlusSerializer``
+reads (``msgpack``, ``json``, ...) still load, so existing checkpoints stay
+valid after switching:
+
+    checkpointer = MemorySaver(serde=CompactSerializer())
+    checkpointer = SqliteSaver(conn, serde=CompactSerializer())
+    # DeltaSqliteSaver compresses whole rows itself
+    checkpointer = DeltaSqliteSaver(conn, serde=CompactSerializer(compress_threshold=None))
+"""
+import struct
+import zlib
+
+import ormsgpack
+from langchain_core.messages import (AIMessage, AIMessageChunk, ChatMessage, FunctionMessage, HumanMessage,
+                                     RemoveMessage, SystemMessage, ToolMessage)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer, _msgpack_default
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+TYPE = "compact"
+EXT_MESSAGE = 64   # LangGraph's own ext codes are 0-7
+_TABLE_LEN = struct.Struct("<I")
+_OPTIONS = (ormsgpack.OPT_NON_STR_KEYS | ormsgpack.OPT_PASSTHROUGH_DATACLASS | ormsgpack.OPT_PASSTHROUGH_DATETIME
+            | ormsgpack.OPT_PASSTHROUGH_ENUM | ormsgpack.OPT_PASSTHROUGH_UUID | ormsgpack.OPT_REPLACE_SURROGATES)
+
+# Append only: the position is the kind stored in every row
+MESSAGE_TYPES = (HumanMessage, AIMessage, SystemMessage, ToolMessage, AIMessageChunk, ChatMessage,
+                 FunctionMessage, RemoveMessage)
+_KINDS = {cls: kind for kind, cls in enumerate(MESSAGE_TYPES)}
+_DEFAULTS = {cls: {name: field.get_default(call_default_factory=True)
+                   for name, field in cls.model_fields.items() if not field.is_required()}
+             for cls in MESSAGE_TYPES}
+_MISSING = object()
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _construct(cls, content, fields: dict):
+    """What ``model_construct`` does, minus its per-call inspection of every default factory."""
+    values = {"content": content}
+    for name, default in _DEFAULTS[cls].items():
+        values[name] = default.copy() if isinstance(default, (dict, list)) else default
+    values.update(fields)
+    message = cls.__new__(cls)
+    object.__setattr__(message, "__dict__", values)
+    object.__setattr__(message, "__pydantic_fields_set__", {"content", *fields})
+    object.__setattr__(message, "__pydantic_extra__", {})
+    object.__setattr__(message, "__pydantic_private__", None)
+    return message
+
+
+class _Encoder:
+    """One payload's ``default`` hook and its interned metadata table."""
+
+    def __init__(self, drop_metadata: frozenset):
+        self.drop_metadata = drop_metadata
+        self.table: list[dict] = []
+        self._index: dict[tuple, int] = {}
+
+    def default(self, obj):
+        kind = _KINDS.get(type(obj))
+        if kind is None or obj.__pydantic_extra__:
+            return _msgpack_default(obj)
+        defaults = _DEFAULTS[type(obj)]
+        fields = {name: value for name, value in obj.__dict__.items()
+                  if name != "content" and defaults.get(name, _MISSING) != value}
+        metadata = fields.get("response_metadata")
+        if metadata:
+            fields["response_metadata"] = self._split(metadata)
+        return ormsgpack.Ext(EXT_MESSAGE, ormsgpack.packb([kind, obj.content, fields], default=self.default,
+                                                          option=_OPTIONS))
+
+    def _split(self, metadata: dict) -> list:
+        """``[table index or -1, inline rest]``: scalar string/flag entries go to the shared table."""
+        static, inline = [], {}
+        for key, value in metadata.items():
+            if key in self.drop_metadata:
+                continue
+            if value is None or isinstance(value, (str, bool)):
+                static.append((key, value))
+            else:
+                inline[key] = value
+        if not static:
+            return [-1, inline]
+        key = tuple(static)
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.table)
+            self.table.append(dict(static))
+        return [index, inline]
+
+
+class CompactSerializer(JsonPlusSerializer):
+    """``JsonPlusSerializer`` that writes chat messages compactly; reads both formats."""
+
+    def __init__(self, *, compress_threshold: int | None = 4096, compression: str | None = None,
+                 drop_metadata=(), **kwargs):
+        super().__init__(**kwargs)
+        if compression is None:
+            compression = "zstd" if zstandard is not None else "zlib"
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("compression='zstd' needs the 'zstandard' package")
+        self.compress_threshold = compress_threshold
+        self.compression = compression
+        self.drop_metadata = frozenset(drop_metadata)
+
+    def dumps_typed(self, obj):
+        if obj is None or isinstance(obj, (bytes, bytearray)):
+            return super().dumps_typed(obj)
+        encoder = _Encoder(self.drop_metadata)
+        try:
+            body = ormsgpack.packb(obj, default=encoder.default, option=_OPTIONS)
+        except ormsgpack.MsgpackEncodeError:
+            return super().dumps_typed(obj)   # pickle fallback, if enabled
+        table = ormsgpack.packb(encoder.table) if encoder.table else b""
+        payload = _TABLE_LEN.pack(len(table)) + table + body
+        if self.compress_threshold is not None and len(payload) >= self.compress_threshold:
+            return f"{TYPE}+{self.compression}", _compress(self.compression, payload)
+        return TYPE, payload
+
+    def loads_typed(self, data):
+        type_, blob = data
+        if type_ != TYPE and not type_.startswith(TYPE + "+"):
+            return super().loads_typed(data)   # rows written by JsonPlusSerializer
+        if type_ != TYPE:
+            blob = _decompress(type_.split("+", 1)[1], blob)
+        view = memoryview(blob)
+        (table_len,) = _TABLE_LEN.unpack_from(view)
+        table = ormsgpack.unpackb(view[4:4 + table_len]) if table_len else []
+        fallback = self._unpack_ext_hook
+
+        def ext_hook(code, payload):
+            if code != EXT_MESSAGE:
+                return fallback(code, payload)
+            kind, content, fields = ormsgpack.unpackb(payload, ext_hook=ext_hook, option=ormsgpack.OPT_NON_STR_KEYS)
+            metadata = fields.get("response_metadata")
+            if metadata is not None:
+                index, inline = metadata
+                fields["response_metadata"] = {**table[index], **inline} if index >= 0 else inline
+            return _construct(MESSAGE_TYPES[kind], content, fields)
+
+        return ormsgpack.unpackb(view[4 + table_len:], ext_hook=ext_hook, option=ormsgpack.OPT_NON_STR_KEYS)
@@ -0,0 +1,186 @@
+"""Persisted, content-hashed FAISS index for the RAG notebook.
+
+``rag_app.ipynb`` loads, splits and embeds the whole PDF on every start.
+``IndexStore`` keeps the FAISS index and docstore on disk instead:
+
+* the store directory is keyed by a hash of the splitter parameters, the
+  embedding model and the index build parameters (``IndexConfig``), so
+  changing any of them starts a fresh index;
+* a manifest records the sha256 of every source file and the ids of its
+  chunks, so only new or changed files are re-embedded (chunks of changed or
+  removed files are deleted from a flat index; IVF and HNSW are rebuilt);
+* when nothing changed the index is read memory-mapped, which makes startup
+  near-instant regardless of index size;
+* a BM25 inverted index over the same chunks is rebuilt whenever the corpus
+  changes and saved alongside (``bm25_index``), for ``HybridRetriever``;
+* the docstore is saved as JSON and the BM25 index as plain arrays, so
+  opening a store never unpickles anything. Stores written with pickles
+  by earlier versions are rebuilt once instead of loaded.
+
+    store = IndexStore("rag_index", embedding_model, chunk_size=1000, chunk_overlap=200)
+    vectorstore = store.load_or_build(["attention_is_all_you_need.pdf"])
+    retriever = vectorstore.as_retriever()
+"""
+import hashlib
+import json
+from pathlib import Path
+
+from common.ann_index import IndexConfig
+from common.hybrid_retrieval import BM25Index
+from common.rag_ingest import IngestPipeline, iter_pdf_pages
+
+MANIFEST = "manifest.json"
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "docstore.json"
+BM25_FILE = "bm25.npz"
+LEGACY_FILES = ("index.pkl", "bm25.pkl")   # pickles of earlier versions; never loaded
+
+
+def file_sha256(path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def config_key(embedding_model: str, index_params: dict | None = None, **splitter_params) -> str:
+    """Short hash of everything that changes the saved index of an unchanged file."""
+    payload = json.dumps({"embedding_model": embedding_model, "splitter": splitter_params,
+                          "index": index_params or {"type": "flat"}}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class IndexStore:
+    """Directory-backed FAISS index that re-embeds only the sources that changed."""
+
+    def __init__(self, directory, embedding, *, embedding_model: str | None = None,
+                 chunk_size: int = 1000, chunk_overlap: int = 200, loader=iter_pdf_pages,
+                 workers: int | None = 1, batch_size: int = 64, index: IndexConfig = IndexConfig(),
+                 mmap: bool = True):
+        self.embedding = embedding
+        self.embedding_model = embedding_model or getattr(embedding, "model_name", None) \
+            or getattr(embedding, "model", None)
+        if not self.embedding_model:
+            raise ValueError("Pass embedding_model= so the index can be keyed by it")
+        self.splitter_params = {"chunk_size": chunk_size, "chunk_overlap": chunk_overlap}
+        # Changed sources go through the streaming pipeline; pass workers=None
+        # (all cores) when (re)building a large corpus.
+        self.pipeline = IngestPipeline(embedding, chunk_size=chunk_size, chunk_overlap=chunk_overlap,
+                                       workers=workers, batch_size=batch_size, index=index, loader=loader)
+        self.index = index
+        self.mmap = mmap
+        self.key = config_key(self.embedding_model, index.build_params(), **self.splitter_params)
+        self.path = Path(directory) / self.key
+        self.last_update = {"reused": [], "embedded": [], "removed": [], "chunks_embedded": 0}
+
+    # --- manifest ---
+    def _read_manifest(self) -> dict:
+        path = self.path / MANIFEST
+        if not all(p.exists() for p in (path, self.path / INDEX_FILE, self.path / DOCSTORE_FILE)):
+            return {}   # nothing saved yet, or a pickled store from an earlier version: rebuild
+        return json.loads(path.read_text())["sources"]
+
+    def _write_manifest(self, sources: dict) -> None:
+        manifest = {"embedding_model": self.embedding_model, "splitter": self.splitter_params,
+                    "index": self.index.build_params(), "sources": sources}
+        tmp = self.path / (MANIFEST + ".tmp")
+        tmp.write_text(json.dumps(manifest, indent=2))
+        tmp.replace(self.path / MANIFEST)   # the manifest only ever describes a saved index
+
+    # --- index ---
+    def _open(self, writable: bool):
+        import faiss
+        from langchain_community.vectorstores import FAISS
+
+        index_path = str(self.path / INDEX_FILE)
+        index = None
+        if self.mmap and not writable:
+            try:
+                index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            except RuntimeError:   # index type without mmap support in this faiss build
+                index = None
+        if index is None:
+            index = faiss.read_index(index_path)
+        self.index.apply_search_params(index)
+        docstore, index_to_docstore_id = self._read_docstore()
+        return FAISS(self.embedding, index, docstore, index_to_docstore_id)
+
+    def _read_docstore(self):
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        from langchain_core.documents import Document
+
+        data = json.loads((self.path / DOCSTORE_FILE).read_text())
+        docs = {doc_id: Document(id=doc_id, page_content=doc["page_content"], metadata=doc["metadata"])
+                for doc_id, doc in data["docs"].items()}
+        return InMemoryDocstore(docs), {position: doc_id for position, doc_id in data["ids"]}
+
+    def _save(self, vectorstore) -> None:
+        import faiss
+
+        faiss.write_index(vectorstore.index, str(self.path / INDEX_FILE))
+        ids = sorted(vectorstore.index_to_docstore_id.items())
+        docs = {}
+        for _, doc_id in ids:
+            doc = vectorstore.docstore.search(doc_id)
+            docs[doc_id] = {"page_content": doc.page_content, "metadata": doc.metadata}
+        tmp = self.path / (DOCSTORE_FILE + ".tmp")
+        # default=str: loader metadata is meant to be JSON (page numbers, paths, dates as text)
+        tmp.write_text(json.dumps({"ids": ids, "docs": docs}, default=str))
+        tmp.replace(self.path / DOCSTORE_FILE)
+        for name in LEGACY_FILES:
+            (self.path / name).unlink(missing_ok=True)
+
+    def load_or_build(self, sources):
+        """Vector store covering exactly ``sources``, embedding only what changed since last time."""
+        current = {str(Path(p)): file_sha256(p) for p in sources}
+        manifest = self._read_manifest()
+        changed = [p for p, digest in current.items() if manifest.get(p, {}).get("sha256") != digest]
+        removed = [p for p in manifest if p not in current or p in changed]
+        self.last_update = {
+            "reused": [p for p in current if p not in changed],
+            "embedded": changed,
+            "removed": [p for p in manifest if p not in current],
+            "chunks_embedded": 0,
+        }
+        if manifest and not changed and not removed:
+            return self._open(writable=False)
+
+        stale = [cid for p in removed for cid in manifest[p]["ids"]]
+        if stale and not self.index.supports_removal:
+            # Only flat indexes delete cleanly (see IndexConfig.supports_removal): rebuild from scratch
+            manifest, changed = {}, list(current)
+            self.last_update["reused"], self.last_update["embedded"] = [], changed
+        vectorstore = self._open(writable=True) if manifest else None
+        if stale and vectorstore is not None:
+            vectorstore.delete(stale)
+        sources_out = {p: manifest[p] for p in current if p not in changed}
+        if changed:
+            # Ids derive from path + content hash, so they never collide with stale chunks
+            prefixes = {p: hashlib.sha256(f"{p}\0{current[p]}".encode()).hexdigest()[:16] for p in changed}
+            vectorstore, ids = self.pipeline.run(changed, vectorstore, id_prefixes=prefixes)
+            for path in changed:
+                sources_out[path] = {"sha256": current[path], "ids": ids[path]}
+            self.last_update["chunks_embedded"] = self.pipeline.stats.chunks
+        if vectorstore is None:
+            raise ValueError("No chunks to index: every source was empty")
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._save(vectorstore)
+        self._save_bm25(BM25Index.from_vectorstore(vectorstore))
+        self._write_manifest(sources_out)
+        return vectorstore
+
+    def _save_bm25(self, bm25: BM25Index) -> None:
+        bm25.save(self.path / BM25_FILE)
+
+    def bm25_index(self, vectorstore) -> BM25Index:
+        """The BM25 index saved with the current build (built from ``vectorstore`` if missing)."""
+        path = self.path / BM25_FILE
+        if path.exists():
+            bm25 = BM25Index.load(path)
+            if len(bm25.doc_ids) == len(vectorstore.index_to_docstore_id):
+                return bm25
+        bm25 = BM25Index.from_vectorstore(vectorstore)
+        self._save_bm25(bm25)
+        return bm25
@@ -0,0 +1,225 @@
+"""Streaming, parallel ingestion of PDF corpora into a FAISS vector store.
+
+``loader.load()`` + ``split_documents`` + ``FAISS.from_documents`` holds the
+whole corpus (pages, chunks and vectors) in memory and chunks on one core.
+``IngestPipeline`` streams it instead:
+
+1. pages are read lazily, one PDF at a time (``iter_pdf_pages``);
+2. groups of pages are chunked in a process pool;
+3. chunks are embedded in fixed-size batches in the calling thread;
+4. each batch is appended to the index as soon as it is embedded (for a
+   trained index type such as IVF, once the training sample is collected).
+
+At most ``max_pending`` page groups are in flight: the pool only gets new
+pages once the embedder has caught up, so the pipeline's own memory depends
+on its settings, not on the corpus size (the in-memory index itself still
+grows by one vector + chunk text per chunk).
+
+    pipeline = IngestPipeline(embedding_model, chunk_size=1000, chunk_overlap=200, workers=4)
+    vectorstore, ids = pipeline.run(pdf_paths)
+    print(pipeline.stats)
+"""
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from common.ann_index import IndexConfig
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_splitter = None   # per worker process, built by _init_worker
+
+
+class IngestStats(NamedTuple):
+    files: int
+    pages: int
+    chunks: int
+    seconds: float
+    docs_per_sec: float
+    pages_per_sec: float
+    chunks_per_sec: float
+    peak_rss_mb: float | None             # this process
+    workers_peak_rss_mb: float | None     # sum of each chunking worker's peak; None when chunking in-process
+
+    def __str__(self):
+        rss = f"{self.peak_rss_mb:.0f}MB" if self.peak_rss_mb is not None else "n/a"
+        if self.workers_peak_rss_mb is not None:
+            rss += f" + {self.workers_peak_rss_mb:.0f}MB in workers"
+        return (f"{self.files} files, {self.pages} pages, {self.chunks} chunks in {self.seconds:.1f}s "
+                f"({self.docs_per_sec:.1f} docs/s, {self.pages_per_sec:.1f} pages/s, "
+                f"{self.chunks_per_sec:.1f} chunks/s), peak RSS {rss}")
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process so far."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024   # bytes on macOS, KiB on Linux
+
+
+def iter_pdf_pages(path):
+    """Yield the pages of one PDF as Documents without loading the whole file's text."""
+    from langchain_community.document_loaders import PyPDFLoader
+    yield from PyPDFLoader(str(path)).lazy_load()
+
+
+def _init_worker(chunk_size: int, chunk_overlap: int):
+    global _splitter
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    _splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def _split_pages(pages: list[tuple[str, dict]]) -> list[list[tuple[str, dict]]]:
+    """Chunks of each page, as plain (text, metadata) pairs to keep pickling cheap."""
+    out = []
+    for text, metadata in pages:
+        out.append([(chunk, metadata) for chunk in _splitter.split_text(text)])
+    return out
+
+
+def _split_pages_in_worker(pages):
+    """``_split_pages`` in a pool worker, plus the worker's pid and peak RSS so far."""
+    return _split_pages(pages), os.getpid(), peak_rss_mb()
+
+
+class IngestPipeline:
+    """Lazy page loading -> pooled chunking -> batched embedding -> incremental index appends."""
+
+    def __init__(self, embedding, *, chunk_size: int = 1000, chunk_overlap: int = 200,
+                 workers: int | None = None, pages_per_task: int = 8, max_pending: int | None = None,
+                 batch_size: int = 64, index: IndexConfig = IndexConfig(), loader=iter_pdf_pages):
+        self.embedding = embedding
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.pages_per_task = pages_per_task
+        self.max_pending = max_pending or 2 * max(self.workers, 1)
+        self.batch_size = batch_size
+        self.index = index
+        self.loader = loader
+        self.stats: IngestStats | None = None
+        self._pages = 0
+        self._held = []   # embedded batches waiting for enough vectors to train the index
+        self._worker_rss = {}   # pool worker pid -> peak RSS (MB) last reported
+
+    def _page_groups(self, sources):
+        """(source, [(page_no, text, metadata), ...]) groups, read lazily file by file."""
+        for source in sources:
+            group = []
+            for page_no, page in enumerate(self.loader(source)):
+                self._pages += 1
+                group.append((page_no, page.page_content, page.metadata))
+                if len(group) == self.pages_per_task:
+                    yield source, group
+                    group = []
+            if group:
+                yield source, group
+
+    def _chunked(self, sources):
+        """Yield (source, page_no, chunk_no, text, metadata) in corpus order, chunking ahead in the pool."""
+        groups = self._page_groups(sources)
+        if self.workers <= 1:   # in-process: no pool start-up for small jobs
+            _init_worker(self.chunk_size, self.chunk_overlap)
+            for source, group in groups:
+                for (page_no, _, _), chunks in zip(group, _split_pages([(t, m) for _, t, m in group])):
+                    for chunk_no, (text, metadata) in enumerate(chunks):
+                        yield source, page_no, chunk_no, text, metadata
+            return
+
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                 initargs=(self.chunk_size, self.chunk_overlap)) as pool:
+            pending = deque()
+            exhausted = False
+            while pending or not exhausted:
+                # Backpressure: only read more pages while fewer than max_pending groups are in flight
+                while not exhausted and len(pending) < self.max_pending:
+                    try:
+                        source, group = next(groups)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = pool.submit(_split_pages_in_worker, [(t, m) for _, t, m in group])
+                    pending.append((source, [page_no for page_no, _, _ in group], future))
+                if not pending:
+                    break
+                source, page_nos, future = pending.popleft()
+                chunked, pid, rss = future.result()
+                if rss is not None:
+                    self._worker_rss[pid] = max(rss, self._worker_rss.get(pid, 0.0))
+                for page_no, chunks in zip(page_nos, chunked):
+                    for chunk_no, (text, metadata) in enumerate(chunks):
+                        yield source, page_no, chunk_no, text, metadata
+
+    def _append(self, vectorstore, batch):
+        texts = [text for _, text, _ in batch]
+        embedded = (list(zip(texts, self.embedding.embed_documents(texts))),
+                    [metadata for _, _, metadata in batch],
+                    [chunk_id for chunk_id, _, _ in batch])
+        if vectorstore is not None:
+            vectorstore.add_embeddings(embedded[0], metadatas=embedded[1], ids=embedded[2])
+            return vectorstore
+        # Trained index types (IVF) need a sample of vectors before the index exists
+        self._held.append(embedded)
+        if sum(len(ids) for _, _, ids in self._held) < self.index.train_size:
+            return None
+        return self._create()
+
+    def _create(self):
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        from langchain_community.vectorstores import FAISS
+
+        vectors = np.array([v for text_embeddings, _, _ in self._held for _, v in text_embeddings], dtype=np.float32)
+        vectorstore = FAISS(self.embedding, self.index.build(vectors), InMemoryDocstore(), {})
+        for text_embeddings, metadatas, ids in self._held:
+            vectorstore.add_embeddings(text_embeddings, metadatas=metadatas, ids=ids)
+        self._held = []
+        return vectorstore
+
+    def run(self, sources, vectorstore=None, id_prefixes: dict | None = None):
+        """Ingest ``sources`` into ``vectorstore`` (created on the first batch if None).
+
+        Chunk ids are ``"{prefix}-{page}-{chunk}"``; ``id_prefixes`` maps a
+        source to its prefix (default: its position in ``sources``).
+        Returns ``(vectorstore, {source: [chunk ids]})``.
+        """
+        sources = [str(s) for s in sources]
+        if id_prefixes is None:
+            id_prefixes = {source: str(i) for i, source in enumerate(sources)}
+        ids_by_source = {source: [] for source in sources}
+        self._pages = chunks = 0
+        self._held = []
+        self._worker_rss = {}
+        start = time.perf_counter()
+        batch = []
+        for source, page_no, chunk_no, text, metadata in self._chunked(sources):
+            chunk_id = f"{id_prefixes[source]}-{page_no}-{chunk_no}"
+            ids_by_source[source].append(chunk_id)
+            batch.append((chunk_id, text, metadata))
+            if len(batch) == self.batch_size:
+                vectorstore = self._append(vectorstore, batch)
+                chunks += len(batch)
+                batch = []
+        if batch:
+            vectorstore = self._append(vectorstore, batch)
+            chunks += len(batch)
+        if self._held:   # corpus smaller than the training sample
+            vectorstore = self._create()
+        elapsed = time.perf_counter() - start
+        self.stats = IngestStats(
+            files=len(sources), pages=self._pages, chunks=chunks, seconds=elapsed,
+            docs_per_sec=len(sources) / elapsed if elapsed else 0.0,
+            pages_per_sec=self._pages / elapsed if elapsed else 0.0,
+            chunks_per_sec=chunks / elapsed if elapsed else 0.0,
+            peak_rss_mb=peak_rss_mb(),
+            workers_peak_rss_mb=sum(self._worker_rss.values()) if self._worker_rss else None,
+        )
+        return vectorstore, ids_by_source
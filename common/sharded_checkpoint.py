@@ -0,0 +1,232 @@
+"""Checkpointer that spreads threads over several SQLite files by consistent hashing.
+
+SQLite has one writer per database file, so with every conversation in
+``chatbot.db`` write throughput stops at one commit at a time no matter how
+many processes serve the app. ``ShardedSqliteSaver`` routes each
+``thread_id`` to one of N files through a hash ring (``vnodes`` points per
+shard), so writes to different threads mostly hit different files and commit
+in parallel. Per-thread calls (``get_tuple``, ``put``, ``put_writes``,
+``list`` with a thread, ``get_state_history``, ``delete_thread``) go to the
+owning shard. ``list(None)`` and ``list_threads`` merge every shard in order.
+
+    checkpointer = ShardedSqliteSaver([f"chatbot-{i}.db" for i in range(4)])
+    page = checkpointer.list_threads(limit=20)   # newest threads across all shards
+
+Each shard is a ``CatalogSqliteSaver`` in WAL mode unless ``factory`` builds
+something else (any saver from ``common``, e.g. ``DeltaSqliteSaver``).
+Shards are named by file name, so the same files in another directory
+route the same way.
+
+``rebalance(paths)`` changes the shard set. Only threads whose owner
+changes move (about 1/N of them when one shard is added). Every table with
+a ``thread_id`` column moves with them (checkpoints, writes, catalog,
+message and interrupt indexes), copied as raw rows. Run it while no graph
+is writing. A copy is committed before the source rows are deleted, so an
+interrupted rebalance leaves duplicates, which the next rebalance resolves,
+and never loses rows.
+"""
+import bisect
+import hashlib
+import heapq
+import itertools
+import os
+import sqlite3
+import time
+from typing import NamedTuple
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+from common.thread_catalog import CatalogSqliteSaver, ThreadPage
+
+
+def connect(db_path: str, synchronous: str = "NORMAL") -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={synchronous}")   # FULL: fsync on every commit
+    conn.execute("PRAGMA busy_timeout=30000")
+    return conn
+
+
+def default_factory(db_path: str):
+    return CatalogSqliteSaver(connect(db_path))
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hashing of keys onto named nodes, ``vnodes`` ring points per node."""
+
+    def __init__(self, nodes, vnodes: int = 64):
+        points = sorted((_hash(f"{node}#{i}"), node) for node in nodes for i in range(vnodes))
+        self._hashes = [h for h, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key: str) -> str:
+        index = bisect.bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[index]
+
+
+class RebalanceReport(NamedTuple):
+    threads_total: int
+    threads_moved: int
+    rows_moved: int
+    seconds: float
+
+
+class ShardedSqliteSaver(BaseCheckpointSaver):
+    """Routes every thread to one of several SQLite savers; lists merge across all of them."""
+
+    def __init__(self, paths, *, factory=default_factory, vnodes: int = 64, serde=None):
+        self.factory = factory
+        self.vnodes = vnodes
+        self.shards = {path: factory(path) for path in paths}
+        self._build_ring()
+        super().__init__(serde=serde or next(iter(self.shards.values())).serde)
+
+    def _build_ring(self):
+        names = {os.path.basename(path): path for path in self.shards}
+        if len(names) != len(self.shards):
+            raise ValueError("shard files need distinct file names; the ring is keyed by name")
+        self._paths_by_name = names
+        self.ring = HashRing(names, self.vnodes)
+
+    def shard_path(self, thread_id) -> str:
+        return self._paths_by_name[self.ring.node_for(str(thread_id))]
+
+    def shard_for(self, thread_id):
+        return self.shards[self.shard_path(thread_id)]
+
+    def _route(self, config):
+        return self.shard_for(config["configurable"]["thread_id"])
+
+    # --- BaseCheckpointSaver ---
+    def get_tuple(self, config):
+        return self._route(config).get_tuple(config)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        if config is not None and "thread_id" in config.get("configurable", {}):
+            yield from self._route(config).list(config, filter=filter, before=before, limit=limit)
+            return
+        streams = [shard.list(config, filter=filter, before=before, limit=limit) for shard in self.shards.values()]
+        merged = heapq.merge(*streams, key=lambda t: t.config["configurable"]["checkpoint_id"], reverse=True)
+        yield from itertools.islice(merged, limit)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        return self._route(config).put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        return self._route(config).put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id):
+        self.shard_for(thread_id).delete_thread(thread_id)
+
+    def get_delta_channel_history(self, *, config, channels):
+        return self._route(config).get_delta_channel_history(config=config, channels=channels)
+
+    def get_next_version(self, current, channel):
+        return next(iter(self.shards.values())).get_next_version(current, channel)
+
+    # --- catalog (CatalogSqliteSaver shards) ---
+    def list_threads(self, limit: int = 20, cursor: tuple | None = None,
+                     order_by: str = "updated_at", descending: bool = True) -> ThreadPage:
+        """One page of threads across every shard, in the order ``CatalogSqliteSaver.list_threads`` uses."""
+        threads = []
+        for shard in self.shards.values():
+            threads += shard.list_threads(limit, cursor, order_by, descending).threads
+        threads.sort(key=lambda t: (getattr(t, order_by), t.thread_id), reverse=descending)
+        next_cursor = None
+        if len(threads) > limit:
+            threads = threads[:limit]
+            next_cursor = (getattr(threads[-1], order_by), threads[-1].thread_id)
+        return ThreadPage(threads, next_cursor)
+
+    def get_thread(self, thread_id):
+        return self.shard_for(thread_id).get_thread(thread_id)
+
+    def get_messages_page(self, thread_id, limit: int = 20, before: int | None = None):
+        return self.shard_for(thread_id).get_messages_page(thread_id, limit=limit, before=before)
+
+    def rebuild_catalog(self) -> int:
+        return sum(shard.rebuild_catalog() for shard in self.shards.values())
+
+    # --- shard set changes ---
+    def rebalance(self, paths) -> RebalanceReport:
+        """Switch to the shard files ``paths``, moving threads whose owner changes."""
+        started = time.perf_counter()
+        old = self.shards
+        self.shards = {path: old.get(path) or self.factory(path) for path in paths}
+        for shard in self.shards.values():
+            shard.setup()   # tables must exist before rows are copied in
+        self._build_ring()
+        total = moved = rows = 0
+        for source in old:
+            threads = _thread_ids(source)
+            total += len(threads)
+            targets = {}
+            for thread_id in threads:
+                target = self.shard_path(thread_id)
+                if target != source:
+                    targets.setdefault(target, []).append(thread_id)
+            for target, thread_ids in targets.items():
+                rows += _move_threads(source, target, thread_ids)
+                moved += len(thread_ids)
+        for path, shard in old.items():
+            if path not in self.shards:
+                _close(shard)
+        return RebalanceReport(total, moved, rows, time.perf_counter() - started)
+
+    def close(self):
+        for shard in self.shards.values():
+            _close(shard)
+
+
+def _close(shard):
+    if hasattr(shard, "close"):
+        shard.close()
+    else:
+        shard.conn.close()
+
+
+def _thread_ids(db_path: str) -> list[str]:
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        return [row[0] for row in conn.execute(
+            "SELECT thread_id FROM checkpoints UNION SELECT thread_id FROM writes")]
+    finally:
+        conn.close()
+
+
+def _move_threads(source: str, target: str, thread_ids: list[str]) -> int:
+    """Copy every ``thread_id`` row of ``thread_ids`` from ``source`` into ``target``, then delete them."""
+    conn = sqlite3.connect(source, timeout=30, isolation_level=None)
+    try:
+        conn.execute("ATTACH DATABASE ? AS dst", (target,))
+        conn.execute("CREATE TEMP TABLE moving (thread_id TEXT PRIMARY KEY)")
+        conn.executemany("INSERT INTO temp.moving VALUES (?)", [(t,) for t in thread_ids])
+        tables = []
+        for (table,) in conn.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'").fetchall():
+            columns = conn.execute(f'PRAGMA main.table_info("{table}")').fetchall()
+            target_columns = {c[1] for c in conn.execute(f'PRAGMA dst.table_info("{table}")')}
+            if "thread_id" not in {c[1] for c in columns} or not target_columns:
+                continue
+            # A surrogate INTEGER PRIMARY KEY would collide with the target's own rows; let it renumber
+            keys = [c for c in columns if c[5]]
+            shared = [f'"{c[1]}"' for c in columns if c[1] in target_columns
+                      and not (len(keys) == 1 and c[5] and c[2].upper() == "INTEGER")]
+            tables.append((table, ", ".join(shared)))
+        rows = 0
+        conn.execute("BEGIN IMMEDIATE")
+        for table, shared in tables:
+            rows += conn.execute(
+                f'INSERT OR REPLACE INTO dst."{table}" ({shared}) SELECT {shared} FROM main."{table}" '
+                "WHERE thread_id IN (SELECT thread_id FROM temp.moving)").rowcount
+        conn.execute("COMMIT")
+        conn.execute("BEGIN IMMEDIATE")
+        for table, _ in tables:
+            conn.execute(f'DELETE FROM main."{table}" WHERE thread_id IN (SELECT thread_id FROM temp.moving)')
+        conn.execute("COMMIT")
+        return rows
+    finally:
+        conn.close()
@@ -0,0 +1,299 @@
+"""Opt-in speculative execution of conditional branches.
+
+With ``add_conditional_edges(router, path)`` the branch node cannot start
+until the router node has finished, so a router that calls a model puts two
+model latencies back to back. ``add_speculative_conditional_edges`` is a
+drop-in for that call: while the router node runs, the branch nodes start
+in a thread pool on the state the router saw; once ``path`` picks the
+winner, the winner's node takes the speculative result (waiting for it if
+it is still running) and the losers are cancelled, or if already running,
+their results are dropped. Nothing a losing branch returns is ever written
+to the graph state, since only the winner's node returns an update.
+
+    graph.add_node("find_sentiment", find_sentiment)
+    ...
+    spec = add_speculative_conditional_edges(graph, "find_sentiment", check_sentiment)
+    workflow = graph.compile()
+    spec.stats()   # per edge: used / discarded / invalidated, seconds saved vs wasted
+
+A speculative result is only used if every state key the branch read still
+has the value it saw, so a branch that reads what the router writes (e.g.
+``state["diagnosis"]`` set by the router) is re-run normally. Branch nodes
+should be plain functions of the state (no ``interrupt``, no stream writer);
+their callbacks are detached, so a speculated branch does not stream tokens.
+Only dict (``TypedDict``) states are speculated; other state types run as usual.
+"""
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+from langchain_core.runnables import RunnableLambda
+from langgraph.types import Send
+
+_MISSING = object()
+
+
+class _ReadRecorder(dict):
+    """State copy handed to a speculative branch; remembers which keys it looked at."""
+
+    def __init__(self, state):
+        super().__init__(state)
+        self.reads = {}
+        self.read_all = False
+
+    def __getitem__(self, key):
+        self.reads.setdefault(key, dict.get(self, key, _MISSING))
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.reads.setdefault(key, dict.get(self, key, _MISSING))
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self.reads.setdefault(key, dict.get(self, key, _MISSING))
+        return super().__contains__(key)
+
+    def _all(self):
+        self.read_all = True
+        return self
+
+    def keys(self):
+        return dict.keys(self._all())
+
+    def values(self):
+        return dict.values(self._all())
+
+    def items(self):
+        return dict.items(self._all())
+
+    def __iter__(self):
+        return dict.__iter__(self._all())
+
+    def copy(self):
+        return dict(self._all())
+
+
+def _same(a, b) -> bool:
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except Exception:   # e.g. arrays without a truth value
+        return False
+
+
+class _Speculation:
+    __slots__ = ("node", "future", "state", "started", "duration", "outcome")
+
+    def __init__(self, node):
+        self.node = node
+        self.future = None
+        self.state = None
+        self.started = time.perf_counter()
+        self.duration = None
+        self.outcome = None   # "used", "discarded", "cancelled", "invalidated", "failed"
+
+    def valid_for(self, state) -> bool:
+        recorded = self.state
+        if recorded.read_all:
+            return dict.keys(recorded) == state.keys() and all(_same(v, state[k]) for k, v in dict.items(recorded))
+        return all(_same(v, state.get(k, _MISSING)) for k, v in recorded.reads.items())
+
+
+class _Batch:
+    """The branches speculated for one run of the router node."""
+    __slots__ = ("base", "written", "specs", "routed", "created")
+
+    def __init__(self, base):
+        self.base = base
+        self.written = None   # keys the router wrote, once it has finished
+        self.specs = {}
+        self.routed = False
+        self.created = time.monotonic()
+
+    def matches(self, state) -> bool:
+        """Is ``state`` the router's input plus the router's own writes?"""
+        return all(_same(v, state.get(k, _MISSING)) for k, v in self.base.items() if k not in self.written)
+
+
+class SpeculativeEdge:
+    """Wraps one router node, its path function and its branch nodes. See the module docstring."""
+
+    def __init__(self, source: str, branches, *, max_workers: int | None = None, ttl: float = 300.0):
+        self.source = source
+        self.branches = tuple(branches)
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or 4 * len(self.branches),
+                                        thread_name_prefix=f"speculate-{source}")
+        self._lock = threading.RLock()   # done-callbacks of finished futures run inline, under it
+        self._batches: list[_Batch] = []
+        self._stats = {node: Counter() for node in self.branches}
+
+    # --- router side ---
+    def _start(self, runnables, state, config) -> _Batch:
+        batch = _Batch(dict(state))
+        # Detached config: no callbacks, so a losing branch neither streams nor traces under the router
+        spec_config = {k: v for k, v in (config or {}).items() if k not in ("callbacks", "run_id")}
+        for node in self.branches:
+            spec = batch.specs[node] = _Speculation(node)
+            spec.state = _ReadRecorder(state)
+            spec.future = self._pool.submit(self._run, spec, runnables[node], spec_config)
+            self._stats[node]["started"] += 1
+        with self._lock:
+            self._prune()
+            self._batches.append(batch)
+        return batch
+
+    @staticmethod
+    def _run(spec, runnable, config):
+        try:
+            return runnable.invoke(spec.state, config)
+        finally:
+            spec.duration = time.perf_counter() - spec.started
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.ttl
+        for batch in [b for b in self._batches if b.created < cutoff]:
+            self._drop(batch, "discarded")
+
+    def _drop(self, batch, outcome, keep=()):
+        """Give up on the batch's branches except ``keep``; caller holds the lock."""
+        for node, spec in batch.specs.items():
+            if node in keep or spec.outcome is not None:
+                continue
+            spec.outcome = "cancelled" if spec.future.cancel() else outcome
+            self._stats[node][spec.outcome] += 1
+            if spec.outcome != "cancelled":
+                spec.future.add_done_callback(lambda _, s=spec: self._account_waste(s))
+        if not keep and batch in self._batches:
+            self._batches.remove(batch)
+
+    def _account_waste(self, spec):
+        with self._lock:
+            self._stats[spec.node]["wasted_s"] += spec.duration or 0.0
+
+    def wrap_source(self, runnable, runnables):
+        def speculative_source(state, config):
+            if not isinstance(state, dict):
+                return runnable.invoke(state, config)
+            batch = self._start(runnables, state, config)
+            try:
+                update = runnable.invoke(state, config)
+            except BaseException:
+                with self._lock:
+                    self._drop(batch, "discarded")
+                raise
+            batch.written = set(update) if isinstance(update, dict) else set(batch.base)
+            return update
+
+        return speculative_source
+
+    def wrap_path(self, path, ends):
+        call = path.invoke if hasattr(path, "invoke") else path
+
+        def speculative_path(state):
+            result = call(state)
+            chosen = set()
+            for item in result if isinstance(result, list) else [result]:
+                key = item.node if isinstance(item, Send) else item
+                chosen.add(ends.get(key, key) if ends else key)
+            if isinstance(state, dict):
+                with self._lock:
+                    batch = next((b for b in self._batches
+                                  if not b.routed and b.written is not None and b.matches(state)), None)
+                    if batch is not None:
+                        batch.routed = True
+                        self._drop(batch, "discarded", keep=chosen)
+                        if not chosen.intersection(batch.specs):
+                            self._batches.remove(batch)
+            return result
+
+        return speculative_path
+
+    # --- branch side ---
+    def _claim(self, node, state):
+        with self._lock:
+            for batch in self._batches:
+                spec = batch.specs.get(node)
+                if batch.routed and spec is not None and spec.outcome is None:
+                    spec.outcome = "claimed"
+                    if all(s.outcome is not None for s in batch.specs.values()):
+                        self._batches.remove(batch)
+                    return spec
+        return None
+
+    def wrap_branch(self, node, runnable):
+        def speculative_branch(state, config):
+            spec = self._claim(node, state) if isinstance(state, dict) else None
+            if spec is not None:
+                waited = time.perf_counter()
+                if not spec.valid_for(state):
+                    spec.outcome = "invalidated"
+                    spec.future.add_done_callback(lambda _: self._account_waste(spec))
+                else:
+                    try:
+                        result = spec.future.result()
+                    except Exception:
+                        spec.outcome = "failed"
+                    else:
+                        spec.outcome = "used"
+                        waited = time.perf_counter() - waited
+                        with self._lock:
+                            self._stats[node]["used"] += 1
+                            self._stats[node]["saved_s"] += max(0.0, spec.duration - waited)
+                        return result
+                with self._lock:
+                    self._stats[node][spec.outcome] += 1
+            return runnable.invoke(state, config)
+
+        return speculative_branch
+
+    def stats(self) -> dict:
+        """Per edge ``"router->branch"``: counts by outcome, hit rate, and seconds saved vs wasted."""
+        out = {}
+        with self._lock:
+            for node, counter in self._stats.items():
+                stats = dict(counter)
+                for name in ("started", "used", "discarded", "cancelled", "invalidated", "failed"):
+                    stats.setdefault(name, 0)
+                stats["saved_s"] = round(counter["saved_s"], 4)
+                stats["wasted_s"] = round(counter["wasted_s"], 4)
+                stats["hit_rate"] = stats["used"] / stats["started"] if stats["started"] else 0.0
+                out[f"{self.source}->{node}"] = stats
+        return out
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def add_speculative_conditional_edges(graph, source: str, path, path_map=None, *, branches=None,
+                                      max_workers: int | None = None) -> SpeculativeEdge:
+    """``graph.add_conditional_edges(source, path, path_map)``, speculating on the branch nodes.
+
+    Call it after every node is added. ``branches`` limits speculation to the
+    likely targets; by default every target the path can return (from
+    ``path_map`` or the path's ``Literal`` return annotation) is started.
+    """
+    probe = type(graph)(graph.state_schema)   # resolve the targets the way LangGraph does
+    probe.add_conditional_edges(source, path, path_map)
+    ends = next(iter(probe.branches[source].values())).ends
+    targets = [t for t in (ends.values() if ends else ()) if t in graph.nodes]
+    branches = list(branches) if branches is not None else targets
+    if not branches:
+        raise ValueError(f"no branch nodes to speculate for {source!r}: pass branches= or a path_map")
+    unknown = [b for b in [source, *branches] if b not in graph.nodes]
+    if unknown:
+        raise ValueError(f"add the nodes before speculating on them: {unknown}")
+
+    edge = SpeculativeEdge(source, branches, max_workers=max_workers)
+    runnables = {node: graph.nodes[node].runnable for node in branches}
+    spec = graph.nodes[source]
+    graph.nodes[source] = replace(spec, runnable=RunnableLambda(edge.wrap_source(spec.runnable, runnables),
+                                                                name=source))
+    for node in branches:
+        spec = graph.nodes[node]
+        graph.nodes[node] = replace(spec, runnable=RunnableLambda(edge.wrap_branch(node, spec.runnable), name=node))
+    graph.add_conditional_edges(source, edge.wrap_path(path, ends), ends)
+    return edge
@@ -0,0 +1,283 @@
+"""Thread catalog maintained by the SQLite checkpointer on every write.
+
+``SqliteSaver.list(None)`` deserializes every checkpoint of every thread just
+to find the distinct thread ids, so a sidebar gets slower with total history
+size. ``CatalogSqliteSaver`` keeps one row per thread in a ``thread_catalog``
+table, updated inside ``put()``, and lists it with indexed keyset pagination:
+the cost of a page depends on the page size only.
+
+    checkpointer = CatalogSqliteSaver(conn)
+    page = checkpointer.list_threads(limit=20)
+    more = checkpointer.list_threads(limit=20, cursor=page.next_cursor)
+
+It also mirrors the ``messages`` channel of each thread's latest root
+checkpoint into ``thread_messages`` (one row per message), so a UI can page
+through a conversation newest-first and only deserialize what it shows:
+
+    page = checkpointer.get_messages_page(thread_id, limit=20)
+    older = checkpointer.get_messages_page(thread_id, limit=20, before=page.next_cursor)
+
+The checkpoint row, its catalog row and the message index are written in
+one transaction (``_write_unit``), so readers never see one without the
+other and concurrent writers to a thread cannot interleave their updates.
+"""
+import threading
+from contextlib import contextmanager
+from functools import partial
+from typing import NamedTuple
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+PREVIEW_CHARS = 120
+SORT_COLUMNS = {"updated_at", "created_at"}
+
+
+class ThreadInfo(NamedTuple):
+    thread_id: str
+    created_at: str
+    updated_at: str
+    checkpoint_count: int
+    last_message_preview: str | None
+
+
+class ThreadPage(NamedTuple):
+    threads: list[ThreadInfo]
+    next_cursor: tuple | None   # pass back as ``cursor=`` to fetch the next page
+
+
+class MessagePage(NamedTuple):
+    messages: list             # oldest first, ready to render
+    next_cursor: int | None    # pass back as ``before=`` for older messages
+    total: int                 # messages in the thread
+
+
+def message_preview(checkpoint) -> str | None:
+    """Short text of the last message in a checkpoint, if it has any."""
+    messages = checkpoint.get("channel_values", {}).get("messages")
+    if not messages:
+        return None
+    last = messages[-1]
+    content = getattr(last, "content", last)
+    if not isinstance(content, str):
+        content = str(content)
+    return " ".join(content.split())[:PREVIEW_CHARS]
+
+
+class CatalogSqliteSaver(SqliteSaver):
+    """``SqliteSaver`` that also maintains an indexed per-thread catalog."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+
+    @contextmanager
+    def cursor(self, transaction: bool = True):
+        unit = getattr(self._local, "unit", None)
+        if unit is not None:   # inside a write unit: join its transaction
+            yield unit
+            return
+        with super().cursor(transaction) as cur:
+            yield cur
+
+    @contextmanager
+    def _write_unit(self):
+        """Run every write made inside the block in one transaction, on one cursor.
+
+        Nested units join the outer one; an exception rolls the whole unit back.
+        """
+        unit = getattr(self._local, "unit", None)
+        if unit is not None:
+            yield unit
+            return
+        with self.lock:
+            self.setup()
+            cur = self.conn.cursor()
+            self._local.unit = cur
+            try:
+                if not self.conn.in_transaction:
+                    cur.execute("BEGIN IMMEDIATE")   # take the write lock before reading
+                yield cur
+            except BaseException:
+                self.conn.rollback()
+                raise
+            else:
+                self.conn.commit()
+            finally:
+                self._local.unit = None
+                cur.close()
+
+    def _run_in_unit(self, unit, fn) -> None:
+        """Run ``fn(cursor)`` inside the open write unit; it may read what the unit wrote."""
+        fn(unit)
+
+    def setup(self) -> None:
+        if self.is_setup:
+            return
+        super().setup()
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS thread_catalog (
+                thread_id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                checkpoint_count INTEGER NOT NULL DEFAULT 0,
+                last_message_preview TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_thread_catalog_updated
+                ON thread_catalog(updated_at, thread_id);
+            CREATE INDEX IF NOT EXISTS idx_thread_catalog_created
+                ON thread_catalog(created_at, thread_id);
+            CREATE TABLE IF NOT EXISTS thread_messages (
+                thread_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                type TEXT,
+                message BLOB,
+                PRIMARY KEY (thread_id, seq)
+            );
+            """
+        )
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with self._write_unit() as unit:
+            next_config = super().put(config, checkpoint, metadata, new_versions)
+            # Only root-graph checkpoints describe a conversation; subgraphs write under a namespace
+            if not config["configurable"].get("checkpoint_ns"):
+                self._run_in_unit(unit, partial(
+                    self._update_thread, thread_id=str(config["configurable"]["thread_id"]),
+                    ts=checkpoint["ts"], preview=message_preview(checkpoint),
+                    messages=checkpoint.get("channel_values", {}).get("messages"),
+                ))
+        return next_config
+
+    def _update_thread(self, cur, thread_id: str, ts: str, preview: str | None, messages) -> None:
+        self._touch_thread(cur, thread_id, ts, preview)
+        if isinstance(messages, list):
+            self._sync_messages(cur, thread_id, messages)
+
+    def _sync_messages(self, cur, thread_id: str, messages: list) -> None:
+        """Bring ``thread_messages`` in line with ``messages``, touching only what changed.
+
+        The usual turn appends, so the last logged message is compared with the
+        same position in the new list; on a match only the tail is written.
+        Anything else (edits, a branch that diverged) rewrites the thread.
+        Reads and writes go through ``cur``, inside the caller's write unit.
+        """
+        logged = cur.execute(
+            "SELECT COUNT(*) FROM thread_messages WHERE thread_id = ?", (thread_id,)
+        ).fetchone()[0]
+        anchor = min(logged, len(messages)) - 1
+        row = cur.execute(
+            "SELECT type, message FROM thread_messages WHERE thread_id = ? AND seq = ?",
+            (thread_id, anchor),
+        ).fetchone() if anchor >= 0 else None
+        start = anchor + 1 if row is not None and self.serde.loads_typed(row) == messages[anchor] else 0
+        if start == logged == len(messages):
+            return
+        cur.execute("DELETE FROM thread_messages WHERE thread_id = ? AND seq >= ?",
+                    (thread_id, start))
+        cur.executemany(
+            "INSERT INTO thread_messages (thread_id, seq, type, message) VALUES (?, ?, ?, ?)",
+            [(thread_id, seq, *self.serde.dumps_typed(messages[seq]))
+             for seq in range(start, len(messages))],
+        )
+
+    def get_messages_page(self, thread_id: str, limit: int = 20,
+                          before: int | None = None) -> MessagePage:
+        """The ``limit`` messages preceding position ``before`` (default: the newest)."""
+        with self.cursor(transaction=False) as cur:
+            total = cur.execute(
+                "SELECT COUNT(*) FROM thread_messages WHERE thread_id = ?", (str(thread_id),)
+            ).fetchone()[0]
+            rows = cur.execute(
+                "SELECT seq, type, message FROM thread_messages "
+                "WHERE thread_id = ? AND seq < ? ORDER BY seq DESC LIMIT ?",
+                (str(thread_id), total if before is None else before, limit),
+            ).fetchall()
+        rows.reverse()
+        messages = [self.serde.loads_typed((type_, blob)) for _, type_, blob in rows]
+        next_cursor = rows[0][0] if rows and rows[0][0] > 0 else None
+        return MessagePage(messages, next_cursor, total)
+
+    @staticmethod
+    def _touch_thread(cur, thread_id: str, ts: str, preview: str | None) -> None:
+        cur.execute(
+            """
+            INSERT INTO thread_catalog
+                (thread_id, created_at, updated_at, checkpoint_count, last_message_preview)
+            VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT(thread_id) DO UPDATE SET
+                updated_at = excluded.updated_at,
+                checkpoint_count = checkpoint_count + 1,
+                last_message_preview = COALESCE(excluded.last_message_preview, last_message_preview)
+            """,
+            (thread_id, ts, ts, preview),
+        )
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM thread_catalog WHERE thread_id = ?", (str(thread_id),))
+            cur.execute("DELETE FROM thread_messages WHERE thread_id = ?", (str(thread_id),))
+
+    def list_threads(self, limit: int = 20, cursor: tuple | None = None,
+                     order_by: str = "updated_at", descending: bool = True) -> ThreadPage:
+        """One page of threads sorted by ``order_by`` (keyset paginated)."""
+        if order_by not in SORT_COLUMNS:
+            raise ValueError(f"order_by must be one of {sorted(SORT_COLUMNS)}")
+        op, direction = ("<", "DESC") if descending else (">", "ASC")
+        query = ("SELECT thread_id, created_at, updated_at, checkpoint_count, last_message_preview "
+                 "FROM thread_catalog")
+        params: tuple = ()
+        if cursor is not None:
+            query += f" WHERE ({order_by}, thread_id) {op} (?, ?)"
+            params = tuple(cursor)
+        query += f" ORDER BY {order_by} {direction}, thread_id {direction} LIMIT ?"
+        with self.cursor(transaction=False) as cur:
+            rows = cur.execute(query, (*params, limit + 1)).fetchall()
+        threads = [ThreadInfo(*row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = threads[-1]
+            next_cursor = (getattr(last, order_by), last.thread_id)
+        return ThreadPage(threads, next_cursor)
+
+    def get_thread(self, thread_id: str) -> ThreadInfo | None:
+        with self.cursor(transaction=False) as cur:
+            row = cur.execute(
+                "SELECT thread_id, created_at, updated_at, checkpoint_count, last_message_preview "
+                "FROM thread_catalog WHERE thread_id = ?", (str(thread_id),)
+            ).fetchone()
+        return ThreadInfo(*row) if row else None
+
+    def rebuild_catalog(self) -> int:
+        """Backfill the catalog for a database written before it existed.
+
+        Counts come straight from SQL; only the oldest and newest checkpoint
+        of each thread are deserialized, for timestamps, the preview and the
+        message index.
+        Returns the number of threads catalogued.
+        """
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM thread_catalog")
+        with self.cursor(transaction=False) as cur:
+            rows = cur.execute(
+                "SELECT thread_id, COUNT(*), MIN(checkpoint_id), MAX(checkpoint_id) "
+                "FROM checkpoints WHERE checkpoint_ns = '' GROUP BY thread_id"
+            ).fetchall()
+        for thread_id, count, first_id, last_id in rows:
+            oldest = self.get_tuple(_checkpoint_config(thread_id, first_id)).checkpoint
+            newest = self.get_tuple(_checkpoint_config(thread_id, last_id)).checkpoint
+            with self._write_unit() as unit:
+                unit.execute(
+                    "INSERT INTO thread_catalog VALUES (?, ?, ?, ?, ?)",
+                    (thread_id, oldest["ts"], newest["ts"], count, message_preview(newest)),
+                )
+                messages = newest.get("channel_values", {}).get("messages")
+                if isinstance(messages, list):
+                    self._run_in_unit(unit, partial(self._sync_messages, thread_id=thread_id,
+                                                    messages=messages))
+        return len(rows)
+
+
+def _checkpoint_config(thread_id: str, checkpoint_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": "", "checkpoint_id": checkpoint_id}}
@@ -0,0 +1,135 @@
+"""Coalesced token streaming and a Server-Sent Events endpoint for graph output.
+
+``stream_mode="messages"`` yields one chunk per model token. Passing those
+straight to ``st.write_stream`` means one front-end update per token, and at
+a few hundred tokens/s the UI, not the model, sets the pace. ``coalesce``
+groups tokens into fewer, larger pieces: a piece is emitted once
+``max_delay`` seconds have passed since its first token or it holds
+``max_chars`` characters, and whatever is left is flushed at the end.
+
+    tokens = message_tokens(app.stream(inputs, config, stream_mode="messages"), node="agent")
+    st.write_stream(coalesce(tokens, max_delay=0.05))
+
+The sync version checks the window when a token arrives, so a stall in the
+stream holds back at most the tokens of one window. ``acoalesce`` waits on the
+source with a timer and flushes on time even while the model is stalled.
+
+``create_sse_app(graph)`` serves any compiled graph's ``astream`` as SSE.
+Each client's stream is pulled only as fast as its socket drains
+(backpressure), and in ``"messages"`` mode tokens are coalesced per event, so
+many clients can follow model output without a Streamlit rerun per token.
+"""
+import asyncio
+import json
+import time
+
+
+def message_tokens(stream, node: str | None = None):
+    """Text of each ``(chunk, metadata)`` from ``stream_mode="messages"``, optionally from one node only."""
+    for chunk, metadata in stream:
+        if chunk.content and (node is None or metadata.get("langgraph_node") == node):
+            yield chunk.content
+
+
+async def amessage_tokens(stream, node: str | None = None):
+    async for chunk, metadata in stream:
+        if chunk.content and (node is None or metadata.get("langgraph_node") == node):
+            yield chunk.content
+
+
+def coalesce(tokens, *, max_delay: float = 0.05, max_chars: int = 256):
+    """Join tokens into pieces of at most ``max_delay`` seconds or ``max_chars`` characters."""
+    buffer, size, first = [], 0, 0.0
+    for token in tokens:
+        if not buffer:
+            first = time.monotonic()
+        buffer.append(token)
+        size += len(token)
+        if size >= max_chars or time.monotonic() - first >= max_delay:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+async def acoalesce(tokens, *, max_delay: float = 0.05, max_chars: int = 256):
+    """Async ``coalesce`` that also flushes on time while the source is stalled."""
+    source = tokens.__aiter__()
+    buffer, size, deadline = [], 0, None
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(source.__anext__())
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:   # window over with the next token still on its way
+                yield "".join(buffer)
+                buffer, size, deadline = [], 0, None
+                continue
+            finished, pending = pending, None
+            try:
+                token = finished.result()
+            except StopAsyncIteration:
+                break
+            if not buffer:
+                deadline = time.monotonic() + max_delay
+            buffer.append(token)
+            size += len(token)
+            if size >= max_chars or time.monotonic() >= deadline:
+                yield "".join(buffer)
+                buffer, size, deadline = [], 0, None
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+def sse_event(data, event: str | None = None) -> str:
+    lines = [f"event: {event}"] if event else []
+    lines += [f"data: {line}" for line in json.dumps(data, ensure_ascii=False, default=str).splitlines()]
+    return "\n".join(lines) + "\n\n"
+
+
+async def graph_events(graph, graph_input, config=None, *, stream_mode: str = "messages",
+                       node: str | None = None, max_delay: float = 0.05, max_chars: int = 256):
+    """SSE frames for one run of ``graph``: ``token`` events in messages mode, else one event per chunk; then ``end``."""
+    stream = graph.astream(graph_input, config, stream_mode=stream_mode)
+    try:
+        if stream_mode == "messages":
+            async for text in acoalesce(amessage_tokens(stream, node), max_delay=max_delay, max_chars=max_chars):
+                yield sse_event({"text": text}, "token")
+        else:
+            async for chunk in stream:
+                yield sse_event(chunk, stream_mode)
+    except Exception as exc:
+        yield sse_event({"error": repr(exc)}, "error")
+        return
+    yield sse_event({}, "end")
+
+
+def sse_response(events):
+    from starlette.responses import StreamingResponse
+
+    return StreamingResponse(events, media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+def create_sse_app(graph, *, path: str = "/stream", stream_mode: str = "messages", node: str | None = None,
+                   max_delay: float = 0.05, max_chars: int = 256):
+    """Starlette app streaming ``graph.astream`` as SSE.
+
+    ``POST {path}`` with ``{"input": {...}, "thread_id": "..."}`` (thread_id
+    only for graphs compiled with a checkpointer).
+    """
+    from starlette.applications import Starlette
+    from starlette.routing import Route
+
+    async def stream(request):
+        body = await request.json()
+        config = {"configurable": {"thread_id": body["thread_id"]}} if "thread_id" in body else None
+        return sse_response(graph_events(graph, body["input"], config, stream_mode=stream_mode, node=node,
+                                         max_delay=max_delay, max_chars=max_chars))
+
+    return Starlette(routes=[Route(path, stream, methods=["POST"])])
@@ -0,0 +1,188 @@
+"""Memoized tool results with a per-tool policy, an LRU and an optional SQLite tier.
+
+Agents repeat themselves: the same search or quote lookup is requested
+again on the next loop iteration or in another conversation. Each tool
+declares how its results may be reused, right where it is defined:
+
+    @cache_policy("pure")                 # same args -> same result, forever
+    @tool
+    def calculator(...): ...
+
+    @cache_policy("ttl", ttl=60)          # fresh enough for a minute
+    @tool
+    def get_stock_price(symbol: str): ...
+
+    search_tool = cache_policy("ttl", ttl=3600, disk=True)(DuckDuckGoSearchRun())
+
+Tools without a policy (or with ``"never"``) always run. ``ConcurrentToolNode``
+consults the cache when given one:
+
+    tool_cache = ToolResultCache(max_entries=1024, db_path="tool_cache.db")
+    tool_node = ConcurrentToolNode(tools, cache=tool_cache)
+
+Results are kept in an in-memory LRU; tools declared with ``disk=True`` are
+also written to SQLite, so they survive restarts and are shared by every
+process using the same file. Identical calls already in flight (two threads
+asking the same search at once) wait for the first one, which makes one
+external request instead of two. Error results are never cached.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+
+PURE, TTL, NEVER = "pure", "ttl", "never"
+POLICIES = {PURE, TTL, NEVER}
+MISS = object()
+
+
+def cache_policy(policy: str, *, ttl: float | None = None, disk: bool = False):
+    """Decorator for a tool (apply on top of ``@tool``) recording how its results may be reused."""
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown cache policy '{policy}'. Known: {sorted(POLICIES)}")
+    if policy == TTL and not ttl:
+        raise ValueError("The 'ttl' policy needs ttl= (seconds)")
+
+    def decorate(tool):
+        tool.metadata = {**(tool.metadata or {}),
+                         "cache_policy": policy, "cache_ttl": ttl, "cache_disk": disk}
+        return tool
+    return decorate
+
+
+def policy_of(tool) -> tuple[str, float | None, bool]:
+    metadata = tool.metadata or {}
+    return metadata.get("cache_policy", NEVER), metadata.get("cache_ttl"), metadata.get("cache_disk", False)
+
+
+def make_key(tool_name: str, args: dict) -> str:
+    raw = tool_name + "\x00" + json.dumps(args, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ToolResultCache:
+    """Two-tier (memory LRU + optional SQLite) cache of tool message contents."""
+
+    def __init__(self, max_entries: int = 1024, db_path: str | None = None):
+        self.max_entries = max_entries
+        self._memory: OrderedDict = OrderedDict()   # key -> (content, expires_at or None)
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = Counter()
+        self._conn = None
+        if db_path is not None:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tool_cache (
+                    key        TEXT PRIMARY KEY,
+                    tool       TEXT NOT NULL,
+                    value      TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_tool_cache_expires ON tool_cache(expires_at);
+            """)
+            self._conn.commit()
+
+    # --- tiers ---
+    def _lookup(self, key: str, disk: bool):
+        now = time.time()
+        hit = self._memory.get(key)
+        if hit is not None:
+            if hit[1] is None or hit[1] > now:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                return hit[0]
+            del self._memory[key]
+        if disk and self._conn is not None:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM tool_cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, now),
+            ).fetchone()
+            if row is not None:
+                content = json.loads(row[0])
+                self._remember(key, content, row[1])
+                self._stats["disk_hits"] += 1
+                return content
+        return MISS
+
+    def _remember(self, key, content, expires_at):
+        self._memory[key] = (content, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _store(self, key: str, tool_name: str, content, ttl: float | None, disk: bool):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        self._remember(key, content, expires_at)
+        if disk and self._conn is not None:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_cache (key, tool, value, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (key, tool_name, json.dumps(content), now, expires_at),
+            )
+            self._conn.execute("DELETE FROM tool_cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            self._conn.commit()
+
+    # --- lookups with in-flight de-duplication ---
+    def claim(self, tool, args: dict):
+        """Returns ``("hit", content)``, ``("wait", future)``, ``("run", key)`` or ``("skip", None)``.
+
+        ``"run"`` makes the caller responsible for ``resolve(key, ...)``; the
+        ``"wait"`` future yields ``(content, status)`` once it does.
+        """
+        policy, _, disk = policy_of(tool)
+        if policy == NEVER:
+            return "skip", None
+        key = make_key(tool.name, args)
+        with self._lock:
+            content = self._lookup(key, disk)
+            if content is not MISS:
+                return "hit", content
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["deduplicated"] += 1
+                return "wait", future
+            self._inflight[key] = Future()
+            self._stats["misses"] += 1
+            self._stats[f"misses:{tool.name}"] += 1
+        return "run", key
+
+    def resolve(self, key: str, tool, content=None, status: str = "success",
+                error: BaseException | None = None):
+        """Publish the outcome of a ``"run"`` claim to its waiters; successes are cached."""
+        _, ttl, disk = policy_of(tool)
+        with self._lock:
+            future = self._inflight.pop(key)
+            if error is None and status != "error":
+                self._store(key, tool.name, content, ttl, disk)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result((content, status))
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        for name in ("hits", "disk_hits", "misses", "deduplicated"):
+            stats.setdefault(name, 0)
+        served = stats["hits"] + stats["disk_hits"] + stats["deduplicated"]
+        total = served + stats["misses"]
+        stats["hit_rate"] = served / total if total else 0.0
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM tool_cache")
+                self._conn.commit()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
@@ -0,0 +1,184 @@
+"""Concurrent tool-execution node with per-tool timeouts.
+
+One AI message often carries several independent ``tool_calls`` ("multiply
+45 by 2, then look up GOOGL"). ``ConcurrentToolNode`` is a drop-in for
+``ToolNode`` that runs them together:
+
+* sync tools (``DuckDuckGoSearchRun``, plain ``@tool`` functions) run in a
+  bounded thread pool shared by every turn, instead of a fresh pool per call;
+* async tools (MCP tools, ``async def`` tools) run on the caller's event loop
+  when the graph is used with ``ainvoke``/``astream``;
+* every call has a timeout (``timeout``, overridable per tool name in
+  ``timeouts``). A call that times out or raises becomes an error
+  ``ToolMessage`` so the model can react, and never holds up the others;
+* results come back in the order of the ``tool_calls``;
+* with ``cache=ToolResultCache(...)``, tools that declare a cache policy are
+  answered from the cache and identical in-flight calls run only once.
+
+Async calls that time out are cancelled. A sync function cannot be
+interrupted from outside: its result is dropped and its worker frees up when
+it returns, which is why the pool is bounded.
+
+    tool_node = ConcurrentToolNode(tools, timeout=20, timeouts={"duckduckgo_search": 8})
+    graph.add_node("tools", tool_node)
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import BaseTool, StructuredTool
+
+from common.tool_cache import ToolResultCache
+
+
+def is_async_tool(tool: BaseTool) -> bool:
+    """True if the tool has a native coroutine (else ``ainvoke`` just wraps a thread)."""
+    if isinstance(tool, StructuredTool):
+        return tool.coroutine is not None
+    return type(tool)._arun is not BaseTool._arun
+
+
+def _tool_calls(state) -> list[dict]:
+    messages = state if isinstance(state, list) else state["messages"]
+    for message in reversed(messages):
+        if isinstance(message, AIMessage):
+            return list(message.tool_calls)
+    return []
+
+
+def _error_message(call: dict, content: str) -> ToolMessage:
+    return ToolMessage(content=content, name=call["name"], tool_call_id=call["id"], status="error")
+
+
+class ConcurrentToolNode(RunnableLambda):
+    """Runs the tool calls of the last AI message concurrently, in call order, with timeouts."""
+
+    def __init__(self, tools, *, max_workers: int = 8, timeout: float | None = 30.0,
+                 timeouts: dict[str, float] | None = None, cache: ToolResultCache | None = None,
+                 name: str = "tools"):
+        super().__init__(self._run, afunc=self._arun, name=name)
+        self.tools_by_name = {tool.name: tool for tool in tools}
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+
+    def _timeout_for(self, name: str) -> float | None:
+        return self.timeouts.get(name, self.timeout)
+
+    def _invalid(self, call: dict) -> ToolMessage | None:
+        if call["name"] in self.tools_by_name:
+            return None
+        return _error_message(call, f"Error: {call['name']} is not a valid tool, "
+                                    f"try one of [{', '.join(self.tools_by_name)}].")
+
+    def _output(self, call: dict, result) -> ToolMessage:
+        if isinstance(result, ToolMessage):
+            return result
+        return ToolMessage(content=str(result), name=call["name"], tool_call_id=call["id"])
+
+    @staticmethod
+    def _from_cache(call: dict, content, status: str) -> ToolMessage:
+        return ToolMessage(content=content, name=call["name"], tool_call_id=call["id"], status=status)
+
+    def _failed(self, call: dict, exc: BaseException) -> ToolMessage:
+        if isinstance(exc, (FutureTimeout, asyncio.TimeoutError)):
+            return _error_message(call, f"Error: tool '{call['name']}' timed out after "
+                                        f"{self._timeout_for(call['name'])}s.")
+        return _error_message(call, f"Error: {exc!r}\n Please fix your mistakes.")
+
+    # --- sync graphs: invoke/stream ---
+    def _execute_sync(self, tool, call, config):
+        if is_async_tool(tool) and getattr(tool, "func", None) is None:
+            result = asyncio.run(tool.ainvoke(call, config))   # async-only tool from a sync graph
+        else:
+            result = tool.invoke(call, config)
+        return self._output(call, result)
+
+    def _call_sync(self, tool, call, config):
+        if self.cache is None:
+            return self._execute_sync(tool, call, config)
+        outcome, value = self.cache.claim(tool, call["args"])
+        if outcome == "hit":
+            return self._from_cache(call, value, "success")
+        if outcome == "wait":
+            return self._from_cache(call, *value.result())
+        if outcome == "skip":
+            return self._execute_sync(tool, call, config)
+        try:
+            message = self._execute_sync(tool, call, config)
+        except BaseException as exc:
+            self.cache.resolve(value, tool, error=exc)
+            raise
+        self.cache.resolve(value, tool, message.content, message.status)
+        return message
+
+    def _run(self, state, config=None):
+        calls = [dict(call, type="tool_call") for call in _tool_calls(state)]
+        started = time.monotonic()
+        futures = []
+        for call in calls:
+            invalid = self._invalid(call)
+            futures.append(invalid if invalid is not None else
+                           self._pool.submit(self._call_sync, self.tools_by_name[call["name"]], call, config))
+        messages = []
+        for call, future in zip(calls, futures):
+            if isinstance(future, ToolMessage):
+                messages.append(future)
+                continue
+            # Deadlines run from the start of the turn, not from when we got round to waiting
+            timeout = self._timeout_for(call["name"])
+            remaining = None if timeout is None else max(0.0, started + timeout - time.monotonic())
+            try:
+                messages.append(future.result(timeout=remaining))
+            except Exception as exc:
+                future.cancel()   # frees the slot if it never started
+                messages.append(self._failed(call, exc))
+        return messages if isinstance(state, list) else {"messages": messages}
+
+    # --- async graphs: ainvoke/astream ---
+    async def _execute_async(self, tool, call, config):
+        if is_async_tool(tool):
+            result = await tool.ainvoke(call, config)
+        else:
+            result = await asyncio.get_running_loop().run_in_executor(self._pool, tool.invoke, call, config)
+        return self._output(call, result)
+
+    async def _cached_async(self, tool, call, config):
+        if self.cache is None:
+            return await self._execute_async(tool, call, config)
+        outcome, value = self.cache.claim(tool, call["args"])
+        if outcome == "hit":
+            return self._from_cache(call, value, "success")
+        if outcome == "wait":
+            return self._from_cache(call, *await asyncio.wrap_future(value))
+        if outcome == "skip":
+            return await self._execute_async(tool, call, config)
+        try:
+            message = await self._execute_async(tool, call, config)
+        except BaseException as exc:   # includes cancellation by the timeout
+            self.cache.resolve(value, tool, error=exc)
+            raise
+        self.cache.resolve(value, tool, message.content, message.status)
+        return message
+
+    async def _call_async(self, call, config):
+        invalid = self._invalid(call)
+        if invalid is not None:
+            return invalid
+        coro = self._cached_async(self.tools_by_name[call["name"]], call, config)
+        try:
+            return await asyncio.wait_for(coro, self._timeout_for(call["name"]))
+        except Exception as exc:
+            return self._failed(call, exc)
+
+    async def _arun(self, state, config=None):
+        calls = [dict(call, type="tool_call") for call in _tool_calls(state)]
+        messages = list(await asyncio.gather(*(self._call_async(call, config) for call in calls)))
+        return messages if isinstance(state, list) else {"messages": messages}
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
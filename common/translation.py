@@ -0,0 +1,180 @@
+"""Chunked, concurrent translation with a segment-level SQLite translation memory.
+
+The subgraph examples send the whole answer to the model in one call, so
+translation latency grows with answer length and a sentence that recurs
+across answers is translated again every time. ``ChunkedTranslator``:
+
+* splits the text into segments at paragraph breaks, and long paragraphs at
+  sentence ends (packed up to ``max_chars``), keeping the exact separators;
+* looks every segment up in a ``TranslationMemory`` first;
+* translates only the misses, concurrently with ``llm.batch`` capped at
+  ``max_concurrency`` requests in flight;
+* stores the new translations and reassembles the text in order.
+
+    memory = TranslationMemory("translation_memory.db")
+    translator = ChunkedTranslator(llm, "Hindi", memory=memory, max_concurrency=8)
+    hindi = translator.translate(answer_eng)
+    translator.stats()   # segments, memory hits, model calls
+
+Memory entries are keyed by the whitespace-normalized segment, the target
+language and the model name, so switching models never serves another
+model's translations.
+"""
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+PROMPT = """Translate the following text to {language}.
+Keep it natural and clear. Do not add extra content.
+
+Text:
+{text}"""
+
+_PARAGRAPHS = re.compile(r"(\n[ \t]*\n\s*)")
+_SENTENCES = re.compile(r"(?<=[.!?…।])(\s+)")
+
+
+def split_segments(text: str, max_chars: int = 600) -> list[tuple[str, str]]:
+    """``[(segment, separator_after), ...]`` such that joining them gives back ``text``.
+
+    Leading whitespace comes back as an empty segment with its separator.
+    """
+    pieces = []
+    parts = _PARAGRAPHS.split(text)
+    for paragraph, sep in zip(parts[0::2], parts[1::2] + [""]):
+        stripped = paragraph.rstrip()
+        sep = paragraph[len(stripped):] + sep
+        lead = stripped[:len(stripped) - len(stripped.lstrip())]
+        if lead:
+            pieces.append(("", lead))
+            stripped = stripped[len(lead):]
+        if len(stripped) <= max_chars:
+            pieces.append((stripped, sep))
+            continue
+        sentences = _SENTENCES.split(stripped)
+        chunk = sentences[0]
+        for sentence, gap in zip(sentences[2::2], sentences[1::2]):
+            if len(chunk) + len(gap) + len(sentence) > max_chars:
+                pieces.append((chunk, gap))
+                chunk = sentence
+            else:
+                chunk += gap + sentence
+        pieces.append((chunk, sep))
+    return pieces
+
+
+def _model_name(llm) -> str:
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+
+
+class TranslationMemory:
+    """SQLite table of ``(segment, language, model) -> translation``, safe to share across threads."""
+
+    def __init__(self, db_path: str = "translation_memory.db"):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS translation_memory (
+                key         TEXT PRIMARY KEY,
+                language    TEXT NOT NULL,
+                model       TEXT NOT NULL,
+                source      TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                hits        INTEGER NOT NULL DEFAULT 0,
+                created_at  REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(segment: str, language: str, model: str) -> str:
+        raw = " ".join(segment.split()) + "\x00" + language + "\x00" + model
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get_many(self, segments: list[str], language: str, model: str) -> dict[str, str]:
+        """``{segment: translation}`` for the segments already translated.
+
+        Segments differing only in whitespace share a key, so each key maps to
+        all of its segments and every one of them gets the stored translation.
+        """
+        keys: dict[str, list[str]] = {}
+        for segment in segments:
+            keys.setdefault(self.make_key(segment, language, model), []).append(segment)
+        found, hit_keys = {}, []
+        with self._lock:
+            key_list = list(keys)
+            for start in range(0, len(key_list), 500):   # stay under SQLite's variable limit
+                batch = key_list[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, translation FROM translation_memory WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for key, translation in rows:
+                    hit_keys.append((key,))
+                    found.update((segment, translation) for segment in keys[key])
+            if hit_keys:
+                self._conn.executemany("UPDATE translation_memory SET hits = hits + 1 WHERE key = ?", hit_keys)
+                self._conn.commit()
+        return found
+
+    def put_many(self, translations: dict[str, str], language: str, model: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translation_memory (key, language, model, source, translation, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(self.make_key(s, language, model), language, model, s, t, now) for s, t in translations.items()],
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, hits = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM translation_memory"
+            ).fetchone()
+        return {"entries": entries, "hits": hits}
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ChunkedTranslator:
+    """Translates long text segment by segment, concurrently, through an optional translation memory."""
+
+    def __init__(self, llm, language: str = "Hindi", *, memory: TranslationMemory | None = None,
+                 max_concurrency: int = 8, max_chars: int = 600, prompt: str = PROMPT):
+        self.llm = llm
+        self.language = language
+        self.memory = memory
+        self.max_concurrency = max_concurrency
+        self.max_chars = max_chars
+        self.prompt = prompt
+        self.model = _model_name(llm)
+        self._stats = Counter()
+
+    def translate(self, text: str) -> str:
+        pieces = split_segments(text, self.max_chars)
+        segments = list(dict.fromkeys(s for s, _ in pieces if s.strip()))   # each distinct segment once
+        done = self.memory.get_many(segments, self.language, self.model) if self.memory else {}
+        missing = [s for s in segments if s not in done]
+        if missing:
+            prompts = [self.prompt.format(language=self.language, text=s).strip() for s in missing]
+            responses = self.llm.batch(prompts, config={"max_concurrency": self.max_concurrency})
+            fresh = {s: r.content.strip() for s, r in zip(missing, responses)}
+            if self.memory:
+                self.memory.put_many(fresh, self.language, self.model)
+            done.update(fresh)
+        self._stats.update(texts=1, segments=len(segments), memory_hits=len(segments) - len(missing),
+                           model_calls=len(missing))
+        return "".join(done.get(s, s) + sep for s, sep in pieces)
+
+    def stats(self) -> dict:
+        stats = dict(self._stats)
+        for name in ("texts", "segments", "memory_hits", "model_calls"):
+            stats.setdefault(name, 0)
+        stats["hit_rate"] = stats["memory_hits"] / stats["segments"] if stats["segments"] else 0.0
+        return stats